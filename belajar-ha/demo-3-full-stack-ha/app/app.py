@@ -1,259 +1,678 @@
 #!/usr/bin/env python3
 
 import os
-import socket
+import re
+import json
+import hashlib
+import threading
 import psycopg
-from flask import Flask, jsonify, request
+from collections import OrderedDict
+from contextlib import ExitStack, contextmanager
+from psycopg_pool import ConnectionPool
+from flask import Flask, Response, g, jsonify, request, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
+)
 from datetime import datetime
 import time
+from common import (
+    APP_NAME, DB_WRITE_HOST, DB_WRITE_PORT, DB_READ_HOST, DB_READ_PORT, DB_CONNECT_TIMEOUT,
+    DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE, DB_POOL_TIMEOUT, DB_POOL_MAX_IDLE, DB_POOL_MAX_LIFETIME,
+    RYW_MAX_WAIT, RYW_POLL_INTERVAL, USERS_PAGE_SIZE, USERS_STREAM_BATCH,
+    BULK_BATCH_SIZE, BULK_MAX_ERRORS, HEALTH_CHECK_INTERVAL, STATS_CACHE_TTL, STATS_EXACT_COUNT_LIMIT,
+    LSN_CHECK_QUERY, CURRENT_LSN_QUERY, STATS_QUERY,
+    db_conninfo, get_min_lsn, get_pool_stats, render_home, stats_to_dict, user_to_dict,
+    encode_cursor, parse_page_args, build_users_query
+)
 
 app = Flask(__name__)
 
-# Configuration - Connect via HAProxy
-DB_WRITE_HOST = os.getenv('DB_WRITE_HOST', 'haproxy1')
-DB_WRITE_PORT = os.getenv('DB_WRITE_PORT', '6432')
-DB_READ_HOST = os.getenv('DB_READ_HOST', 'haproxy1')
-DB_READ_PORT = os.getenv('DB_READ_PORT', '6433')
-DB_NAME = os.getenv('DB_NAME', 'demodb')
-DB_USER = os.getenv('DB_USER', 'postgres')
-DB_PASSWORD = os.getenv('DB_PASSWORD', 'postgres')
-APP_NAME = socket.gethostname()
-
-def get_instance_color():
-    """Get unique gradient colors based on instance hostname"""
-    colors = {
-        'app1': ('667eea', '764ba2'),  # Purple
-        'app2': ('f093fb', '4facfe'),  # Pink to Blue
-        'app3': ('43e97b', '38f9d7'),  # Green to Cyan
-    }
-    # Default gradient if hostname not in map
-    default = ('fa709a', 'fee140')  # Pink to Yellow
+# ==========================================================
+# METRICS (Prometheus)
+# Dengan Gunicorn, PROMETHEUS_MULTIPROC_DIR di-set di gunicorn.conf.py
+# sehingga setiap worker menulis ke file mmap dan /metrics menggabungkannya
+# ==========================================================
+
+LATENCY_BUCKETS = (.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10)
+
+HTTP_REQUESTS = Counter(
+    'http_requests_total', 'Jumlah HTTP request', ['route', 'method', 'status'])
+HTTP_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Latency HTTP request', ['route', 'method', 'status'],
+    buckets=LATENCY_BUCKETS)
+DB_ACQUIRE_LATENCY = Histogram(
+    'db_connection_acquire_seconds', 'Waktu mendapatkan koneksi dari pool', ['endpoint'],
+    buckets=LATENCY_BUCKETS)
+DB_QUERY_LATENCY = Histogram(
+    'db_query_duration_seconds', 'Waktu eksekusi query', ['endpoint'],
+    buckets=LATENCY_BUCKETS)
+DB_FALLBACKS = Counter(
+    'db_fallback_total', 'Read yang dialihkan ke write endpoint', ['reason'])
+JSON_ENCODE_LATENCY = Histogram(
+    'json_encode_duration_seconds', 'Waktu serialisasi JSON response', ['route'],
+    buckets=(.0001, .00025, .0005, .001, .0025, .005, .01, .025, .05, .1))
+USERS_CACHE_REQUESTS = Counter(
+    'users_cache_requests_total', 'Hasil lookup cache GET /api/users', ['result'])
+USERS_CACHE_INVALIDATIONS = Counter(
+    'users_cache_invalidations_total', 'Invalidasi cache GET /api/users', ['reason'])
+USERS_CACHE_LISTENER_ERRORS = Counter(
+    'users_cache_listener_errors_total', 'Koneksi listener cache GET /api/users yang gagal / putus')
+
+def current_route():
+    """Label route dari URL rule (bukan path asli) supaya cardinality tetap kecil"""
+    return request.url_rule.rule if request.url_rule else 'unmatched'
+
+class QueryTimer:
+    """
+    Mixin cursor yang mencatat waktu query per endpoint database.
+    metrics_endpoint di-set di get_db_connection dan dihapus saat koneksi
+    kembali ke pool (clear_metrics_endpoint), sehingga query internal pool
+    (check_connection saat checkout berikutnya) tidak dicatat.
+    """
+
+    @contextmanager
+    def timed(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            endpoint = getattr(self.connection, 'metrics_endpoint', None)
+            if endpoint:
+                DB_QUERY_LATENCY.labels(endpoint).observe(time.perf_counter() - start)
 
-    # Extract base hostname (app1, app2, etc)
-    base_name = APP_NAME.split('.')[0] if '.' in APP_NAME else APP_NAME
-    color1, color2 = colors.get(base_name, default)
+    def execute(self, query, params=None, **kwargs):
+        with self.timed():
+            return super().execute(query, params, **kwargs)
 
-    return f"linear-gradient(135deg, #{color1} 0%, #{color2} 100%)"
+class TimedCursor(QueryTimer, psycopg.Cursor):
+    """Cursor biasa: execute dan COPY (dari mulai sampai blok copy selesai) dicatat"""
 
-def get_db_connection(for_write=False):
+    @contextmanager
+    def copy(self, statement, params=None, **kwargs):
+        with self.timed(), super().copy(statement, params, **kwargs) as copy:
+            yield copy
+
+class TimedServerCursor(QueryTimer, psycopg.ServerCursor):
+    """
+    Named (server-side) cursor: DECLARE dan setiap FETCH per itersize row
+    dicatat sebagai satu query, bukan per row.
     """
-    Get database connection via HAProxy
+
+    def __iter__(self):
+        while True:
+            with self.timed():
+                rows = self.fetchmany(self.itersize)
+            yield from rows
+            if len(rows) < self.itersize:
+                return
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """JSON provider Flask yang mencatat waktu serialisasi response"""
+
+    def response(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().response(*args, **kwargs)
+        finally:
+            JSON_ENCODE_LATENCY.labels(current_route()).observe(time.perf_counter() - start)
+
+app.json = TimedJSONProvider(app)
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    route = current_route()
+    if route != '/metrics':
+        labels = (route, request.method, str(response.status_code))
+        start = g.request_start
+        HTTP_REQUESTS.labels(*labels).inc()
+
+        def observe_latency():
+            HTTP_LATENCY.labels(*labels).observe(time.perf_counter() - start)
+
+        if response.is_streamed:
+            # Body streaming (misalnya GET /api/users?format=ndjson) baru
+            # selesai dikirim saat response ditutup, bukan saat dibuat
+            response.call_on_close(observe_latency)
+        else:
+            observe_latency()
+    return response
+
+# Cache response GET /api/users per process, di-invalidate lewat LISTEN/NOTIFY
+# (trigger di db/migrations/V3__users_notify_trigger.sql)
+USERS_CACHE_ENABLED = os.getenv('USERS_CACHE_ENABLED', 'true').lower() == 'true'
+# Selama listener terhubung, entry berlaku sampai ada NOTIFY (maksimal
+# USERS_CACHE_MAX_AGE detik). Saat listener putus (misalnya failover),
+# entry hanya berlaku USERS_CACHE_TTL detik (0 = tanpa cache)
+USERS_CACHE_MAX_AGE = float(os.getenv('USERS_CACHE_MAX_AGE', '300'))
+USERS_CACHE_TTL = float(os.getenv('USERS_CACHE_TTL', '1'))
+USERS_CACHE_MAX_ENTRIES = int(os.getenv('USERS_CACHE_MAX_ENTRIES', '256'))
+# Interval ping koneksi listener, menentukan seberapa cepat koneksi putus terdeteksi
+USERS_CACHE_PING_INTERVAL = float(os.getenv('USERS_CACHE_PING_INTERVAL', '2'))
+# Error listener yang sama di-log paling sering sekali per interval ini (detik)
+USERS_CACHE_LOG_INTERVAL = float(os.getenv('USERS_CACHE_LOG_INTERVAL', '60'))
+USERS_NOTIFY_CHANNEL = 'users_changed'
+USERS_TRIGGER_CHECK_QUERY = "SELECT 1 FROM pg_trigger WHERE tgrelid = 'users'::regclass AND tgname = 'users_changed'"
+
+def configure_connection(conn):
+    """Callback configure pool: named cursor juga mencatat waktu query"""
+    conn.server_cursor_factory = TimedServerCursor
+
+def clear_metrics_endpoint(conn):
+    """Callback reset pool: koneksi yang kembali ke pool tidak lagi diberi label endpoint"""
+    conn.metrics_endpoint = None
+
+def create_pool(name, host, port):
+    """
+    Buat connection pool ke satu endpoint HAProxy.
+    Pool belum dibuka di sini, supaya setiap worker process membuka
+    koneksinya sendiri setelah fork (lihat open_pools).
+    """
+    conninfo = db_conninfo(host, port)
+    return ConnectionPool(
+        conninfo,
+        name=name,
+        min_size=DB_POOL_MIN_SIZE,
+        max_size=DB_POOL_MAX_SIZE,
+        timeout=DB_POOL_TIMEOUT,
+        max_idle=DB_POOL_MAX_IDLE,
+        max_lifetime=DB_POOL_MAX_LIFETIME,
+        # Cek koneksi sebelum diberikan ke request, koneksi yang putus
+        # karena failover dibuang dan diganti yang baru
+        check=ConnectionPool.check_connection,
+        configure=configure_connection,
+        reset=clear_metrics_endpoint,
+        kwargs={'cursor_factory': TimedCursor},
+        open=False
+    )
+
+write_pool = create_pool('write', DB_WRITE_HOST, DB_WRITE_PORT)
+read_pool = create_pool('read', DB_READ_HOST, DB_READ_PORT)
+_pools_lock = threading.Lock()
+_pools_opened = False
+
+def open_pools():
+    """Buka kedua pool (sekali per process), tanpa menunggu min_size terisi"""
+    global _pools_opened
+    if _pools_opened:
+        return
+    with _pools_lock:
+        if not _pools_opened:
+            write_pool.open(wait=False)
+            read_pool.open(wait=False)
+            _pools_opened = True
+
+def wait_for_lsn(conn, min_lsn):
+    """Tunggu sampai RYW_MAX_WAIT detik hingga server koneksi ini sudah me-replay min_lsn"""
+    deadline = time.monotonic() + RYW_MAX_WAIT
+    while True:
+        if conn.execute(LSN_CHECK_QUERY, (min_lsn,)).fetchone()[0]:
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(RYW_POLL_INTERVAL)
+
+@contextmanager
+def get_db_connection(for_write=False, min_lsn=None):
+    """
+    Ambil koneksi database dari pool via HAProxy
     - Write operations: route to HAProxy postgres_write (primary)
     - Read operations: route to HAProxy postgres_read (load balanced)
+    - Read dengan min_lsn: hanya dilayani replica yang sudah me-replay
+      min_lsn, jika tidak tercapai dalam RYW_MAX_WAIT dialihkan ke primary
+
+    Koneksi dikembalikan ke pool saat keluar dari blok with,
+    transaksi di-commit jika sukses dan di-rollback jika ada exception.
     """
-    try:
-        host = DB_WRITE_HOST if for_write else DB_READ_HOST
-        port = DB_WRITE_PORT if for_write else DB_READ_PORT
-
-        conn = psycopg.connect(
-            host=host,
-            port=port,
-            dbname=DB_NAME,
-            user=DB_USER,
-            password=DB_PASSWORD,
-            connect_timeout=3
-        )
+    open_pools()
+    start = time.perf_counter()
+    if for_write:
+        pool, db_host, endpoint = write_pool, f"{DB_WRITE_HOST}:{DB_WRITE_PORT}", 'write'
+        conn = pool.getconn()
+    else:
+        try:
+            pool, db_host, endpoint = read_pool, f"{DB_READ_HOST}:{DB_READ_PORT}", 'read'
+            conn = pool.getconn()
+        except Exception:
+            # Fallback to write endpoint if read fails
+            DB_FALLBACKS.labels('read-fallback').inc()
+            pool, db_host, endpoint = write_pool, f"{DB_WRITE_HOST}:{DB_WRITE_PORT} (fallback)", 'read-fallback'
+            conn = pool.getconn()
+    conn.metrics_endpoint = endpoint
 
-        return conn, f"{host}:{port}"
-    except Exception as e:
-        # Fallback to write endpoint if read fails
-        if not for_write:
-            conn = psycopg.connect(
-                host=DB_WRITE_HOST,
-                port=DB_WRITE_PORT,
-                dbname=DB_NAME,
-                user=DB_USER,
-                password=DB_PASSWORD,
-                connect_timeout=3
-            )
-            return conn, f"{DB_WRITE_HOST}:{DB_WRITE_PORT} (fallback)"
-        raise e
+    if min_lsn and pool is read_pool:
+        try:
+            caught_up = wait_for_lsn(conn, min_lsn)
+            conn.rollback()
+        except Exception:
+            pool.putconn(conn)
+            raise
+        if not caught_up:
+            pool.putconn(conn)
+            DB_FALLBACKS.labels('read-your-writes').inc()
+            pool, db_host, endpoint = write_pool, f"{DB_WRITE_HOST}:{DB_WRITE_PORT} (read-your-writes)", 'read-your-writes'
+            conn = pool.getconn()
+            conn.metrics_endpoint = endpoint
+    DB_ACQUIRE_LATENCY.labels(endpoint).observe(time.perf_counter() - start)
+
+    try:
+        with conn:
+            yield conn, db_host
+    finally:
+        pool.putconn(conn)
 
 @app.route('/')
 def home():
-    """Home page with instance info"""
-    bg_gradient = get_instance_color()
-    return f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Full Stack HA Demo</title>
-        <style>
-            body {{
-                font-family: Arial, sans-serif;
-                max-width: 1200px;
-                margin: 50px auto;
-                padding: 20px;
-                background: {bg_gradient};
-                color: white;
-            }}
-            .container {{
-                background: rgba(255,255,255,0.1);
-                padding: 30px;
-                border-radius: 10px;
-                backdrop-filter: blur(10px);
-            }}
-            h1 {{ margin-top: 0; }}
-            .info {{ margin: 15px 0; font-size: 18px; }}
-            .endpoint {{
-                background: rgba(0,0,0,0.2);
-                padding: 10px;
-                margin: 10px 0;
-                border-radius: 5px;
-                font-family: monospace;
-            }}
-            .button {{
-                display: inline-block;
-                padding: 10px 20px;
-                margin: 10px 5px;
-                background: rgba(255,255,255,0.2);
-                border: 1px solid white;
-                border-radius: 5px;
-                color: white;
-                text-decoration: none;
-                cursor: pointer;
-            }}
-            .button:hover {{ background: rgba(255,255,255,0.3); }}
-            #stats {{ margin-top: 20px; }}
-        </style>
-        <script>
-            function loadStats() {{
-                fetch('/api/stats')
-                    .then(r => r.json())
-                    .then(data => {{
-                        document.getElementById('stats').innerHTML =
-                            '<pre>' + JSON.stringify(data, null, 2) + '</pre>';
-                    }});
-            }}
-            function addUser() {{
-                const name = prompt('Enter name:');
-                if (name) {{
-                    fetch('/api/users', {{
-                        method: 'POST',
-                        headers: {{'Content-Type': 'application/json'}},
-                        body: JSON.stringify({{name: name, email: name + '@example.com'}})
-                    }})
-                    .then(r => r.json())
-                    .then(data => alert('User added: ' + JSON.stringify(data)))
-                    .then(() => loadStats());
-                }}
-            }}
-            setInterval(loadStats, 2000);
-            window.onload = loadStats;
-        </script>
-    </head>
-    <body>
-        <div class="container">
-            <h1>🚀 Full Stack High Availability Demo</h1>
-            <div class="info">📦 Application Instance: <strong>{APP_NAME}</strong></div>
-            <div class="info">⏰ Server Time: <strong>{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</strong></div>
-
-            <h2>Available Endpoints:</h2>
-            <div class="endpoint">GET  /health - Health check</div>
-            <div class="endpoint">GET  /api/stats - Database statistics</div>
-            <div class="endpoint">GET  /api/users - List all users</div>
-            <div class="endpoint">POST /api/users - Create new user</div>
-
-            <div>
-                <button class="button" onclick="loadStats()">Refresh Stats</button>
-                <button class="button" onclick="addUser()">Add User</button>
-                <a href="/api/users" class="button" target="_blank">View Users</a>
-            </div>
-
-            <div id="stats">Loading...</div>
-        </div>
-    </body>
-    </html>
+    return render_home()
+
+_health_state = {'healthy': False, 'database': None, 'error': 'not checked yet', 'checked_at': None, 'checked': 0.0}
+_health_lock = threading.Lock()
+_health_thread = None
+
+def check_database():
+    """Jalankan SELECT 1 ke read endpoint dan simpan hasilnya di _health_state"""
+    try:
+        with get_db_connection() as (conn, db_host):
+            conn.execute('SELECT 1')
+        result = {'healthy': True, 'database': db_host, 'error': None}
+    except Exception as e:
+        result = {'healthy': False, 'database': None, 'error': str(e)}
+    result['checked_at'] = datetime.now().isoformat()
+    result['checked'] = time.monotonic()
+    _health_state.update(result)
+
+def health_checker_loop():
+    while True:
+        time.sleep(HEALTH_CHECK_INTERVAL)
+        check_database()
+
+def start_health_checker():
     """
+    Start background checker (sekali per process, setelah fork).
+    Pengecekan pertama dijalankan langsung supaya hasil awal akurat.
+    """
+    global _health_thread
+    if _health_thread is not None:
+        return
+    with _health_lock:
+        if _health_thread is None:
+            check_database()
+            _health_thread = threading.Thread(target=health_checker_loop, name='health-checker', daemon=True)
+            _health_thread.start()
+
+@app.route('/livez')
+def livez():
+    """Liveness probe: process masih bisa melayani request, tanpa menyentuh database"""
+    return jsonify({'status': 'alive', 'instance': APP_NAME}), 200
 
+@app.route('/readyz')
 @app.route('/health')
 def health():
-    """Health check endpoint for HAProxy"""
-    try:
-        # Check database connectivity
-        conn, db_host = get_db_connection()
-        cur = conn.cursor()
-        cur.execute('SELECT 1')
-        cur.close()
+    """
+    Readiness probe untuk HAProxy: hasil cek database terakhir dari background
+    checker, sehingga berapapun jumlah poller tidak menambah koneksi ke database
+    """
+    start_health_checker()
+    state = dict(_health_state)
+
+    # Hasil yang terlalu lama tidak dipercaya (checker thread macet)
+    if state['healthy'] and time.monotonic() - state['checked'] > HEALTH_CHECK_INTERVAL * 3 + DB_POOL_TIMEOUT:
+        state['healthy'], state['error'] = False, 'database check is stale'
 
+    if state['healthy']:
         return jsonify({
             'status': 'healthy',
             'instance': APP_NAME,
             'timestamp': datetime.now().isoformat(),
-            'database': db_host
+            'database': state['database'],
+            'checked_at': state['checked_at']
         }), 200
-    except Exception as e:
-        return jsonify({
-            'status': 'unhealthy',
-            'instance': APP_NAME,
-            'error': str(e),
-            'timestamp': datetime.now().isoformat()
-        }), 503
+    return jsonify({
+        'status': 'unhealthy',
+        'instance': APP_NAME,
+        'error': state['error'],
+        'timestamp': datetime.now().isoformat(),
+        'checked_at': state['checked_at']
+    }), 503
+
+_stats_cache = {'value': None, 'error': None, 'expires': 0.0}
+_stats_lock = threading.Lock()
+
+def query_stats():
+    """Ambil statistik database dari read endpoint"""
+    with get_db_connection(for_write=False) as (conn, db_host):
+        cur = conn.cursor()
+        cur.execute(STATS_QUERY)
+        is_replica, lag, estimated_count = cur.fetchone()
+
+        # COUNT(*) adalah full scan, hanya dijalankan untuk tabel kecil
+        estimated = STATS_EXACT_COUNT_LIMIT > 0 and estimated_count >= STATS_EXACT_COUNT_LIMIT
+        if estimated:
+            user_count = estimated_count
+        else:
+            cur.execute('SELECT COUNT(*) FROM users')
+            user_count = cur.fetchone()[0]
+        cur.close()
+
+    return stats_to_dict(db_host, is_replica, lag, user_count, estimated)
+
+def get_cached_stats():
+    """
+    Statistik database dengan TTL cache per process.
+    Hanya satu thread yang query ke database saat cache expired (single-flight),
+    thread lain menunggu lalu memakai hasil yang sama. Error juga di-cache
+    selama TTL supaya saat database down pollers tidak antri timeout satu per satu.
+    """
+    if STATS_CACHE_TTL <= 0:
+        return query_stats()
+
+    if time.monotonic() < _stats_cache['expires']:
+        if _stats_cache['error']:
+            raise _stats_cache['error']
+        return _stats_cache['value']
+
+    with _stats_lock:
+        # Cek ulang, mungkin sudah di-refresh thread lain selama menunggu lock
+        if time.monotonic() >= _stats_cache['expires']:
+            try:
+                _stats_cache['value'], _stats_cache['error'] = query_stats(), None
+            except Exception as e:
+                _stats_cache['value'], _stats_cache['error'] = None, e
+            _stats_cache['expires'] = time.monotonic() + STATS_CACHE_TTL
+
+        if _stats_cache['error']:
+            raise _stats_cache['error']
+        return _stats_cache['value']
 
 @app.route('/api/stats')
 def stats():
-    """Get database statistics (read operation)"""
+    """Get database statistics (read operation, cached)"""
     try:
-        conn, db_host = get_db_connection(for_write=False)
+        result = dict(get_cached_stats())
+        result['timestamp'] = datetime.now().isoformat()
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/pool')
+def pool_stats():
+    """Statistik connection pool per process (untuk sizing pool)"""
+    return jsonify({
+        'app_instance': APP_NAME,
+        'pid': os.getpid(),
+        'write': get_pool_stats(write_pool),
+        'read': get_pool_stats(read_pool),
+        # Koneksi LISTEN (di luar pool) untuk invalidasi cache GET /api/users
+        'users_cache': users_cache_status(),
+        'timestamp': datetime.now().isoformat()
+    })
+
+@app.route('/metrics')
+def metrics():
+    """Metrics format Prometheus, digabung dari semua worker jika multiprocess"""
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        data = generate_latest(registry)
+    else:
+        data = generate_latest()
+    return Response(data, mimetype=CONTENT_TYPE_LATEST)
+
+def query_users_page(after_id, limit, min_lsn=None):
+    """Satu halaman users dari read endpoint: (db_host, users, next_cursor)"""
+    with get_db_connection(for_write=False, min_lsn=min_lsn) as (conn, db_host):
         cur = conn.cursor()
+        # Ambil satu row lebih untuk tahu apakah masih ada halaman berikutnya
+        query, params = build_users_query(after_id, limit + 1)
+        cur.execute(query, params)
+        rows = cur.fetchall()
+        cur.close()
 
-        # Get user count
-        cur.execute('SELECT COUNT(*) FROM users')
-        user_count = cur.fetchone()[0]
+    has_more = len(rows) > limit
+    users = [user_to_dict(row) for row in rows[:limit]]
+    return db_host, users, encode_cursor(users[-1]['id']) if has_more else None
 
-        # Check if this is primary or replica
-        cur.execute('SELECT pg_is_in_recovery()')
-        is_replica = cur.fetchone()[0]
+def users_page_payload(db_host, users, next_cursor):
+    return {
+        'app_instance': APP_NAME,
+        'database_endpoint': db_host,
+        'count': len(users),
+        'users': users,
+        'next_cursor': next_cursor
+    }
 
-        # Get replication lag if replica
-        lag = None
-        if is_replica:
-            cur.execute("SELECT EXTRACT(EPOCH FROM (now() - pg_last_xact_replay_timestamp())) AS lag")
-            result = cur.fetchone()
-            lag = float(result[0]) if result[0] else 0
+_users_cache = {
+    'entries': OrderedDict(), 'generation': 0, 'min_lsn': None, 'listening': False,
+    'error': None, 'error_at': None, 'logged_error': None, 'logged_at': 0.0
+}
+_users_cache_lock = threading.Lock()
+# Single-flight per halaman; lock dibagi per hash key supaya jumlahnya tetap
+# walaupun after_id dari client bisa bernilai apa saja
+_users_fill_locks = [threading.Lock() for _ in range(16)]
+_users_listener_thread = None
 
-        cur.close()
-        conn.close()
+def invalidate_users_cache(reason, min_lsn=None):
+    """
+    Buang semua entry. Fill berikutnya membaca dengan min_lsn (posisi WAL primary
+    setelah write), sehingga replica yang tertinggal tidak mengisi data lama lagi.
+    """
+    with _users_cache_lock:
+        _users_cache['generation'] += 1
+        _users_cache['entries'].clear()
+        _users_cache['min_lsn'] = min_lsn
+    USERS_CACHE_INVALIDATIONS.labels(reason).inc()
 
-        return jsonify({
-            'app_instance': APP_NAME,
-            'database_endpoint': db_host,
-            'database_role': 'replica' if is_replica else 'primary',
-            'total_users': user_count,
-            'replication_lag_seconds': lag,
-            'timestamp': datetime.now().isoformat()
-        })
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+def users_cache_lookup(key):
+    entries = _users_cache['entries']
+    entry = entries.get(key)
+    if entry is None:
+        return None
+    max_age = USERS_CACHE_MAX_AGE if _users_cache['listening'] else USERS_CACHE_TTL
+    if time.monotonic() - entry[2] >= max_age:
+        return None
+    # LRU: halaman yang sering dibaca tidak dikeluarkan lebih dulu
+    with _users_cache_lock:
+        if key in entries:
+            entries.move_to_end(key)
+    return entry
+
+def users_cache_status():
+    """Status cache & listener per process (untuk /api/pool)"""
+    return {
+        'enabled': USERS_CACHE_ENABLED,
+        'listening': _users_cache['listening'],
+        'entries': len(_users_cache['entries']),
+        'generation': _users_cache['generation'],
+        'last_error': _users_cache['error'],
+        'last_error_at': _users_cache['error_at']
+    }
+
+def record_listener_error(error):
+    """Simpan error listener; error yang sama di-log paling sering sekali per USERS_CACHE_LOG_INTERVAL"""
+    message = f'{type(error).__name__}: {error}'
+    USERS_CACHE_LISTENER_ERRORS.inc()
+    _users_cache['error'], _users_cache['error_at'] = message, datetime.now().isoformat()
+    now = time.monotonic()
+    if message != _users_cache['logged_error'] or now - _users_cache['logged_at'] >= USERS_CACHE_LOG_INTERVAL:
+        _users_cache['logged_error'], _users_cache['logged_at'] = message, now
+        app.logger.warning('users cache listener: %s (cache memakai TTL %ss sampai listener terhubung lagi)',
+                           message, USERS_CACHE_TTL)
+
+def get_cached_users_page(after_id, limit):
+    """
+    (body, etag, waktu fill) untuk satu halaman, dan apakah dari cache.
+    Body disimpan sudah di-encode, cache hit tidak menyentuh database maupun JSON encoder.
+    """
+    key = (after_id, limit)
+    entry = users_cache_lookup(key)
+    if entry is not None:
+        return entry, True
+
+    with _users_fill_locks[hash(key) % len(_users_fill_locks)]:
+        # Cek ulang, mungkin sudah diisi thread lain selama menunggu lock
+        entry = users_cache_lookup(key)
+        if entry is not None:
+            return entry, True
+
+        generation, min_lsn = _users_cache['generation'], _users_cache['min_lsn']
+        db_host, users, next_cursor = query_users_page(after_id, limit, min_lsn)
+        start = time.perf_counter()
+        body = app.json.dumps(users_page_payload(db_host, users, next_cursor)).encode()
+        # ETag hanya dari data (tanpa app_instance), sehingga tetap cocok
+        # walaupun request berikutnya dilayani instance lain
+        etag = hashlib.sha1(app.json.dumps([users, next_cursor]).encode()).hexdigest()
+        JSON_ENCODE_LATENCY.labels(current_route()).observe(time.perf_counter() - start)
+        entry = (body, etag, time.monotonic())
+
+        with _users_cache_lock:
+            # Jangan simpan hasil query yang dimulai sebelum invalidasi
+            if generation == _users_cache['generation']:
+                entries = _users_cache['entries']
+                entries[key] = entry
+                while len(entries) > USERS_CACHE_MAX_ENTRIES:
+                    entries.popitem(last=False)
+    return entry, False
+
+def users_cache_listener_loop():
+    """
+    LISTEN users_changed di primary (NOTIFY tidak dikirim ke replica).
+    Setiap notify dan setiap kali (re)connect, cache di-invalidate. Selama
+    koneksi putus, entry cache hanya berlaku USERS_CACHE_TTL detik.
+    """
+    # tcp_user_timeout & keepalive: koneksi ke primary yang mati terdeteksi
+    # dalam hitungan detik, bukan menunggu timeout TCP default
+    conninfo = db_conninfo(
+        DB_WRITE_HOST, DB_WRITE_PORT,
+        keepalives_idle=int(USERS_CACHE_PING_INTERVAL) + 1, keepalives_interval=1, keepalives_count=3,
+        tcp_user_timeout=int(USERS_CACHE_PING_INTERVAL * 1000) + DB_CONNECT_TIMEOUT * 1000
+    )
+    while True:
+        try:
+            with psycopg.connect(conninfo, autocommit=True) as conn:
+                # Tanpa trigger LISTEN tetap berhasil tapi tidak pernah menerima notify
+                if conn.execute(USERS_TRIGGER_CHECK_QUERY).fetchone() is None:
+                    raise RuntimeError('trigger users_changed tidak ada, jalankan migration V3__users_notify_trigger.sql')
+                conn.execute(f'LISTEN {USERS_NOTIFY_CHANNEL}')
+                # Write selama listener putus tidak ter-notify
+                invalidate_users_cache('reconnect', conn.execute(CURRENT_LSN_QUERY).fetchone()[0])
+                _users_cache['listening'] = True
+                if _users_cache['error']:
+                    app.logger.warning('users cache listener: terhubung lagi ke %s:%s', DB_WRITE_HOST, DB_WRITE_PORT)
+                    _users_cache['error'], _users_cache['logged_error'] = None, None
+                while True:
+                    notified = any(True for _ in conn.notifies(timeout=USERS_CACHE_PING_INTERVAL, stop_after=1))
+                    # Notify dikirim setelah commit, posisi WAL saat ini sudah mencakup write tersebut
+                    lsn = conn.execute(CURRENT_LSN_QUERY).fetchone()[0]
+                    if notified:
+                        invalidate_users_cache('notify', lsn)
+        except Exception as e:
+            _users_cache['listening'] = False
+            record_listener_error(e)
+        time.sleep(USERS_CACHE_PING_INTERVAL)
+
+def start_users_cache_listener():
+    """Start listener (sekali per process, setelah fork)"""
+    global _users_listener_thread
+    if _users_listener_thread is not None:
+        return
+    with _users_cache_lock:
+        if _users_listener_thread is None:
+            _users_listener_thread = threading.Thread(
+                target=users_cache_listener_loop, name='users-cache-listener', daemon=True)
+            _users_listener_thread.start()
 
 @app.route('/api/users', methods=['GET'])
 def get_users():
-    """Get all users (read from read endpoint)"""
+    """
+    Get users (read from read endpoint)
+    - ?limit=&after_id= atau ?limit=&cursor= : keyset pagination
+    - ?format=ndjson atau ?stream=1 : streaming dari server-side cursor
+    - Halaman di-cache per process (lihat get_cached_users_page), dengan
+      ETag / If-None-Match -> 304. Request dengan min_lsn tidak memakai cache.
+    """
+    stream_format = request.args.get('format')
+    if stream_format == 'ndjson' or request.args.get('stream') == '1':
+        return stream_users(stream_format or 'json')
+
     try:
-        conn, db_host = get_db_connection(for_write=False)
-        cur = conn.cursor()
-        cur.execute('SELECT id, name, email, created_at FROM users ORDER BY id DESC LIMIT 50')
-        users = []
-        for row in cur.fetchall():
-            # psycopg3 returns VARCHAR as bytes, need to decode
-            users.append({
-                'id': int(row[0]),
-                'name': row[1].decode('utf-8') if isinstance(row[1], bytes) else str(row[1]),
-                'email': row[2].decode('utf-8') if isinstance(row[2], bytes) else str(row[2]),
-                'created_at': row[3].isoformat() if row[3] else None
-            })
-        cur.close()
-        conn.close()
+        after_id, limit = parse_page_args(request.args, USERS_PAGE_SIZE)
+        min_lsn = get_min_lsn(request)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
-        return jsonify({
-            'app_instance': APP_NAME,
-            'database_endpoint': db_host,
-            'count': len(users),
-            'users': users
-        })
+    try:
+        if min_lsn or not USERS_CACHE_ENABLED:
+            USERS_CACHE_REQUESTS.labels('bypass').inc()
+            return jsonify(users_page_payload(*query_users_page(after_id, limit, min_lsn)))
+
+        start_users_cache_listener()
+        (body, etag, _), hit = get_cached_users_page(after_id, limit)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+    if request.if_none_match.contains_weak(etag):
+        USERS_CACHE_REQUESTS.labels('not_modified').inc()
+        response = Response(status=304)
+    else:
+        USERS_CACHE_REQUESTS.labels('hit' if hit else 'miss').inc()
+        response = Response(body, mimetype='application/json')
+    response.set_etag(etag, weak=True)
+    # Browser/proxy boleh menyimpan, tapi harus revalidasi (If-None-Match) setiap kali
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Cache'] = 'HIT' if hit else 'MISS'
+    return response
+
+def stream_users(stream_format):
+    """
+    Kirim users sebagai chunked JSON atau NDJSON langsung dari server-side
+    cursor. Row diambil per USERS_STREAM_BATCH, sehingga memory tetap kecil
+    berapapun jumlah row yang diminta. Tanpa limit berarti seluruh tabel.
+    """
+    try:
+        after_id, limit = parse_page_args(request.args, None, max_limit=None)
+        min_lsn = get_min_lsn(request)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # Koneksi diambil sebelum response dimulai, supaya error koneksi masih
+    # bisa dikirim sebagai HTTP 500. Koneksi dikembalikan ke pool saat
+    # response selesai dikirim (atau client disconnect).
+    resources = ExitStack()
+    try:
+        conn, db_host = resources.enter_context(get_db_connection(for_write=False, min_lsn=min_lsn))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+    def generate():
+        if stream_format != 'ndjson':
+            yield ('{"app_instance": %s, "database_endpoint": %s, "users": ['
+                   % (json.dumps(APP_NAME), json.dumps(db_host)))
+
+        count = 0
+        with conn.cursor(name='stream_users') as cur:
+            cur.itersize = USERS_STREAM_BATCH
+            query, params = build_users_query(after_id, limit)
+            cur.execute(query, params)
+            for row in cur:
+                user = json.dumps(user_to_dict(row))
+                if stream_format == 'ndjson':
+                    yield user + '\n'
+                else:
+                    yield ',' + user if count else user
+                count += 1
+
+        if stream_format != 'ndjson':
+            yield '], "count": %d}' % count
+
+    mimetype = 'application/x-ndjson' if stream_format == 'ndjson' else 'application/json'
+    response = Response(stream_with_context(generate()), mimetype=mimetype)
+    response.call_on_close(resources.close)
+    return response
+
 @app.route('/api/users', methods=['POST'])
 def create_user():
     """Create new user (write to write endpoint)"""
@@ -265,29 +684,176 @@ def create_user():
         if not name or not email:
             return jsonify({'error': 'name and email required'}), 400
 
-        conn, db_host = get_db_connection(for_write=True)
-        cur = conn.cursor()
-        cur.execute(
-            'INSERT INTO users (name, email) VALUES (%s, %s) RETURNING id, name, email, created_at',
-            (name, email)
-        )
-        result = cur.fetchone()
-        conn.commit()
-        cur.close()
-        conn.close()
+        with get_db_connection(for_write=True) as (conn, db_host):
+            cur = conn.cursor()
+            cur.execute(
+                'INSERT INTO users (name, email) VALUES (%s, %s) RETURNING id, name, email, created_at',
+                (name, email)
+            )
+            result = cur.fetchone()
+            conn.commit()
+            # Posisi WAL setelah commit, dipakai client sebagai min_lsn
+            # saat membaca supaya melihat tulisannya sendiri
+            cur.execute(CURRENT_LSN_QUERY)
+            lsn = cur.fetchone()[0]
+            cur.close()
 
         return jsonify({
             'app_instance': APP_NAME,
             'database_endpoint': db_host,
-            'user': {
-                'id': int(result[0]),
-                'name': result[1].decode('utf-8') if isinstance(result[1], bytes) else str(result[1]),
-                'email': result[2].decode('utf-8') if isinstance(result[2], bytes) else str(result[2]),
-                'created_at': result[3].isoformat()
-            }
+            'user': user_to_dict(result),
+            'lsn': lsn
         }), 201
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def read_bulk_rows():
+    """
+    Baca input bulk sebagai (index, data): JSON array, atau NDJSON
+    (Content-Type application/x-ndjson) yang dibaca per baris dari request stream
+    """
+    if request.mimetype == 'application/x-ndjson':
+        index = 0
+        for line in request.stream:
+            if not line.strip():
+                continue
+            try:
+                yield index, json.loads(line)
+            except ValueError:
+                yield index, None
+            index += 1
+    else:
+        # silent: body yang bukan JSON valid / Content-Type salah menjadi None
+        # (ValueError -> 400), bukan BadRequest yang tertangkap sebagai error 500
+        data = request.get_json(silent=True)
+        if not isinstance(data, list):
+            raise ValueError('expected a JSON array of users')
+        yield from enumerate(data)
+
+def validate_bulk_row(data):
+    """Return (name, email) atau pesan error untuk satu row"""
+    if not isinstance(data, dict):
+        return None, 'invalid JSON object'
+    name, email = data.get('name'), data.get('email')
+    if not name or not email or not isinstance(name, str) or not isinstance(email, str):
+        return None, 'name and email required'
+    if len(name) > 100 or len(email) > 100:
+        return None, 'name and email must be at most 100 characters'
+    for value in (name, email):
+        # PostgreSQL tidak bisa menyimpan NUL di kolom teks, dan surrogate
+        # tunggal (misalnya "\ud800" di JSON) tidak bisa di-encode ke UTF-8
+        if '\x00' in value:
+            return None, 'name and email must not contain NUL characters'
+        try:
+            value.encode('utf-8')
+        except UnicodeEncodeError:
+            return None, 'name and email must be valid UTF-8 text'
+    return (name, email), None
+
+# Context DataError dari COPY: "COPY users_bulk, line 3, column email: ..."
+COPY_ERROR_LINE = re.compile(r'\bCOPY users_bulk, line (\d+)')
+
+def failed_bulk_index(batch, error):
+    """Index row input penyebab DataError saat COPY, None jika tidak diketahui"""
+    match = COPY_ERROR_LINE.search(error.diag.context or '')
+    if match and 1 <= int(match.group(1)) <= len(batch):
+        return batch[int(match.group(1)) - 1][0]
+    return None
+
+def insert_bulk_batch(conn, batch):
+    """
+    Insert satu batch [(index, name, email)] dalam satu transaksi:
+    COPY ke temporary table, lalu INSERT ... ON CONFLICT (email) DO NOTHING.
+    Return list index yang email-nya sudah ada (conflict).
+    """
+    with conn.transaction():
+        cur = conn.cursor()
+        with cur.copy('COPY users_bulk (ord, name, email) FROM STDIN') as copy:
+            for row in batch:
+                copy.write_row(row)
+        cur.execute(
+            'INSERT INTO users (name, email) '
+            'SELECT name, email FROM users_bulk ORDER BY ord '
+            'ON CONFLICT (email) DO NOTHING RETURNING email'
+        )
+        inserted = {row[0] for row in cur.fetchall()}
+        cur.close()
+
+    # Email yang sama bisa muncul lebih dari sekali dalam satu batch,
+    # hanya kemunculan pertama yang ter-insert
+    conflicts = []
+    for index, name, email in batch:
+        if email in inserted:
+            inserted.discard(email)
+        else:
+            conflicts.append(index)
+    return conflicts
+
+@app.route('/api/users/bulk', methods=['POST'])
+def create_users_bulk():
+    """
+    Bulk create users (write to write endpoint).
+    Input di-load per BULK_BATCH_SIZE row via COPY, satu transaksi per batch.
+    Email yang sudah ada dilaporkan per row tanpa menggagalkan batch.
+    """
+    result = {'inserted': 0, 'conflicts': 0, 'invalid': 0, 'batches': 0, 'errors': [], 'lsn': None}
+
+    def add_error(index, error):
+        if len(result['errors']) < BULK_MAX_ERRORS:
+            result['errors'].append({'index': index, 'error': error})
+
+    def flush(batch):
+        try:
+            conflicts = insert_bulk_batch(conn, batch)
+        except psycopg.errors.DataError as e:
+            failed['index'] = failed_bulk_index(batch, e)
+            raise
+        for index in conflicts:
+            add_error(index, 'email already exists')
+        result['conflicts'] += len(conflicts)
+        result['inserted'] += len(batch) - len(conflicts)
+        result['batches'] += 1
+
+    db_host = None
+    failed = {}
+    try:
+        with get_db_connection(for_write=True) as (conn, db_host):
+            conn.execute(
+                'CREATE TEMP TABLE IF NOT EXISTS users_bulk '
+                '(ord INTEGER, name VARCHAR(100), email VARCHAR(100)) ON COMMIT DELETE ROWS'
+            )
+            conn.commit()
+
+            batch = []
+            for index, data in read_bulk_rows():
+                values, error = validate_bulk_row(data)
+                if error:
+                    add_error(index, error)
+                    result['invalid'] += 1
+                    continue
+                batch.append((index,) + values)
+                if len(batch) >= BULK_BATCH_SIZE:
+                    flush(batch)
+                    batch = []
+            if batch:
+                flush(batch)
+            result['lsn'] = conn.execute(CURRENT_LSN_QUERY).fetchone()[0]
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except psycopg.errors.DataError as e:
+        # Nilai yang lolos validate_bulk_row tapi ditolak PostgreSQL: batch ini
+        # di-rollback, batch sebelumnya tetap ter-commit
+        index = failed.get('index')
+        error = e.diag.message_primary or str(e)
+        if index is not None:
+            add_error(index, error)
+        return jsonify(dict(result, app_instance=APP_NAME, database_endpoint=db_host,
+                            error=f'row {index}: {error}' if index is not None else error)), 400
+    except Exception as e:
+        # Batch sebelumnya sudah di-commit, laporkan sampai mana proses berjalan
+        return jsonify(dict(result, app_instance=APP_NAME, database_endpoint=db_host, error=str(e))), 500
+
+    return jsonify(dict(result, app_instance=APP_NAME, database_endpoint=db_host)), 200
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=False)
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+
+# Varian async dari app.py (Quart + psycopg AsyncConnectionPool).
+# Request yang menunggu PostgreSQL hanya memakai coroutine, bukan OS thread,
+# sehingga saat failover ribuan request lambat tidak menghabiskan worker.
+# Jalankan dengan: hypercorn --bind 0.0.0.0:5000 --workers 2 app_async:app
+
+import os
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+from psycopg_pool import AsyncConnectionPool
+from quart import Quart, jsonify, request
+
+# Konfigurasi, query SQL, helper dan HTML dashboard dari common.py (dipakai juga oleh app.py)
+from common import (
+    APP_NAME, DB_WRITE_HOST, DB_WRITE_PORT, DB_READ_HOST, DB_READ_PORT,
+    DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE, DB_POOL_TIMEOUT, DB_POOL_MAX_IDLE, DB_POOL_MAX_LIFETIME,
+    USERS_PAGE_SIZE, RYW_MAX_WAIT, RYW_POLL_INTERVAL, HEALTH_CHECK_INTERVAL,
+    STATS_CACHE_TTL, STATS_EXACT_COUNT_LIMIT,
+    LSN_CHECK_QUERY, CURRENT_LSN_QUERY, STATS_QUERY,
+    db_conninfo, get_min_lsn, get_pool_stats, render_home, user_to_dict,
+    encode_cursor, parse_page_args, build_users_query, stats_to_dict
+)
+
+app = Quart(__name__)
+
+# Timeout per query. asyncio membatalkan coroutine di sisi aplikasi,
+# statement_timeout menghentikan query yang sama di sisi PostgreSQL.
+DB_QUERY_TIMEOUT = float(os.getenv('DB_QUERY_TIMEOUT', '5'))
+
+def create_async_pool(name, host, port):
+    """Buat async connection pool ke satu endpoint HAProxy (dibuka di before_serving)"""
+    conninfo = db_conninfo(host, port, options=f'-c statement_timeout={int(DB_QUERY_TIMEOUT * 1000)}')
+    return AsyncConnectionPool(
+        conninfo,
+        name=name,
+        min_size=DB_POOL_MIN_SIZE,
+        max_size=DB_POOL_MAX_SIZE,
+        timeout=DB_POOL_TIMEOUT,
+        max_idle=DB_POOL_MAX_IDLE,
+        max_lifetime=DB_POOL_MAX_LIFETIME,
+        check=AsyncConnectionPool.check_connection,
+        open=False
+    )
+
+write_pool = create_async_pool('write', DB_WRITE_HOST, DB_WRITE_PORT)
+read_pool = create_async_pool('read', DB_READ_HOST, DB_READ_PORT)
+
+async def wait_for_lsn(conn, min_lsn):
+    """Tunggu sampai RYW_MAX_WAIT detik hingga server koneksi ini sudah me-replay min_lsn"""
+    deadline = time.monotonic() + RYW_MAX_WAIT
+    while True:
+        if (await fetch(conn, LSN_CHECK_QUERY, (min_lsn,), one=True))[0]:
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        await asyncio.sleep(RYW_POLL_INTERVAL)
+
+@asynccontextmanager
+async def get_db_connection(for_write=False, min_lsn=None):
+    """
+    Ambil koneksi dari async pool, dengan fallback read ke write dan
+    read-your-writes (min_lsn) seperti get_db_connection() di app.py
+    """
+    if for_write:
+        pool, db_host = write_pool, f"{DB_WRITE_HOST}:{DB_WRITE_PORT}"
+        conn = await pool.getconn()
+    else:
+        try:
+            pool, db_host = read_pool, f"{DB_READ_HOST}:{DB_READ_PORT}"
+            conn = await pool.getconn()
+        except Exception:
+            # Fallback to write endpoint if read fails
+            pool, db_host = write_pool, f"{DB_WRITE_HOST}:{DB_WRITE_PORT} (fallback)"
+            conn = await pool.getconn()
+
+    if min_lsn and pool is read_pool:
+        try:
+            caught_up = await wait_for_lsn(conn, min_lsn)
+            await conn.rollback()
+        except BaseException:
+            await pool.putconn(conn)
+            raise
+        if not caught_up:
+            await pool.putconn(conn)
+            pool, db_host = write_pool, f"{DB_WRITE_HOST}:{DB_WRITE_PORT} (read-your-writes)"
+            conn = await pool.getconn()
+
+    try:
+        async with conn:
+            yield conn, db_host
+    finally:
+        # Koneksi yang query-nya dibatalkan (status ACTIVE) dibuang oleh pool
+        await pool.putconn(conn)
+
+async def fetch(conn, query, params=None, one=False):
+    """Jalankan query dengan batas waktu DB_QUERY_TIMEOUT"""
+    async def run():
+        cur = await conn.execute(query, params)
+        return await (cur.fetchone() if one else cur.fetchall())
+    return await asyncio.wait_for(run(), DB_QUERY_TIMEOUT)
+
+_health_state = {'healthy': False, 'database': None, 'error': 'not checked yet', 'checked_at': None, 'checked': 0.0}
+_background_tasks = []
+
+async def check_database():
+    """Jalankan SELECT 1 ke read endpoint dan simpan hasilnya di _health_state"""
+    try:
+        async with get_db_connection() as (conn, db_host):
+            await fetch(conn, 'SELECT 1', one=True)
+        result = {'healthy': True, 'database': db_host, 'error': None}
+    except Exception as e:
+        result = {'healthy': False, 'database': None, 'error': str(e) or type(e).__name__}
+    result['checked_at'] = datetime.now().isoformat()
+    result['checked'] = time.monotonic()
+    _health_state.update(result)
+
+async def health_checker_loop():
+    while True:
+        await check_database()
+        await asyncio.sleep(HEALTH_CHECK_INTERVAL)
+
+@app.before_serving
+async def startup():
+    """Buka pool dan start health checker di setiap worker process"""
+    await write_pool.open(wait=False)
+    await read_pool.open(wait=False)
+    _background_tasks.append(asyncio.create_task(health_checker_loop()))
+
+@app.after_serving
+async def shutdown():
+    for task in _background_tasks:
+        task.cancel()
+    await write_pool.close()
+    await read_pool.close()
+
+@app.route('/')
+async def index():
+    """Home page with instance info"""
+    return render_home()
+
+@app.route('/livez')
+async def livez():
+    """Liveness probe: process masih bisa melayani request, tanpa menyentuh database"""
+    return jsonify({'status': 'alive', 'instance': APP_NAME}), 200
+
+@app.route('/readyz')
+@app.route('/health')
+async def health():
+    """Readiness probe untuk HAProxy: hasil cek database terakhir dari background task"""
+    state = dict(_health_state)
+
+    if state['healthy'] and time.monotonic() - state['checked'] > HEALTH_CHECK_INTERVAL * 3 + DB_POOL_TIMEOUT:
+        state['healthy'], state['error'] = False, 'database check is stale'
+
+    if state['healthy']:
+        return jsonify({
+            'status': 'healthy',
+            'instance': APP_NAME,
+            'timestamp': datetime.now().isoformat(),
+            'database': state['database'],
+            'checked_at': state['checked_at']
+        }), 200
+    return jsonify({
+        'status': 'unhealthy',
+        'instance': APP_NAME,
+        'error': state['error'],
+        'timestamp': datetime.now().isoformat(),
+        'checked_at': state['checked_at']
+    }), 503
+
+_stats_cache = {'value': None, 'error': None, 'expires': 0.0}
+_stats_lock = asyncio.Lock()
+
+async def query_stats():
+    """Ambil statistik database dari read endpoint"""
+    async with get_db_connection(for_write=False) as (conn, db_host):
+        is_replica, lag, estimated_count = await fetch(conn, STATS_QUERY, one=True)
+
+        estimated = STATS_EXACT_COUNT_LIMIT > 0 and estimated_count >= STATS_EXACT_COUNT_LIMIT
+        if estimated:
+            user_count = estimated_count
+        else:
+            user_count = (await fetch(conn, 'SELECT COUNT(*) FROM users', one=True))[0]
+
+    return stats_to_dict(db_host, is_replica, lag, user_count, estimated)
+
+async def get_cached_stats():
+    """Statistik database dengan TTL cache dan single-flight (lihat app.get_cached_stats)"""
+    if STATS_CACHE_TTL <= 0:
+        return await query_stats()
+
+    if time.monotonic() >= _stats_cache['expires']:
+        async with _stats_lock:
+            if time.monotonic() >= _stats_cache['expires']:
+                try:
+                    _stats_cache['value'], _stats_cache['error'] = await query_stats(), None
+                except Exception as e:
+                    _stats_cache['value'], _stats_cache['error'] = None, e
+                _stats_cache['expires'] = time.monotonic() + STATS_CACHE_TTL
+
+    if _stats_cache['error']:
+        raise _stats_cache['error']
+    return _stats_cache['value']
+
+@app.route('/api/stats')
+async def stats():
+    """Get database statistics (read operation, cached)"""
+    try:
+        result = dict(await get_cached_stats())
+        result['timestamp'] = datetime.now().isoformat()
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({'error': str(e) or type(e).__name__}), 500
+
+@app.route('/api/pool')
+async def pool_stats():
+    """Statistik connection pool per process (untuk sizing pool)"""
+    return jsonify({
+        'app_instance': APP_NAME,
+        'pid': os.getpid(),
+        'write': get_pool_stats(write_pool),
+        'read': get_pool_stats(read_pool),
+        'timestamp': datetime.now().isoformat()
+    })
+
+@app.route('/api/users', methods=['GET'])
+async def get_users():
+    """Get users (read from read endpoint), dengan keyset pagination ?limit=&cursor="""
+    try:
+        after_id, limit = parse_page_args(request.args, USERS_PAGE_SIZE)
+        min_lsn = get_min_lsn(request)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        async with get_db_connection(for_write=False, min_lsn=min_lsn) as (conn, db_host):
+            query, params = build_users_query(after_id, limit + 1)
+            rows = await fetch(conn, query, params)
+
+        has_more = len(rows) > limit
+        users = [user_to_dict(row) for row in rows[:limit]]
+
+        return jsonify({
+            'app_instance': APP_NAME,
+            'database_endpoint': db_host,
+            'count': len(users),
+            'users': users,
+            'next_cursor': encode_cursor(users[-1]['id']) if has_more else None
+        })
+    except Exception as e:
+        return jsonify({'error': str(e) or type(e).__name__}), 500
+
+@app.route('/api/users', methods=['POST'])
+async def create_user():
+    """Create new user (write to write endpoint)"""
+    try:
+        data = await request.get_json()
+        name = data.get('name')
+        email = data.get('email')
+
+        if not name or not email:
+            return jsonify({'error': 'name and email required'}), 400
+
+        async with get_db_connection(for_write=True) as (conn, db_host):
+            result = await fetch(
+                conn,
+                'INSERT INTO users (name, email) VALUES (%s, %s) RETURNING id, name, email, created_at',
+                (name, email),
+                one=True
+            )
+            await conn.commit()
+            lsn = (await fetch(conn, CURRENT_LSN_QUERY, one=True))[0]
+
+        return jsonify({
+            'app_instance': APP_NAME,
+            'database_endpoint': db_host,
+            'user': user_to_dict(result),
+            'lsn': lsn
+        }), 201
+    except Exception as e:
+        return jsonify({'error': str(e) or type(e).__name__}), 500
+
+if __name__ == '__main__':
+    app.run(host='0.0.0.0', port=5000)
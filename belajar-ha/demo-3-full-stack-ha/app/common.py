@@ -0,0 +1,315 @@
+# Konfigurasi, query SQL dan helper yang dipakai bersama oleh app.py (Flask)
+# dan app_async.py (Quart), supaya app_async.py tidak perlu meng-import app.py
+# (yang ikut membuat pool dan thread Flask).
+import os
+import re
+import json
+import base64
+import socket
+from datetime import datetime
+
+from psycopg.conninfo import make_conninfo
+
+# Configuration - Connect via HAProxy
+DB_WRITE_HOST = os.getenv('DB_WRITE_HOST', 'haproxy1')
+DB_WRITE_PORT = os.getenv('DB_WRITE_PORT', '6432')
+DB_READ_HOST = os.getenv('DB_READ_HOST', 'haproxy1')
+DB_READ_PORT = os.getenv('DB_READ_PORT', '6433')
+DB_NAME = os.getenv('DB_NAME', 'demodb')
+DB_USER = os.getenv('DB_USER', 'postgres')
+DB_PASSWORD = os.getenv('DB_PASSWORD', 'postgres')
+APP_NAME = socket.gethostname()
+
+# Connection pool - satu pool untuk write (6432), satu untuk read (6433)
+DB_CONNECT_TIMEOUT = int(os.getenv('DB_CONNECT_TIMEOUT', '3'))
+DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', '1'))
+DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', '10'))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '3'))
+DB_POOL_MAX_IDLE = float(os.getenv('DB_POOL_MAX_IDLE', '300'))
+DB_POOL_MAX_LIFETIME = float(os.getenv('DB_POOL_MAX_LIFETIME', '1800'))
+
+# Read-your-writes: berapa lama read endpoint ditunggu mengejar LSN client
+# sebelum read dialihkan ke primary
+RYW_MAX_WAIT = float(os.getenv('RYW_MAX_WAIT', '0.5'))
+RYW_POLL_INTERVAL = float(os.getenv('RYW_POLL_INTERVAL', '0.02'))
+
+# Pagination GET /api/users
+USERS_PAGE_SIZE = int(os.getenv('USERS_PAGE_SIZE', '50'))
+USERS_MAX_PAGE_SIZE = int(os.getenv('USERS_MAX_PAGE_SIZE', '1000'))
+USERS_STREAM_BATCH = int(os.getenv('USERS_STREAM_BATCH', '1000'))
+
+# Bulk insert POST /api/users/bulk
+BULK_BATCH_SIZE = int(os.getenv('BULK_BATCH_SIZE', '1000'))
+BULK_MAX_ERRORS = int(os.getenv('BULK_MAX_ERRORS', '1000'))
+
+# Readiness check ke database dijalankan di background thread
+HEALTH_CHECK_INTERVAL = float(os.getenv('HEALTH_CHECK_INTERVAL', '2'))
+
+# Cache /api/stats per process (0 = tanpa cache)
+STATS_CACHE_TTL = float(os.getenv('STATS_CACHE_TTL', '1'))
+# Di atas jumlah row ini, total_users memakai estimasi statistik PostgreSQL
+# (0 = selalu COUNT(*) exact)
+STATS_EXACT_COUNT_LIMIT = int(os.getenv('STATS_EXACT_COUNT_LIMIT', '100000'))
+
+def get_instance_color():
+    """Get unique gradient colors based on instance hostname"""
+    colors = {
+        'app1': ('667eea', '764ba2'),  # Purple
+        'app2': ('f093fb', '4facfe'),  # Pink to Blue
+        'app3': ('43e97b', '38f9d7'),  # Green to Cyan
+    }
+    # Default gradient if hostname not in map
+    default = ('fa709a', 'fee140')  # Pink to Yellow
+
+    # Extract base hostname (app1, app2, etc)
+    base_name = APP_NAME.split('.')[0] if '.' in APP_NAME else APP_NAME
+    color1, color2 = colors.get(base_name, default)
+
+    return f"linear-gradient(135deg, #{color1} 0%, #{color2} 100%)"
+
+def db_conninfo(host, port, **kwargs):
+    """Connection string ke satu endpoint HAProxy"""
+    return make_conninfo(
+        host=host,
+        port=port,
+        dbname=DB_NAME,
+        user=DB_USER,
+        password=DB_PASSWORD,
+        connect_timeout=DB_CONNECT_TIMEOUT,
+        # Tanpa ini, database dengan encoding SQL_ASCII mengembalikan
+        # VARCHAR sebagai bytes dan harus di-decode per row
+        client_encoding='utf8',
+        **kwargs
+    )
+
+LSN_PATTERN = re.compile(r'^[0-9A-Fa-f]{1,8}/[0-9A-Fa-f]{1,8}$')
+# Primary selalu up to date, replica dibandingkan dengan posisi WAL yang sudah di-replay
+LSN_CHECK_QUERY = 'SELECT NOT pg_is_in_recovery() OR pg_last_wal_replay_lsn() >= %s::pg_lsn'
+CURRENT_LSN_QUERY = 'SELECT pg_current_wal_lsn()::text'
+
+def get_min_lsn(req):
+    """
+    Token read-your-writes dari request (?min_lsn= atau header X-Min-LSN),
+    yaitu nilai 'lsn' dari response write sebelumnya
+    """
+    lsn = req.args.get('min_lsn') or req.headers.get('X-Min-LSN')
+    if lsn and not LSN_PATTERN.match(lsn):
+        raise ValueError('invalid min_lsn')
+    return lsn or None
+
+def get_pool_stats(pool):
+    """Ringkasan statistik pool untuk sizing"""
+    stats = pool.get_stats()
+    size = stats.get('pool_size', 0)
+    available = stats.get('pool_available', 0)
+    return {
+        'min_size': stats.get('pool_min', 0),
+        'max_size': stats.get('pool_max', 0),
+        'size': size,
+        'in_use': size - available,
+        'available': available,
+        'requests_waiting': stats.get('requests_waiting', 0),
+        'requests_total': stats.get('requests_num', 0),
+        'requests_queued': stats.get('requests_queued', 0),
+        'requests_wait_ms': stats.get('requests_wait_ms', 0),
+        'requests_timeouts': stats.get('requests_errors', 0),
+        'connections_total': stats.get('connections_num', 0),
+        'connections_errors': stats.get('connections_errors', 0),
+        'connections_lost': stats.get('connections_lost', 0)
+    }
+
+def render_home():
+    """HTML dashboard (dipakai home() di app.py dan index() di app_async.py)"""
+    bg_gradient = get_instance_color()
+    return f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>Full Stack HA Demo</title>
+        <style>
+            body {{
+                font-family: Arial, sans-serif;
+                max-width: 1200px;
+                margin: 50px auto;
+                padding: 20px;
+                background: {bg_gradient};
+                color: white;
+            }}
+            .container {{
+                background: rgba(255,255,255,0.1);
+                padding: 30px;
+                border-radius: 10px;
+                backdrop-filter: blur(10px);
+            }}
+            h1 {{ margin-top: 0; }}
+            .info {{ margin: 15px 0; font-size: 18px; }}
+            .endpoint {{
+                background: rgba(0,0,0,0.2);
+                padding: 10px;
+                margin: 10px 0;
+                border-radius: 5px;
+                font-family: monospace;
+            }}
+            .button {{
+                display: inline-block;
+                padding: 10px 20px;
+                margin: 10px 5px;
+                background: rgba(255,255,255,0.2);
+                border: 1px solid white;
+                border-radius: 5px;
+                color: white;
+                text-decoration: none;
+                cursor: pointer;
+            }}
+            .button:hover {{ background: rgba(255,255,255,0.3); }}
+            #stats {{ margin-top: 20px; }}
+        </style>
+        <script>
+            function loadStats() {{
+                fetch('/api/stats')
+                    .then(r => r.json())
+                    .then(data => {{
+                        document.getElementById('stats').innerHTML =
+                            '<pre>' + JSON.stringify(data, null, 2) + '</pre>';
+                    }});
+            }}
+            function addUser() {{
+                const name = prompt('Enter name:');
+                if (name) {{
+                    fetch('/api/users', {{
+                        method: 'POST',
+                        headers: {{'Content-Type': 'application/json'}},
+                        body: JSON.stringify({{name: name, email: name + '@example.com'}})
+                    }})
+                    .then(r => r.json())
+                    .then(data => alert('User added: ' + JSON.stringify(data)))
+                    .then(() => loadStats());
+                }}
+            }}
+            setInterval(loadStats, 2000);
+            window.onload = loadStats;
+        </script>
+    </head>
+    <body>
+        <div class="container">
+            <h1>🚀 Full Stack High Availability Demo</h1>
+            <div class="info">📦 Application Instance: <strong>{APP_NAME}</strong></div>
+            <div class="info">⏰ Server Time: <strong>{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</strong></div>
+
+            <h2>Available Endpoints:</h2>
+            <div class="endpoint">GET  /health, /readyz - Readiness check (cached database check)</div>
+            <div class="endpoint">GET  /livez - Liveness check</div>
+            <div class="endpoint">GET  /api/stats - Database statistics</div>
+            <div class="endpoint">GET  /api/pool - Connection pool statistics</div>
+            <div class="endpoint">GET  /metrics - Prometheus metrics</div>
+            <div class="endpoint">GET  /api/users?limit=&cursor= - List users (keyset pagination)</div>
+            <div class="endpoint">GET  /api/users?format=ndjson - Stream all users</div>
+            <div class="endpoint">POST /api/users - Create new user</div>
+            <div class="endpoint">POST /api/users/bulk - Create users from JSON array / NDJSON</div>
+
+            <div>
+                <button class="button" onclick="loadStats()">Refresh Stats</button>
+                <button class="button" onclick="addUser()">Add User</button>
+                <a href="/api/users" class="button" target="_blank">View Users</a>
+            </div>
+
+            <div id="stats">Loading...</div>
+        </div>
+    </body>
+    </html>
+    """
+
+# Satu query untuk role, replication lag dan estimasi jumlah row.
+# reltuples (pg_class) ikut direplikasi ke replica, sedangkan n_live_tup
+# (pg_stat_user_tables) hanya terisi di primary; n_live_tup dipakai jika
+# tabel belum pernah di-ANALYZE. Tanda "belum di-ANALYZE" adalah reltuples = -1
+# sejak PostgreSQL 14 dan reltuples = 0 di versi sebelumnya, jadi keduanya
+# (reltuples <= 0) memakai n_live_tup.
+STATS_QUERY = """
+    SELECT pg_is_in_recovery(),
+           CASE WHEN pg_is_in_recovery()
+                THEN EXTRACT(EPOCH FROM (now() - pg_last_xact_replay_timestamp()))
+           END,
+           CASE WHEN c.reltuples > 0 THEN c.reltuples::bigint
+                ELSE COALESCE(s.n_live_tup, 0)
+           END
+    FROM pg_class c
+    LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+    WHERE c.oid = 'users'::regclass
+"""
+
+def stats_to_dict(db_host, is_replica, lag, user_count, estimated):
+    """Payload JSON /api/stats"""
+    return {
+        'app_instance': APP_NAME,
+        'database_endpoint': db_host,
+        'database_role': 'replica' if is_replica else 'primary',
+        'total_users': user_count,
+        'total_users_estimated': estimated,
+        'replication_lag_seconds': (float(lag) if lag else 0) if is_replica else None,
+        'queried_at': datetime.now().isoformat()
+    }
+
+def user_to_dict(row):
+    """Konversi row (id, name, email, created_at) menjadi dict JSON"""
+    return {
+        'id': row[0],
+        'name': row[1],
+        'email': row[2],
+        'created_at': row[3].isoformat() if row[3] else None
+    }
+
+def encode_cursor(last_id):
+    """Cursor pagination (opaque) dari id terakhir di halaman"""
+    return base64.urlsafe_b64encode(json.dumps({'after_id': last_id}).encode()).decode()
+
+def decode_cursor(cursor):
+    """Kebalikan encode_cursor, ValueError jika cursor tidak valid"""
+    try:
+        return int(json.loads(base64.urlsafe_b64decode(cursor.encode()))['after_id'])
+    except Exception:
+        raise ValueError('invalid cursor')
+
+def int_arg(args, name, default=None):
+    """Query parameter integer, ValueError jika ada tapi bukan angka"""
+    value = args.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f'{name} must be an integer')
+
+def parse_page_args(args, default_limit, max_limit=USERS_MAX_PAGE_SIZE):
+    """
+    Baca after_id/cursor dan limit dari query string. max_limit=None untuk
+    streaming mode: memory tetap kecil berapapun limit-nya.
+    """
+    after_id = int_arg(args, 'after_id')
+    if args.get('cursor'):
+        after_id = decode_cursor(args['cursor'])
+
+    limit = int_arg(args, 'limit', default_limit)
+    if limit is not None:
+        if max_limit is None and limit < 1:
+            raise ValueError('limit must be at least 1')
+        if max_limit is not None and not 1 <= limit <= max_limit:
+            raise ValueError(f'limit must be between 1 and {max_limit}')
+    return after_id, limit
+
+def build_users_query(after_id, limit):
+    """
+    Keyset pagination di primary key users.id (urutan terbaru dulu).
+    Halaman berikutnya dimulai dari id < id terakhir, sehingga biaya query
+    tetap sama walaupun sudah di halaman ke-sekian (tidak seperti OFFSET).
+    """
+    query = 'SELECT id, name, email, created_at FROM users'
+    params = []
+    if after_id is not None:
+        query += ' WHERE id < %s'
+        params.append(after_id)
+    query += ' ORDER BY id DESC'
+    if limit is not None:
+        query += ' LIMIT %s'
+        params.append(limit)
+    return query, params
\ No newline at end of file
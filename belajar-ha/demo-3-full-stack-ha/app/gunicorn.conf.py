@@ -0,0 +1,63 @@
+# Konfigurasi Gunicorn untuk menjalankan app.py di mode production
+# Jalankan dengan: gunicorn -c gunicorn.conf.py app:app
+
+import os
+import shutil
+
+# Metrics Prometheus dari semua worker ditulis ke direktori ini dan
+# digabung di /metrics. Harus di-set sebelum app (prometheus_client) di-import.
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/prometheus_multiproc')
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+
+# Worker process dan thread per worker.
+# Setiap worker membuka pool write dan pool read sendiri (masing-masing sampai
+# DB_POOL_MAX_SIZE koneksi) plus satu koneksi LISTEN cache /api/users, jadi
+# koneksi ke primary = instance × workers × (DB_POOL_MAX_SIZE + 1).
+# Default sengaja angka tetap yang kecil, bukan berdasarkan jumlah CPU:
+# 2 × CPU + 1 di host 16 core = 33 worker per instance, jauh melebihi
+# max_connections PostgreSQL (default 100). Naikkan setelah menghitung budget.
+workers = int(os.getenv('GUNICORN_WORKERS', '2'))
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+worker_class = 'gthread'
+
+# Load aplikasi sekali di master sebelum fork (hemat memory, start lebih cepat).
+# Aman karena connection pool dan health checker baru dibuka di worker
+# saat request pertama, bukan saat import.
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').lower() == 'true'
+
+# Recycle worker secara berkala supaya memory leak tidak menumpuk
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '10000'))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '1000'))
+
+# Keep-alive ke HAProxy dan timeout request
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '30'))
+
+# Saat SIGTERM, worker berhenti menerima koneksi baru dan menyelesaikan
+# request yang sedang berjalan selama graceful_timeout detik
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '20'))
+
+accesslog = os.getenv('GUNICORN_ACCESSLOG', '-')
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOGLEVEL', 'info')
+
+
+def on_starting(server):
+    """Kosongkan metrics dari run sebelumnya"""
+    metrics_dir = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    """Hapus gauge milik worker yang sudah berhenti (counter & histogram tetap dijumlahkan)"""
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def worker_exit(server, worker):
+    """Tutup connection pool worker dengan rapi setelah request terakhir selesai"""
+    from app import read_pool, write_pool
+    for pool in (write_pool, read_pool):
+        pool.close()
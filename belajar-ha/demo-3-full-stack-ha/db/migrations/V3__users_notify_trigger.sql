@@ -0,0 +1,15 @@
+-- Kirim NOTIFY users_changed setiap kali tabel users berubah, dipakai app
+-- untuk meng-invalidate cache GET /api/users di semua instance.
+-- NOTIFY baru dikirim saat transaksi commit (tidak ada jika rollback).
+CREATE OR REPLACE FUNCTION notify_users_changed() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('users_changed', TG_OP);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- FOR EACH STATEMENT: bulk insert (COPY + INSERT ... SELECT) cukup satu notify per batch
+DROP TRIGGER IF EXISTS users_changed ON users;
+CREATE TRIGGER users_changed
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON users
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_users_changed();
@@ -0,0 +1,597 @@
+#!/usr/bin/env python3
+"""
+Load generator open-loop untuk full stack HA (pengganti generate-load.sh).
+
+Request dikirim dengan laju tetap sesuai jadwal, tidak menunggu response
+sebelumnya (open-loop). Latency dihitung dari waktu request *seharusnya*
+dikirim, sehingga saat failover request yang tertahan tetap terlihat di tail
+latency (tidak ada coordinated omission). Koneksi HTTP/1.1 keep-alive
+dipakai ulang lewat connection pool. Hanya memakai standard library.
+
+Contoh:
+    python3 scripts/load-generator.py --rate 200 --duration 120
+    python3 scripts/load-generator.py --mix read=80,write=5,stats=15 --json load.json --markdown load.md
+"""
+
+import re
+import sys
+import ssl
+import json
+import math
+import time
+import random
+import signal
+import asyncio
+import argparse
+import datetime
+from array import array
+from urllib.parse import urlsplit
+
+# Nama operasi di --mix -> endpoint
+OPERATIONS = {
+    'read': ('GET', '/api/users'),
+    'write': ('POST', '/api/users'),
+    'stats': ('GET', '/api/stats'),
+}
+DEFAULT_MIX = 'read=60,write=10,stats=30'
+# Status yang dianggap sukses per operasi
+EXPECTED_STATUS = {'read': 200, 'write': 201, 'stats': 200}
+PERCENTILES = (50, 90, 99, 99.9)
+APP_INSTANCE = re.compile(rb'"app_instance":\s*"([^"]*)"')
+
+class LatencyHistogram:
+    """
+    Histogram latency gaya HdrHistogram: nilai dalam mikrodetik dikelompokkan
+    ke bucket log-linear dengan presisi 3 digit signifikan (error relatif < 0.1%).
+    Memory tetap kecil berapapun jumlah sample, dan bisa digabung (merge).
+    """
+    SUB_BUCKET_BITS = 11
+    SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+    SUB_BUCKET_HALF = SUB_BUCKET_COUNT >> 1
+
+    def __init__(self):
+        self.counts = {}
+        self.total = 0
+        self.sum = 0
+        self.min = None
+        self.max = 0
+
+    @classmethod
+    def index_of(cls, value):
+        if value < cls.SUB_BUCKET_COUNT:
+            return value
+        shift = value.bit_length() - cls.SUB_BUCKET_BITS
+        return cls.SUB_BUCKET_COUNT + (shift - 1) * cls.SUB_BUCKET_HALF + (value >> shift) - cls.SUB_BUCKET_HALF
+
+    @classmethod
+    def highest_equivalent(cls, index):
+        """Nilai tertinggi yang masuk bucket index (seperti HdrHistogram)"""
+        if index < cls.SUB_BUCKET_COUNT:
+            return index
+        shift = (index - cls.SUB_BUCKET_COUNT) // cls.SUB_BUCKET_HALF + 1
+        sub_bucket = (index - cls.SUB_BUCKET_COUNT) % cls.SUB_BUCKET_HALF + cls.SUB_BUCKET_HALF
+        return ((sub_bucket + 1) << shift) - 1
+
+    def record(self, seconds):
+        value = max(int(seconds * 1_000_000), 0)
+        index = self.index_of(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total += 1
+        self.sum += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total += other.total
+        self.sum += other.sum
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        self.max = max(self.max, other.max)
+
+    def percentile(self, p):
+        """Latency (mikrodetik) pada persentil p (0-100)"""
+        if not self.total:
+            return None
+        rank = max(math.ceil(p / 100 * self.total), 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self.highest_equivalent(index), self.max)
+        return self.max
+
+    def summary_ms(self):
+        if not self.total:
+            return None
+        result = {f'p{p:g}': round(self.percentile(p) / 1000, 3) for p in PERCENTILES}
+        result['max'] = round(self.max / 1000, 3)
+        result['mean'] = round(self.sum / self.total / 1000, 3)
+        return result
+
+class StaleConnection(ConnectionError):
+    """Koneksi keep-alive sudah ditutup server sebelum request diproses"""
+
+class HTTPConnection:
+    """Satu koneksi HTTP/1.1 keep-alive (request dikirim satu per satu)"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.requests = 0
+
+    async def request(self, payload):
+        """Kirim request yang sudah di-encode, return (status, body, reusable)"""
+        self.writer.write(payload)
+        await self.writer.drain()
+        status_line = await self.reader.readline()
+        if not status_line:
+            if self.requests:
+                raise StaleConnection('keep-alive connection closed by server')
+            raise ConnectionError('connection closed by server')
+        self.requests += 1
+        status = int(status_line.split(None, 2)[1])
+
+        length, chunked, reusable = None, False, True
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.partition(b':')
+            name, value = name.strip().lower(), value.strip().lower()
+            if name == b'content-length':
+                length = int(value)
+            elif name == b'transfer-encoding' and b'chunked' in value:
+                chunked = True
+            elif name == b'connection' and value == b'close':
+                reusable = False
+
+        if status in (204, 304) or 100 <= status < 200:
+            body = b''
+        elif chunked:
+            body = await self.read_chunked()
+        elif length is not None:
+            body = await self.reader.readexactly(length)
+        else:
+            body, reusable = await self.reader.read(), False
+        return status, body, reusable
+
+    async def read_chunked(self):
+        chunks = []
+        while True:
+            size = int((await self.reader.readline()).split(b';')[0], 16)
+            if size == 0:
+                # Trailer (biasanya kosong) sampai baris kosong
+                while (await self.reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                return b''.join(chunks)
+            chunks.append(await self.reader.readexactly(size))
+            await self.reader.readexactly(2)
+
+    def close(self):
+        self.writer.close()
+
+class ConnectionPool:
+    """Pool koneksi keep-alive dengan batas jumlah koneksi bersamaan"""
+
+    def __init__(self, host, port, ssl_context, size):
+        self.host = host
+        self.port = port
+        self.ssl = ssl_context
+        self.idle = []
+        self.slots = asyncio.Semaphore(size)
+        self.opened = 0
+
+    async def acquire(self, fresh=False):
+        await self.slots.acquire()
+        try:
+            if self.idle and not fresh:
+                return self.idle.pop()
+            reader, writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+            self.opened += 1
+            return HTTPConnection(reader, writer)
+        except BaseException:
+            self.slots.release()
+            raise
+
+    def release(self, conn, reusable):
+        if reusable:
+            self.idle.append(conn)
+        else:
+            conn.close()
+        self.slots.release()
+
+    def close(self):
+        while self.idle:
+            self.idle.pop().close()
+
+class EndpointStats:
+    """Hasil per operasi: histogram latency, jumlah sukses/error dan timeline"""
+
+    def __init__(self, name):
+        self.name = name
+        self.latency = LatencyHistogram()  # request sukses, dari jadwal kirim (termasuk antrian koneksi)
+        self.service = LatencyHistogram()  # request sukses, dari request benar-benar dikirim
+        self.all = LatencyHistogram()      # semua request termasuk error/timeout, dari jadwal kirim
+        self.ok = 0
+        self.errors = 0
+        self.error_types = {}
+        # Waktu jadwal (detik sejak start) dan hasil setiap request, untuk deteksi gap
+        self.scheduled = array('d')
+        self.success = array('b')
+
+    def add(self, offset, ok, latency, service, error=None):
+        self.scheduled.append(offset)
+        self.success.append(ok)
+        self.all.record(latency)
+        if ok:
+            self.ok += 1
+            self.latency.record(latency)
+            self.service.record(service)
+        else:
+            self.errors += 1
+            self.error_types[error] = self.error_types.get(error, 0) + 1
+
+    def gaps(self, min_gap):
+        """
+        Periode tanpa request sukses: dari request sukses terakhir sebelum
+        rentetan error sampai request sukses pertama sesudahnya (waktu jadwal).
+        """
+        order = sorted(range(len(self.scheduled)), key=self.scheduled.__getitem__)
+        result = []
+        last_ok, failed = None, 0
+        for i in order:
+            if not self.success[i]:
+                failed += 1
+                continue
+            if failed:
+                start = last_ok if last_ok is not None else self.scheduled[order[0]]
+                result.append((start, self.scheduled[i], failed))
+                failed = 0
+            last_ok = self.scheduled[i]
+        if failed:
+            start = last_ok if last_ok is not None else self.scheduled[order[0]]
+            result.append((start, None, failed))
+        return [gap for gap in result if gap[1] is None or gap[1] - gap[0] >= min_gap]
+
+def parse_mix(text):
+    """'read=60,write=10,stats=30' -> {'read': 60.0, ...}"""
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"operasi tidak dikenal: {name} (pilihan: {', '.join(OPERATIONS)})")
+        try:
+            mix[name] = float(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"bobot tidak valid: {part}")
+        if mix[name] < 0:
+            raise argparse.ArgumentTypeError(f"bobot tidak boleh negatif: {part}")
+    mix = {name: weight for name, weight in mix.items() if weight > 0}
+    if not mix:
+        raise argparse.ArgumentTypeError("minimal satu operasi dengan bobot > 0")
+    return mix
+
+def encode_request(method, path, host, body=None):
+    head = [f'{method} {path} HTTP/1.1', f'Host: {host}', 'User-Agent: ha-load-generator',
+            'Accept: application/json', 'Connection: keep-alive']
+    if body is not None:
+        head += ['Content-Type: application/json', f'Content-Length: {len(body)}']
+    return ('\r\n'.join(head) + '\r\n\r\n').encode() + (body or b'')
+
+class LoadGenerator:
+    def __init__(self, args):
+        url = urlsplit(args.url)
+        if url.scheme not in ('http', 'https'):
+            raise ValueError(f"URL harus http:// atau https://: {args.url}")
+        self.args = args
+        self.host = url.netloc
+        self.prefix = url.path.rstrip('/')
+        ssl_context = ssl.create_default_context() if url.scheme == 'https' else None
+        port = url.port or (443 if url.scheme == 'https' else 80)
+        self.pool = ConnectionPool(url.hostname, port, ssl_context, args.connections)
+        self.stats = {name: EndpointStats(name) for name in args.mix}
+        # Request GET selalu sama, di-encode sekali
+        self.payloads = {name: encode_request(method, self.prefix + path, self.host)
+                         for name, (method, path) in OPERATIONS.items() if method == 'GET'}
+        self.run_id = int(time.time())
+        self.instances = {}
+        # Per detik (waktu jadwal): [request, sukses, error]
+        self.timeline = []
+        self.in_flight = 0
+        self.stopping = asyncio.Event()
+
+    def payload(self, name, number):
+        if name != 'write':
+            return self.payloads[name]
+        body = json.dumps({
+            'name': f'LoadUser_{self.run_id}_{number}',
+            'email': f'load_{self.run_id}_{number}@example.com'
+        }).encode()
+        method, path = OPERATIONS[name]
+        return encode_request(method, self.prefix + path, self.host, body)
+
+    async def execute(self, payload):
+        """Kirim satu request; koneksi keep-alive yang ternyata sudah ditutup server dicoba ulang sekali"""
+        for attempt in (0, 1):
+            conn = await self.pool.acquire(fresh=attempt > 0)
+            reusable = False
+            try:
+                sent = time.perf_counter()
+                status, body, reusable = await conn.request(payload)
+                return status, body, sent
+            except StaleConnection:
+                if attempt:
+                    raise
+            finally:
+                self.pool.release(conn, reusable)
+
+    async def fire(self, name, number, scheduled, offset):
+        self.in_flight += 1
+        error, body, sent = None, b'', None
+        try:
+            status, body, sent = await asyncio.wait_for(self.execute(self.payload(name, number)), self.args.timeout)
+            if status != EXPECTED_STATUS[name]:
+                error = f'HTTP {status}'
+        except asyncio.TimeoutError:
+            error = 'timeout'
+        except (OSError, asyncio.IncompleteReadError, ValueError, IndexError) as e:
+            error = type(e).__name__
+        finally:
+            self.in_flight -= 1
+        done = time.perf_counter()
+        latency = done - scheduled
+        if error == 'timeout':
+            # Request yang timeout tetap dicatat, minimal sebesar --timeout
+            latency = max(latency, self.args.timeout)
+
+        self.stats[name].add(offset, error is None, latency, done - sent if sent else None, error)
+        second = self.timeline[int(offset)]
+        second[1 if error is None else 2] += 1
+        if error is None:
+            match = APP_INSTANCE.search(body)
+            if match:
+                instance = match.group(1).decode(errors='replace')
+                self.instances[instance] = self.instances.get(instance, 0) + 1
+
+    async def progress(self, start):
+        """Cetak ringkasan setiap detik ke stderr"""
+        reported = 0
+        while not self.stopping.is_set():
+            await asyncio.sleep(1)
+            # Detik yang sudah lewat dari jadwal (request-nya mungkin masih berjalan)
+            elapsed = int(time.perf_counter() - start)
+            while reported < min(elapsed, len(self.timeline)):
+                sent, ok, errors = self.timeline[reported]
+                print(f"[{reported:>4}s] {sent} req, {ok} ok, {errors} error, "
+                      f"in-flight {self.in_flight}, koneksi {self.pool.opened}", file=sys.stderr)
+                reported += 1
+
+    async def run(self):
+        args = self.args
+        names = list(args.mix)
+        weights = list(args.mix.values())
+        rng = random.Random(args.seed)
+        interval = 1 / args.rate
+        tasks = set()
+
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stopping.set)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+        self.started_at = datetime.datetime.now()
+        start = time.perf_counter()
+        reporter = asyncio.create_task(self.progress(start)) if not args.quiet else None
+        number = 0
+        # Open-loop: jadwal request ke-n selalu start + n/rate. Jika event loop
+        # terlambat, request yang tertinggal langsung dikirim dan latency-nya
+        # tetap dihitung dari jadwal semula.
+        while not self.stopping.is_set():
+            offset = number * interval
+            if offset >= args.duration:
+                break
+            delay = start + offset - time.perf_counter()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self.stopping.wait(), delay)
+                    break
+                except asyncio.TimeoutError:
+                    pass
+            while len(self.timeline) <= int(offset):
+                self.timeline.append([0, 0, 0])
+            self.timeline[int(offset)][0] += 1
+            name = rng.choices(names, weights)[0]
+            task = asyncio.create_task(self.fire(name, number, start + offset, offset))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            number += 1
+        # Durasi jadwal (bukan waktu request terakhir dikirim), kecuali dihentikan lebih awal
+        self.elapsed = time.perf_counter() - start if self.stopping.is_set() else number * interval
+
+        # Tunggu request yang masih berjalan (masing-masing dibatasi --timeout)
+        if tasks:
+            await asyncio.wait(list(tasks))
+        self.stopping.set()
+        if reporter:
+            await reporter
+        self.pool.close()
+
+    def report(self, min_gap):
+        args = self.args
+        total = LatencyHistogram()
+        total_all = LatencyHistogram()
+        endpoints = {}
+        for name, stats in self.stats.items():
+            total.merge(stats.latency)
+            total_all.merge(stats.all)
+            method, path = OPERATIONS[name]
+            endpoints[f'{method} {path}'] = {
+                'operation': name,
+                'requests': stats.ok + stats.errors,
+                'ok': stats.ok,
+                'errors': stats.errors,
+                'error_types': dict(sorted(stats.error_types.items(), key=lambda item: -item[1])),
+                'latency_ms': stats.latency.summary_ms(),
+                'latency_all_ms': stats.all.summary_ms(),
+                'service_ms': stats.service.summary_ms(),
+            }
+
+        gaps = []
+        for name, stats in self.stats.items():
+            for start, end, failed in stats.gaps(min_gap):
+                gaps.append({
+                    'operation': name,
+                    'start': round(start, 3),
+                    'end': None if end is None else round(end, 3),
+                    'duration': None if end is None else round(end - start, 3),
+                    'failed_requests': failed,
+                })
+        gaps.sort(key=lambda gap: gap['start'])
+
+        requests = sum(stats.ok + stats.errors for stats in self.stats.values())
+        ok = sum(stats.ok for stats in self.stats.values())
+        return {
+            'created_at': self.started_at.isoformat(timespec='seconds'),
+            'target': args.url,
+            'rate': args.rate,
+            'duration': round(self.elapsed, 3),
+            'mix': args.mix,
+            'connections': args.connections,
+            'timeout': args.timeout,
+            'summary': {
+                'requests': requests,
+                'ok': ok,
+                'errors': requests - ok,
+                'achieved_rate': round(requests / self.elapsed, 2) if self.elapsed else 0,
+                'success_rate': round(ok / requests * 100, 4) if requests else None,
+                'connections_opened': self.pool.opened,
+                # latency_ms hanya request sukses; latency_all_ms termasuk error dan timeout
+                'latency_ms': total.summary_ms(),
+                'latency_all_ms': total_all.summary_ms(),
+            },
+            'endpoints': endpoints,
+            'app_instances': dict(sorted(self.instances.items())),
+            'gaps': gaps,
+            'timeline': [{'second': second, 'requests': sent, 'ok': ok, 'errors': errors}
+                         for second, (sent, ok, errors) in enumerate(self.timeline)],
+        }
+
+def format_ms(value):
+    return '-' if value is None else f"{value:,.1f}"
+
+def markdown_report(report):
+    summary = report['summary']
+    lines = [
+        "# Laporan Load Test",
+        "",
+        f"*Target: {report['target']} — {report['created_at']}*",
+        "",
+        f"* **Laju target:** {report['rate']:g} req/detik selama {report['duration']:.1f} detik "
+        f"(tercapai {summary['achieved_rate']:g} req/detik)",
+        f"* **Mix:** {', '.join(f'{name}={weight:g}' for name, weight in report['mix'].items())}",
+        f"* **Koneksi keep-alive:** maksimum {report['connections']}, dibuka {summary['connections_opened']}",
+        f"* **Request:** {summary['requests']:,} ({summary['ok']:,} sukses, {summary['errors']:,} error)",
+    ]
+    if summary['success_rate'] is not None:
+        lines.append(f"* **Success rate:** {summary['success_rate']:.2f}%")
+    latency = summary['latency_ms'] or {}
+    latency_all = summary['latency_all_ms'] or {}
+    lines.append(f"* **Latency p99:** {format_ms(latency.get('p99'))} ms (request sukses), "
+                 f"{format_ms(latency_all.get('p99'))} ms (semua request termasuk error/timeout)")
+
+    lines += ["", "## Latency per Endpoint", "",
+              "Latency dihitung dari jadwal kirim (open-loop), jadi termasuk waktu menunggu koneksi. "
+              "Kolom p50 sampai *max* hanya request sukses; kolom *semua p99/max* juga memasukkan "
+              "error dan timeout (timeout dicatat minimal sebesar `--timeout`). "
+              "Kolom *service p99* hanya mengukur sejak request benar-benar dikirim.", "",
+              "| Endpoint | Request | Error | p50 (ms) | p99 (ms) | p99.9 (ms) | Max (ms) | Semua p99 (ms) | Semua max (ms) | Service p99 (ms) |",
+              "| :--- | ---: | ---: | ---: | ---: | ---: | ---: | ---: | ---: | ---: |"]
+    for endpoint, stats in report['endpoints'].items():
+        latency = stats['latency_ms'] or {}
+        latency_all = stats['latency_all_ms'] or {}
+        service = stats['service_ms'] or {}
+        lines.append(f"| {endpoint} | {stats['requests']:,} | {stats['errors']:,} | {format_ms(latency.get('p50'))} | "
+                     f"{format_ms(latency.get('p99'))} | {format_ms(latency.get('p99.9'))} | "
+                     f"{format_ms(latency.get('max'))} | {format_ms(latency_all.get('p99'))} | "
+                     f"{format_ms(latency_all.get('max'))} | {format_ms(service.get('p99'))} |")
+
+    errors = [(endpoint, error, count) for endpoint, stats in report['endpoints'].items()
+              for error, count in stats['error_types'].items()]
+    if errors:
+        lines += ["", "## Jenis Error", "", "| Endpoint | Error | Jumlah |", "| :--- | :--- | ---: |"]
+        lines += [f"| {endpoint} | {error} | {count:,} |" for endpoint, error, count in errors]
+
+    error_seconds = [second for second in report['timeline'] if second['errors']]
+    if error_seconds:
+        peak = max(error_seconds, key=lambda second: second['errors'])
+        lines += ["", "## Error per Detik", "",
+                  f"{len(error_seconds)} detik dengan error, puncak {peak['errors']} error/detik pada detik ke-{peak['second']}.", "",
+                  "| Detik | Request | Sukses | Error |", "| ---: | ---: | ---: | ---: |"]
+        lines += [f"| {second['second']} | {second['requests']} | {second['ok']} | {second['errors']} |"
+                  for second in error_seconds[:60]]
+        if len(error_seconds) > 60:
+            lines.append(f"| ... | | | {len(error_seconds) - 60} detik lainnya |")
+
+    lines += ["", "## Failover Gap", ""]
+    if report['gaps']:
+        lines += ["Periode tanpa request sukses per operasi (detik sejak start, berdasarkan jadwal kirim).", "",
+                  "| Operasi | Mulai | Selesai | Durasi (detik) | Request gagal |", "| :--- | ---: | ---: | ---: | ---: |"]
+        for gap in report['gaps']:
+            end = '-' if gap['end'] is None else f"{gap['end']:.2f}"
+            duration = 'belum pulih' if gap['duration'] is None else f"{gap['duration']:.2f}"
+            lines.append(f"| {gap['operation']} | {gap['start']:.2f} | {end} | {duration} | {gap['failed_requests']:,} |")
+    else:
+        lines.append("Tidak ada gap.")
+
+    if report['app_instances']:
+        lines += ["", "## Distribusi App Instance", "", "| Instance | Response |", "| :--- | ---: |"]
+        lines += [f"| {instance} | {count:,} |" for instance, count in report['app_instances'].items()]
+    return "\n".join(lines) + "\n"
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Load generator open-loop untuk full stack HA.")
+    parser.add_argument('--url', default='http://localhost:8080', help="base URL (default http://localhost:8080)")
+    parser.add_argument('-r', '--rate', type=float, default=50, help="laju target request/detik (default 50)")
+    parser.add_argument('-d', '--duration', type=float, default=60, help="durasi dalam detik (default 60)")
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"bobot operasi read/write/stats (default {DEFAULT_MIX})")
+    parser.add_argument('-c', '--connections', type=int, default=64,
+                        help="maksimum koneksi keep-alive bersamaan (default 64)")
+    parser.add_argument('--timeout', type=float, default=10, help="timeout per request dalam detik (default 10)")
+    parser.add_argument('--min-gap', type=float, default=0.5,
+                        help="durasi minimum periode tanpa sukses yang dilaporkan sebagai gap (default 0.5)")
+    parser.add_argument('--seed', type=int, help="seed urutan operasi (default acak)")
+    parser.add_argument('--json', help="tulis laporan JSON ke file ini")
+    parser.add_argument('--markdown', help="tulis laporan markdown ke file ini (default ke stdout)")
+    parser.add_argument('-q', '--quiet', action='store_true', help="tanpa progress per detik")
+    return parser
+
+def main():
+    parser = build_parser()
+    args = parser.parse_args()
+    if args.rate <= 0 or args.duration <= 0 or args.connections <= 0:
+        parser.error("--rate, --duration dan --connections harus lebih dari 0")
+
+    generator = LoadGenerator(args)
+    asyncio.run(generator.run())
+    report = generator.report(args.min_gap)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    markdown = markdown_report(report)
+    if args.markdown:
+        with open(args.markdown, 'w') as f:
+            f.write(markdown)
+    else:
+        print(markdown)
+
+if __name__ == '__main__':
+    main()
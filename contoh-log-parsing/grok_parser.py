@@ -0,0 +1,870 @@
+"""
+Engine grok untuk mem-parsing log nginx dan Spring Boot tanpa grok debugger.
+
+Pattern grok (`%{NAME:field:type}`) dikompilasi sekali menjadi regex Python
+dengan named group, di-cache, dan diberi prefilter literal: baris yang tidak
+mengandung literal wajib dari pattern (misalnya ' - - [' untuk nginx access)
+langsung dilewati tanpa menjalankan regex. Hasil parsing berupa record dict
+dengan field bertipe (int/float), dan bisa langsung diagregasi menjadi SLI
+(error rate dan latency per field, misalnya 5xx rate per request_path).
+
+Contoh:
+    python grok_parser.py nginx-access.log
+    python grok_parser.py nginx-access.log --group-by request_path --error 'status>=500' --normalize
+    python grok_parser.py spring-boot.log --format spring-boot --records
+"""
+
+import os
+import re
+import sys
+import gzip
+import contextlib
+import json
+import math
+import time
+import argparse
+import operator
+from concurrent.futures import ProcessPoolExecutor
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Subset pattern bawaan logstash-patterns-core yang dipakai contoh di folder ini.
+# Semua group dibuat non-capturing supaya hanya field bernama yang di-capture.
+BUILTIN_PATTERNS = {
+    'USERNAME': r'[a-zA-Z0-9._-]+',
+    'USER': r'%{USERNAME}',
+    'INT': r'(?:[+-]?(?:[0-9]+))',
+    'BASE10NUM': r'(?<![0-9.+-])(?:[+-]?(?:[0-9]+(?:\.[0-9]+)?|\.[0-9]+))',
+    'NUMBER': r'(?:%{BASE10NUM})',
+    'BASE16NUM': r'(?<![0-9A-Fa-f])(?:[+-]?(?:0x)?(?:[0-9A-Fa-f]+))',
+    'POSINT': r'\b(?:[1-9][0-9]*)\b',
+    'NONNEGINT': r'\b(?:[0-9]+)\b',
+    'WORD': r'\b\w+\b',
+    'NOTSPACE': r'\S+',
+    'SPACE': r'\s*',
+    'DATA': r'.*?',
+    'GREEDYDATA': r'.*',
+    'QUOTEDSTRING': r'(?:"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'|`(?:[^`\\]|\\.)*`)',
+    'QS': r'%{QUOTEDSTRING}',
+    'UUID': r'[A-Fa-f0-9]{8}-(?:[A-Fa-f0-9]{4}-){3}[A-Fa-f0-9]{12}',
+    # IPv6 disederhanakan (tidak memvalidasi jumlah grup secara ketat)
+    'IPV6': r'(?:(?:[0-9A-Fa-f]{1,4}:){1,7}:?(?::?[0-9A-Fa-f]{1,4}){0,7}|::(?:[0-9A-Fa-f]{1,4}(?::[0-9A-Fa-f]{1,4}){0,6})?)(?:%\w+)?',
+    'IPV4': r'(?<![0-9])(?:(?:[0-1]?[0-9]{1,2}|2[0-4][0-9]|25[0-5])[.](?:[0-1]?[0-9]{1,2}|2[0-4][0-9]|25[0-5])'
+            r'[.](?:[0-1]?[0-9]{1,2}|2[0-4][0-9]|25[0-5])[.](?:[0-1]?[0-9]{1,2}|2[0-4][0-9]|25[0-5]))(?![0-9])',
+    'IP': r'(?:%{IPV6}|%{IPV4})',
+    'HOSTNAME': r'\b(?:[0-9A-Za-z][0-9A-Za-z-]{0,62})(?:\.(?:[0-9A-Za-z][0-9A-Za-z-]{0,62}))*(?:\.?|\b)',
+    'IPORHOST': r'(?:%{IP}|%{HOSTNAME})',
+    'HOSTPORT': r'%{IPORHOST}:%{POSINT}',
+    'URIPROTO': r'[A-Za-z](?:[A-Za-z0-9+\-.]+)+',
+    'URIHOST': r'%{IPORHOST}(?::%{POSINT})?',
+    'URIPATH': r"(?:/[A-Za-z0-9$.+!*'(){},~:;=@#%&_\-]*)+",
+    'URIPARAM': r"\?[A-Za-z0-9$.+!*'|(){},~@#%&/=:;_?\-\[\]<>]*",
+    'URIPATHPARAM': r'%{URIPATH}(?:%{URIPARAM})?',
+    'URI': r'%{URIPROTO}://(?:%{USER}(?::[^@]*)?@)?(?:%{URIHOST})?(?:%{URIPATHPARAM})?',
+    'MONTH': r'\b(?:[Jj]an(?:uary)?|[Ff]eb(?:ruary)?|[Mm]ar(?:ch)?|[Aa]pr(?:il)?|[Mm]ay|[Jj]un(?:e)?|[Jj]ul(?:y)?'
+             r'|[Aa]ug(?:ust)?|[Ss]ep(?:tember)?|[Oo]ct(?:ober)?|[Nn]ov(?:ember)?|[Dd]ec(?:ember)?)\b',
+    'MONTHNUM': r'(?:0?[1-9]|1[0-2])',
+    'MONTHNUM2': r'(?:0[1-9]|1[0-2])',
+    'MONTHDAY': r'(?:(?:0[1-9])|(?:[12][0-9])|(?:3[01])|[1-9])',
+    'DAY': r'(?:Mon(?:day)?|Tue(?:sday)?|Wed(?:nesday)?|Thu(?:rsday)?|Fri(?:day)?|Sat(?:urday)?|Sun(?:day)?)',
+    'YEAR': r'(?:\d\d){1,2}',
+    'HOUR': r'(?:2[0123]|[01]?[0-9])',
+    'MINUTE': r'(?:[0-5][0-9])',
+    'SECOND': r'(?:(?:[0-5]?[0-9]|60)(?:[:.,][0-9]+)?)',
+    'TIME': r'(?<![0-9])%{HOUR}:%{MINUTE}(?::%{SECOND})(?![0-9])',
+    'ISO8601_TIMEZONE': r'(?:Z|[+-]%{HOUR}(?::?%{MINUTE}))',
+    'TIMESTAMP_ISO8601': r'%{YEAR}-%{MONTHNUM}-%{MONTHDAY}[T ]%{HOUR}:?%{MINUTE}(?::?%{SECOND})?%{ISO8601_TIMEZONE}?',
+    'HTTPDATE': r'%{MONTHDAY}/%{MONTH}/%{YEAR}:%{TIME} %{INT}',
+    'JAVACLASS': r'(?:[a-zA-Z$_][a-zA-Z$_0-9]*\.)*[a-zA-Z$_][a-zA-Z$_0-9]*',
+    'LOGLEVEL': r'(?:[Aa]lert|ALERT|[Tt]race|TRACE|[Dd]ebug|DEBUG|[Nn]otice|NOTICE|[Ii]nfo?(?:rmation)?|INFO?(?:RMATION)?'
+                r'|[Ww]arn?(?:ing)?|WARN?(?:ING)?|[Ee]rr?(?:or)?|ERR?(?:OR)?|[Cc]rit?(?:ical)?|CRIT?(?:ICAL)?'
+                r'|[Ff]atal|FATAL|[Ss]evere|SEVERE|EMERG(?:ENCY)?|[Ee]merg(?:ency)?)',
+}
+
+# Format log di folder ini: file pattern, tipe tambahan (seperti hasil di
+# file *-parse-result.json) dan default SLI (field grouping + kondisi error)
+FORMATS = {
+    'nginx-access': {
+        'pattern_file': 'nginx-access-grok-pattern.txt',
+        'types': {'http_version': 'float'},
+        'group_by': 'request_path',
+        'error': 'status>=500',
+    },
+    'nginx-error': {
+        'pattern_file': 'nginx-error-grok-pattern.txt',
+        'types': {'year': 'int', 'month': 'int', 'day': 'int'},
+        'group_by': 'log_level',
+        'error': 'log_level~^(?:error|crit|alert|emerg)$',
+    },
+    'spring-boot': {
+        'pattern_file': 'spring-boot-grok-pattern-oneline.txt',
+        'types': {name: 'int' for name in ('year', 'month', 'day', 'hour', 'minute', 'second', 'millis', 'pid')},
+        'group_by': 'logger',
+        'error': 'loglevel~^(?:ERROR|FATAL)$',
+        # Baris stack trace Java: lanjutan message record sebelumnya
+        'continuation': r'(?:\s|Caused by:|\.\.\. \d+ more|[\w$.]+(?:Exception|Error|Throwable)\b)',
+    },
+    'distributed-tracing': {
+        'pattern_file': os.path.join('distributed-tracing', 'distributed-tracing-grok-pattern.txt'),
+        'types': {'pid': 'int'},
+        'group_by': 'service_name',
+        'error': 'log_level~^(?:ERROR|FATAL)$',
+        'continuation': r'(?:\s|Caused by:|\.\.\. \d+ more|[\w$.]+(?:Exception|Error|Throwable)\b)',
+    },
+}
+
+CONVERTERS = {'int': int, 'float': float}
+GROK_REFERENCE = re.compile(r'%\{(\w+)(?::([\w@.\[\]-]+))?(?::(int|float))?\}')
+# Named group gaya Oniguruma (?<name>...) -> Python (?P<name>...)
+ONIGURUMA_GROUP = re.compile(r'\(\?<(?![=!])(\w+)>')
+QUANTIFIERS = '?*+{'
+# Ukuran blok baca file (dipotong di batas baris)
+READ_BLOCK_SIZE = 8 * 1024 * 1024
+
+def skip_group(text, i):
+    """Index setelah ')' pasangan '(' di text[i], memperhitungkan escape dan character class"""
+    depth = 0
+    while i < len(text):
+        c = text[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '[':
+            i = skip_class(text, i)
+            continue
+        if c == '(':
+            depth += 1
+        elif c == ')':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    raise ValueError(f"kurung tidak seimbang: {text}")
+
+def skip_class(text, i):
+    """Index setelah ']' penutup character class yang dimulai di text[i]"""
+    i += 1
+    if i < len(text) and text[i] == '^':
+        i += 1
+    if i < len(text) and text[i] == ']':
+        i += 1
+    while i < len(text) and text[i] != ']':
+        i += 2 if text[i] == '\\' else 1
+    return i + 1
+
+def required_literal(pattern):
+    """
+    Literal terpanjang yang pasti muncul di setiap baris yang match pattern grok.
+    Hanya bagian top-level yang diperiksa: isi group, character class dan
+    %{...} dilewati, dan alternation di top-level berarti tidak ada literal wajib.
+    """
+    best, current = '', []
+
+    def flush():
+        nonlocal best
+        literal = ''.join(current)
+        if len(literal) > len(best):
+            best = literal
+        current.clear()
+
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == '\\' and i + 1 < len(pattern):
+            escaped = pattern[i + 1]
+            i += 2
+            if escaped.isalnum():
+                # \s, \d, \b, ... bukan literal
+                flush()
+                continue
+            current.append(escaped)
+        elif c == '%' and pattern.startswith('%{', i):
+            flush()
+            i = pattern.index('}', i) + 1
+            continue
+        elif c == '(':
+            flush()
+            i = skip_group(pattern, i)
+            continue
+        elif c == '[':
+            flush()
+            i = skip_class(pattern, i)
+            continue
+        elif c == '|':
+            return ''
+        elif c in '.^$':
+            flush()
+            i += 1
+            continue
+        elif c in QUANTIFIERS:
+            # Karakter sebelum quantifier opsional (?, *, {0,}) atau bisa berulang
+            if current and c != '+':
+                current.pop()
+            flush()
+            if c == '{':
+                i = pattern.index('}', i)
+            i += 1
+            continue
+        else:
+            current.append(c)
+            i += 1
+    flush()
+    return best
+
+def end_of_group(text, i):
+    """Index ')' penutup group yang sedang dibuka di posisi i, None jika i di top-level"""
+    depth = 0
+    while i < len(text):
+        c = text[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '[':
+            i = skip_class(text, i)
+            continue
+        if c == '(':
+            depth += 1
+        elif c == ')':
+            if depth == 0:
+                return i
+            depth -= 1
+        i += 1
+    return None
+
+def following_literal(text, i):
+    """
+    Karakter literal yang pasti langsung mengikuti posisi i di pattern (juga
+    jika i berada di akhir branch alternation), atau None jika tidak pasti.
+    """
+    while i < len(text):
+        c = text[i]
+        if c == '|':
+            i = end_of_group(text, i)
+            if i is None:
+                return None
+            continue
+        if c == ')':
+            i += 1
+            if i < len(text) and text[i] in QUANTIFIERS:
+                return None
+            continue
+        if c == '\\' and i + 1 < len(text):
+            literal, i = text[i + 1], i + 2
+            if literal.isalnum():
+                return None
+        elif c in '.^$()[]%{}?*+':
+            return None
+        else:
+            literal, i = c, i + 1
+        if i < len(text) and text[i] in QUANTIFIERS:
+            return None
+        return literal
+    return None
+
+def lazy_until(literal):
+    """
+    Pengganti `.*?` yang diikuti `literal`. Urutan kandidat match sama persis
+    (sampai literal pertama, lalu kedua, dst.), tapi regex engine melompati
+    karakter non-literal dalam satu loop, bukan mencoba sisa pattern di setiap posisi.
+    """
+    escaped = re.escape(literal)
+    not_literal = '[^' + ('\\n' if literal == '\n' else escaped + '\\n') + ']'
+    return f'{not_literal}*(?:{escaped}{not_literal}*)*?'
+
+def load_pattern_definitions(path):
+    """File pattern gaya logstash patterns_dir: satu definisi 'NAMA regex' per baris"""
+    definitions = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            name, _, regex = line.partition(' ')
+            definitions[name] = regex.strip()
+    return definitions
+
+def read_pattern_file(path):
+    """Isi file *-grok-pattern.txt (baris kosong dan komentar diabaikan)"""
+    with open(path, encoding='utf-8') as f:
+        lines = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    if len(lines) != 1:
+        raise ValueError(f"{path}: harus berisi tepat satu pattern grok")
+    return lines[0]
+
+class GrokPattern:
+    """Pattern grok yang sudah dikompilasi: parse(line) -> record dict atau None"""
+
+    def __init__(self, text, regex, fields, prefilter):
+        self.text = text
+        self.regex = re.compile(regex)
+        self.fields = [name for _, name, _ in fields]
+        self.prefilter = prefilter
+        self.match = self.regex.match
+        # Group diberi nama field langsung jika memungkinkan, sehingga
+        # match.groupdict() sudah berupa record tanpa perlu rename
+        self._renames = [(group, name) for group, name, _ in fields if group != name]
+        self._converters = [(name, CONVERTERS[kind]) for _, name, kind in fields if kind]
+        # Nama field -> nama group regex, urut kemunculan di pattern. Field yang
+        # bukan identifier (url.path) atau muncul lebih dari sekali memakai _gN.
+        self._groups = {}
+        for group, name, _ in fields:
+            self._groups.setdefault(name, []).append(group)
+
+    def group_names(self, field):
+        """Nama group regex untuk field (kosong jika field tidak di-capture)"""
+        return tuple(self._groups.get(field, ()))
+
+    def field_getter(self, fields):
+        """
+        Fungsi match -> tuple nilai fields (string, tanpa konversi tipe), sama
+        dengan nilai record dari parse(): field yang muncul lebih dari sekali
+        diambil dari group pertama yang terisi, field yang tidak ada bernilai None.
+        """
+        groups = [self.group_names(field) for field in fields]
+        if all(len(names) == 1 for names in groups):
+            names = [names[0] for names in groups]
+            if len(names) == 1:
+                name = names[0]
+                return lambda match: (match.group(name),)
+            return operator.methodcaller('group', *names)
+
+        def getter(match):
+            return tuple(next((value for value in map(match.group, names) if value is not None), None)
+                         for names in groups)
+        return getter
+
+    def parse(self, line):
+        if self.prefilter and self.prefilter not in line:
+            return None
+        match = self.match(line)
+        if match is None:
+            return None
+        record = match.groupdict()
+        for group, name in self._renames:
+            value = record.pop(group)
+            if record.get(name) is None:
+                record[name] = value
+        for name, convert in self._converters:
+            value = record[name]
+            if value is not None:
+                try:
+                    record[name] = convert(value)
+                except ValueError:
+                    pass
+        return record
+
+class GrokLibrary:
+    """
+    Kumpulan definisi pattern grok. Ekspansi setiap definisi dan hasil
+    kompilasi pattern di-cache, jadi compile() pattern yang sama berkali-kali murah.
+    """
+
+    def __init__(self, definitions=None):
+        self.definitions = dict(BUILTIN_PATTERNS)
+        if definitions:
+            self.definitions.update(definitions)
+        self._expanded = {}
+        self._compiled = {}
+
+    def add_definitions(self, definitions):
+        self.definitions.update(definitions)
+        self._expanded.clear()
+        self._compiled.clear()
+
+    def expand_definition(self, name, stack=()):
+        expanded = self._expanded.get(name)
+        if expanded is None:
+            if name not in self.definitions:
+                raise KeyError(f"pattern grok tidak dikenal: %{{{name}}}")
+            if name in stack:
+                raise ValueError(f"pattern grok rekursif: {' -> '.join(stack + (name,))}")
+            # Definisi di library tidak boleh punya field bernama (nama group bisa bentrok)
+            expanded = self._expand(self.definitions[name], None, stack + (name,))
+            self._expanded[name] = expanded
+        return expanded
+
+    def _expand(self, text, fields, stack=(), capture=None):
+        def replace(match):
+            name, field, kind = match.groups()
+            body = self.expand_definition(name, stack)
+            if body == '.*?':
+                # DATA yang diikuti literal (misalnya `%{DATA:agent}"`) jauh lebih
+                # cepat sebagai [^"]* tanpa mengubah hasil match
+                literal = following_literal(match.string, match.end())
+                if literal is not None:
+                    body = lazy_until(literal)
+            if field is None or fields is None or (capture is not None and field not in capture):
+                return f'(?:{body})'
+            group = field if field.isidentifier() and all(group != field for group, _, _ in fields) else f'_g{len(fields)}'
+            fields.append((group, field, kind))
+            return f'(?P<{group}>{body})'
+        text = ONIGURUMA_GROUP.sub(lambda match: self._named_group(match, fields, capture), text)
+        return GROK_REFERENCE.sub(replace, text)
+
+    @staticmethod
+    def _named_group(match, fields, capture):
+        name = match.group(1)
+        if fields is None or (capture is not None and name not in capture):
+            return '(?:'
+        fields.append((name, name, None))
+        return f'(?P<{name}>'
+
+    def compile(self, text, types=None, capture=None):
+        """
+        Kompilasi pattern grok (di-cache). capture: hanya field ini yang di-capture,
+        field lain menjadi group non-capturing (lebih cepat jika tidak semua field dipakai).
+        """
+        if capture is not None:
+            capture = frozenset(capture)
+        key = (text, tuple(sorted((types or {}).items())), capture)
+        pattern = self._compiled.get(key)
+        if pattern is None:
+            fields = []
+            regex = self._expand(text, fields, capture=capture)
+            if types:
+                fields = [(group, name, kind or types.get(name)) for group, name, kind in fields]
+            pattern = self._compiled[key] = GrokPattern(text, regex, fields, required_literal(text))
+        return pattern
+
+_default_library = GrokLibrary()
+
+def compile_grok(text, types=None):
+    """Kompilasi pattern grok dengan library bawaan (hasilnya di-cache)"""
+    return _default_library.compile(text, types)
+
+def load_format(name, library=None, capture=None):
+    """(pattern, continuation regex atau None) untuk format di FORMATS"""
+    spec = FORMATS[name]
+    text = read_pattern_file(os.path.join(BASE_DIR, spec['pattern_file']))
+    pattern = (library or _default_library).compile(text, spec.get('types'), capture)
+    continuation = re.compile(spec['continuation']) if spec.get('continuation') else None
+    return pattern, continuation
+
+def iter_lines(file_name, start=0, end=None):
+    """
+    Baris (str, tanpa newline) dari file log, dibaca per blok besar dan
+    di-decode sekaligus. start/end: rentang byte (harus di batas baris).
+    """
+    if file_name == '-':
+        f = contextlib.nullcontext(sys.stdin.buffer)
+    elif file_name.endswith('.gz'):
+        f = gzip.open(file_name, 'rb')
+    else:
+        f = open(file_name, 'rb')
+    with f as f:
+        if start:
+            f.seek(start)
+        remaining = None if end is None else end - start
+        pending = b''
+        while remaining is None or remaining > 0:
+            block = f.read(READ_BLOCK_SIZE if remaining is None else min(READ_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            if remaining is not None:
+                remaining -= len(block)
+            block = pending + block
+            cut = block.rfind(b'\n') + 1
+            if cut == 0:
+                pending = block
+                continue
+            pending = block[cut:]
+            yield from block[:cut - 1].decode('utf-8', 'replace').split('\n')
+        if pending:
+            yield pending.decode('utf-8', 'replace')
+
+def parse_lines(lines, pattern, continuation=None, stats=None):
+    """
+    Stream record dari baris log. Baris yang cocok dengan `continuation`
+    (misalnya stack trace) digabung ke message record sebelumnya.
+    stats (dict, opsional) diisi jumlah baris: lines, records, continuation, unparsed.
+    """
+    counts = {'lines': 0, 'records': 0, 'continuation': 0, 'unparsed': 0} if stats is None else stats
+    parse = pattern.parse
+    is_continuation = continuation.match if continuation else None
+    pending = None
+    extra = []
+    for line in lines:
+        counts['lines'] += 1
+        record = parse(line)
+        if record is not None:
+            counts['records'] += 1
+            if pending is not None:
+                if extra:
+                    pending['message'] = '\n'.join([pending['message'] or ''] + extra)
+                    extra = []
+                yield pending
+            pending = record
+            continue
+        if is_continuation and line and is_continuation(line):
+            counts['continuation'] += 1
+            if pending is not None and 'message' in pending:
+                extra.append(line)
+        elif line:
+            counts['unparsed'] += 1
+        else:
+            # Baris kosong tidak dihitung
+            counts['lines'] -= 1
+    if pending is not None:
+        if extra:
+            pending['message'] = '\n'.join([pending['message'] or ''] + extra)
+        yield pending
+
+# --- Agregasi SLI ---
+CONDITION = re.compile(r'^\s*([\w@.\[\]-]+)\s*(>=|<=|!=|==|=|>|<|~)\s*(.*?)\s*$')
+
+def parse_condition(text):
+    """'status>=500', 'loglevel=ERROR', 'log_level~^(?:error|crit)$' -> (field, op, value)"""
+    match = CONDITION.match(text)
+    if not match:
+        raise ValueError(f"kondisi tidak valid: {text} (contoh: status>=500)")
+    field, op, value = match.groups()
+    if op in ('>=', '<=', '>', '<'):
+        value = float(value)
+    elif op == '~':
+        re.compile(value)
+    return field, '==' if op == '=' else op, value
+
+def make_predicate(condition):
+    field, op, value = condition
+    if op == '~':
+        search = re.compile(value).search
+        return lambda record: search(str(record.get(field) or '')) is not None
+    if op in ('==', '!='):
+        expected = op == '=='
+        return lambda record: (str(record.get(field)) == value) == expected
+
+    compare = {'>=': float.__ge__, '<=': float.__le__, '>': float.__gt__, '<': float.__lt__}[op]
+
+    def predicate(record):
+        try:
+            return compare(float(record.get(field)), value)
+        except (TypeError, ValueError):
+            return False
+    return predicate
+
+ID_SEGMENT = re.compile(r'/(?:\d+|[0-9A-Fa-f]{8}-[0-9A-Fa-f-]{27}|[0-9A-Fa-f]{16,})(?=/|$)')
+
+def normalize_path(path):
+    """/api/products/123?x=1 -> /api/products/:id (query string dibuang)"""
+    return ID_SEGMENT.sub('/:id', path.partition('?')[0])
+
+# Salinan QuantileSketch dari sli_report.py (contoh-perhitungan-error-rate-dari-log),
+# supaya folder ini bisa dipakai tanpa folder lain
+class QuantileSketch:
+    """
+    Sketch quantile streaming (seperti DDSketch): nilai dikelompokkan ke bucket
+    logaritmik sehingga error relatif quantile <= relative_accuracy dan memory
+    hanya bergantung pada rentang nilai (log(max/min)), bukan jumlah data.
+    Dua sketch dapat digabung dengan menjumlahkan bucket.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zero = 0
+        self.count = 0
+        # nilai -> bucket; nominal transaksi biasanya kelipatan tertentu (sedikit nilai unik)
+        self._keys = {}
+
+    def add(self, value, count=1):
+        if value <= 0:
+            self.zero += count
+        else:
+            key = self._keys.get(value)
+            if key is None:
+                key = math.ceil(math.log(value) / self.log_gamma)
+                if len(self._keys) < 4096:
+                    self._keys[value] = key
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.count += count
+
+    def merge(self, other):
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zero += other.zero
+        self.count += other.count
+
+    def quantile(self, q):
+        """Perkiraan nilai pada quantile q (0..1), None jika sketch kosong."""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero
+        if rank < seen:
+            return 0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                # Titik tengah bucket (gamma^(key-1), gamma^key]
+                return 2 * self.gamma ** key / (self.gamma + 1)
+
+class SLIAggregator:
+    """Jumlah request, error dan latency per nilai field group_by"""
+
+    def __init__(self, group_by, error, latency_field=None, latency_scale=1.0, normalize=False):
+        self.group_by = group_by
+        self.error_text = error
+        self.error_condition = parse_condition(error)
+        self.latency_field = latency_field
+        self.latency_scale = latency_scale
+        self.normalize = normalize
+        self.groups = {}
+        self.total = 0
+        self.errors = 0
+
+    @property
+    def fields(self):
+        """Field yang dibutuhkan agregasi, untuk GrokLibrary.compile(capture=...)"""
+        return [field for field in dict.fromkeys((self.group_by, self.error_condition[0], self.latency_field)) if field]
+
+    def consume(self, records):
+        """Agregasi dari record hasil GrokPattern.parse()"""
+        fields = self.fields
+        counts = {}
+        for record in records:
+            key = tuple(record.get(field) for field in fields)
+            counts[key] = counts.get(key, 0) + 1
+        self._add_counts(fields, counts)
+
+    def consume_lines(self, lines, pattern, continuation=None, stats=None):
+        """
+        Agregasi langsung dari baris log tanpa membuat record. pattern sebaiknya
+        dikompilasi dengan capture=self.fields. Baris dihitung per kombinasi nilai
+        field, jadi kondisi error dan normalisasi path hanya dihitung sekali per
+        kombinasi unik, bukan per baris.
+        """
+        fields = self.fields
+        prefilter, match = pattern.prefilter, pattern.match
+        get_key = pattern.field_getter(fields)
+        is_continuation = continuation.match if continuation else None
+        counts = {}
+        blank = continued = unparsed = 0
+        for line in lines:
+            m = match(line) if not prefilter or prefilter in line else None
+            if m is None:
+                if not line:
+                    blank += 1
+                elif is_continuation and is_continuation(line):
+                    continued += 1
+                else:
+                    unparsed += 1
+                continue
+            key = get_key(m)
+            counts[key] = counts.get(key, 0) + 1
+        self._add_counts(fields, counts)
+
+        if stats is not None:
+            records = sum(counts.values())
+            stats['lines'] += records + continued + unparsed
+            stats['records'] += records
+            stats['continuation'] += continued
+            stats['unparsed'] += unparsed
+
+    def _add_counts(self, fields, counts):
+        """counts: tuple nilai self.fields (termasuk latency) -> jumlah baris"""
+        is_error = make_predicate(self.error_condition)
+        index = fields.index(self.group_by)
+        latency_index = fields.index(self.latency_field) if self.latency_field else None
+        for key, count in counts.items():
+            group = key[index]
+            if group is None:
+                group = '(kosong)'
+            elif self.normalize:
+                group = normalize_path(str(group))
+            stats = self.groups.get(group)
+            if stats is None:
+                stats = self.groups[group] = [0, 0, QuantileSketch() if self.latency_field else None]
+            errors = count if is_error(dict(zip(fields, key))) else 0
+            stats[0] += count
+            stats[1] += errors
+            self.total += count
+            self.errors += errors
+            if latency_index is not None:
+                try:
+                    stats[2].add(float(key[latency_index]) * self.latency_scale, count)
+                except (TypeError, ValueError):
+                    pass
+
+    def merge(self, other):
+        for key, (total, errors, sketch) in other.groups.items():
+            stats = self.groups.get(key)
+            if stats is None:
+                self.groups[key] = [total, errors, sketch]
+                continue
+            stats[0] += total
+            stats[1] += errors
+            if sketch is not None:
+                stats[2].merge(sketch)
+        self.total += other.total
+        self.errors += other.errors
+
+# --- Parsing paralel per chunk (seperti sli_report.py) ---
+# Salinan find_chunk_offsets dari sli_report.py
+def find_chunk_offsets(file_name, num_chunks, start=0, end=None):
+    """
+    Membagi rentang byte [start, end) file menjadi num_chunks potongan yang
+    selalu dimulai di awal baris (start harus berada di awal baris).
+    """
+    end = os.path.getsize(file_name) if end is None else end
+    offsets = [start]
+    with open(file_name, 'rb') as f:
+        for i in range(1, num_chunks):
+            f.seek(max(start + (end - start) * i // num_chunks, offsets[-1]))
+            f.readline()  # lanjut ke awal baris berikutnya
+            offsets.append(min(f.tell(), end))
+    offsets.append(end)
+    return [(a, b) for a, b in zip(offsets, offsets[1:]) if b > a]
+
+def analyze_chunk(task):
+    file_name, start, end, format_name, pattern_text, aggregator = task
+    if format_name:
+        pattern, continuation = load_format(format_name, capture=aggregator.fields)
+    else:
+        pattern, continuation = _default_library.compile(pattern_text, capture=aggregator.fields), None
+    stats = {'lines': 0, 'records': 0, 'continuation': 0, 'unparsed': 0}
+    aggregator.consume_lines(iter_lines(file_name, start, end), pattern, continuation, stats)
+    return stats, aggregator
+
+def detect_format(file_name, sample_size=50):
+    """Format dari FORMATS yang paling banyak match di awal file"""
+    sample = []
+    for line in iter_lines(file_name):
+        if line:
+            sample.append(line)
+        if len(sample) >= sample_size:
+            break
+    best, best_count = None, 0
+    for name in FORMATS:
+        pattern, _ = load_format(name)
+        count = sum(pattern.parse(line) is not None for line in sample)
+        if count > best_count:
+            best, best_count = name, count
+    return best
+
+def format_ms(value):
+    return '-' if value is None else f"{value:,.1f}"
+
+def generate_sli_report(file_names, format_name, aggregator, stats, elapsed, top_n):
+    lines = [
+        "# Laporan SLI dari Log",
+        "",
+        f"*File: {', '.join(file_names)} — format {format_name or 'custom'}*",
+        "",
+        f"* **Baris dibaca:** {stats['lines']:,} ({stats['records']:,} record, "
+        f"{stats['continuation']:,} baris lanjutan, {stats['unparsed']:,} tidak cocok dengan pattern)",
+        f"* **Kecepatan parsing:** {stats['lines'] / max(elapsed, 1e-9):,.0f} baris/detik",
+        f"* **Kondisi error:** `{aggregator.error_text}`",
+    ]
+    if aggregator.total:
+        lines.append(f"* **Error rate total:** {aggregator.errors / aggregator.total * 100:.2f}% "
+                     f"({aggregator.errors:,} dari {aggregator.total:,})")
+
+    latency = aggregator.latency_field is not None
+    header = f"| {aggregator.group_by} | Record | Error | Error rate |"
+    divider = "| :--- | ---: | ---: | ---: |"
+    if latency:
+        header += " p50 (ms) | p95 (ms) | p99 (ms) |"
+        divider += " ---: | ---: | ---: |"
+    lines += ["", f"## Error Rate per {aggregator.group_by}", "", header, divider]
+
+    ranked = sorted(aggregator.groups.items(), key=lambda item: (-item[1][1], -item[1][0], str(item[0])))
+    for key, (total, errors, sketch) in ranked[:top_n]:
+        row = f"| {key} | {total:,} | {errors:,} | {errors / total * 100:.2f}% |"
+        if latency:
+            row += " " + " | ".join(format_ms(sketch.quantile(q)) for q in (0.5, 0.95, 0.99)) + " |"
+        lines.append(row)
+    if len(ranked) > top_n:
+        lines.append(f"\n*{len(ranked) - top_n:,} nilai {aggregator.group_by} lainnya tidak ditampilkan (lihat --top).*")
+    return "\n".join(lines) + "\n"
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Parse log dengan pattern grok dan hitung SLI (error rate, latency).")
+    parser.add_argument('files', nargs='+', help="file log (.gz didukung, '-' untuk stdin)")
+    parser.add_argument('-F', '--format', choices=sorted(FORMATS), help="format log (default: dideteksi otomatis)")
+    parser.add_argument('--pattern', help="file pattern grok sendiri (menggantikan --format)")
+    parser.add_argument('--patterns-dir', help="direktori file definisi pattern tambahan (gaya logstash patterns_dir)")
+    parser.add_argument('--group-by', help="field untuk grouping SLI (default tergantung format)")
+    parser.add_argument('--error', help="kondisi error, misalnya 'status>=500' atau 'loglevel=ERROR'")
+    parser.add_argument('--latency', help="field latency dalam detik, misalnya request_time")
+    parser.add_argument('--latency-unit', choices=('s', 'ms'), default='s', help="satuan field latency (default s)")
+    parser.add_argument('--normalize', action='store_true',
+                        help="normalisasi path: buang query string, segmen angka/ID menjadi :id")
+    parser.add_argument('--top', type=int, default=20, help="jumlah baris tabel SLI (default 20)")
+    parser.add_argument('--records', action='store_true', help="cetak record hasil parsing sebagai NDJSON, tanpa SLI")
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                        help="jumlah process untuk file besar tanpa kompresi (default 1)")
+    return parser
+
+def main():
+    parser = build_parser()
+    args = parser.parse_args()
+
+    library = _default_library
+    if args.patterns_dir:
+        for entry in sorted(os.listdir(args.patterns_dir)):
+            path = os.path.join(args.patterns_dir, entry)
+            if os.path.isfile(path):
+                library.add_definitions(load_pattern_definitions(path))
+
+    format_name = pattern_text = continuation = None
+    if args.pattern:
+        pattern_text = read_pattern_file(args.pattern)
+        pattern = library.compile(pattern_text)
+        spec = {}
+    else:
+        format_name = args.format
+        if format_name is None and args.files[0] != '-':
+            format_name = detect_format(args.files[0])
+        if format_name is None:
+            parser.error("format log tidak dikenali, gunakan --format atau --pattern")
+        pattern, continuation = load_format(format_name, library)
+        spec = FORMATS[format_name]
+
+    if args.records:
+        stats = {'lines': 0, 'records': 0, 'continuation': 0, 'unparsed': 0}
+        out = sys.stdout
+        for file_name in args.files:
+            for record in parse_lines(iter_lines(file_name), pattern, continuation, stats):
+                out.write(json.dumps(record, ensure_ascii=False) + '\n')
+        print(f"{stats['records']:,} record, {stats['unparsed']:,} baris tidak cocok", file=sys.stderr)
+        return
+
+    group_by = args.group_by or spec.get('group_by')
+    error = args.error or spec.get('error')
+    if not group_by or not error:
+        parser.error("--group-by dan --error wajib untuk --pattern custom")
+    try:
+        parse_condition(error)
+    except (ValueError, re.error) as e:
+        parser.error(str(e))
+    scale = 1000.0 if args.latency_unit == 's' else 1.0
+    aggregator = SLIAggregator(group_by, error, args.latency, scale, args.normalize)
+    # Hanya field yang dipakai agregasi yang di-capture regex
+    pattern = library.compile(pattern.text, FORMATS[format_name].get('types') if format_name else None, aggregator.fields)
+    missing = set(aggregator.fields) - set(pattern.fields)
+    if missing:
+        parser.error(f"field tidak ada di pattern: {', '.join(sorted(missing))}")
+
+    stats = {'lines': 0, 'records': 0, 'continuation': 0, 'unparsed': 0}
+    start = time.perf_counter()
+    # Pattern custom dengan --patterns-dir tidak bisa direkonstruksi di worker
+    parallel = args.workers > 1 and not args.patterns_dir
+    for file_name in args.files:
+        if parallel and file_name != '-' and not file_name.endswith('.gz'):
+            tasks = [(file_name, chunk_start, chunk_end, format_name, pattern_text,
+                      SLIAggregator(group_by, error, args.latency, scale, args.normalize))
+                     for chunk_start, chunk_end in find_chunk_offsets(file_name, args.workers * 4)]
+            with ProcessPoolExecutor(max_workers=args.workers) as executor:
+                for chunk_stats, chunk_aggregator in executor.map(analyze_chunk, tasks):
+                    for key, value in chunk_stats.items():
+                        stats[key] += value
+                    aggregator.merge(chunk_aggregator)
+        else:
+            aggregator.consume_lines(iter_lines(file_name), pattern, continuation, stats)
+    elapsed = time.perf_counter() - start
+
+    print(generate_sli_report(args.files, format_name, aggregator, stats, elapsed, args.top))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Test agregasi SLI grok_parser.py untuk field yang namanya bukan identifier
+Python (url.path) atau muncul lebih dari sekali di pattern.
+
+Jalankan: python -m unittest test_grok_parser  (atau python -m pytest)
+"""
+
+import unittest
+
+from grok_parser import GrokLibrary, SLIAggregator
+
+PATTERN = (r'%{IPORHOST:client.ip} "%{WORD:http.method} %{URIPATHPARAM:url.path}" '
+           r'(?:%{NUMBER:http.status:int}|%{WORD:http.status})')
+
+LINES = [
+    '10.0.0.1 "GET /api/orders" 200',
+    '10.0.0.2 "POST /api/orders" 503',
+    '10.0.0.3 "GET /login" unknown',
+    '10.0.0.4 "GET /login" 404',
+    'baris yang tidak cocok',
+]
+
+def summary(aggregator):
+    return {group: (total, errors) for group, (total, errors, _) in aggregator.groups.items()}
+
+class RenamedFieldTest(unittest.TestCase):
+    def setUp(self):
+        self.library = GrokLibrary()
+
+    def test_group_names(self):
+        pattern = self.library.compile(PATTERN)
+        self.assertEqual(len(pattern.group_names('url.path')), 1)
+        self.assertNotEqual(pattern.group_names('url.path'), ('url.path',))
+        self.assertEqual(len(pattern.group_names('http.status')), 2)
+        self.assertEqual(pattern.group_names('tidak_ada'), ())
+
+    def test_parse_records(self):
+        pattern = self.library.compile(PATTERN)
+        self.assertEqual(pattern.parse(LINES[1])['url.path'], '/api/orders')
+        self.assertEqual(pattern.parse(LINES[1])['http.status'], 503)
+        self.assertEqual(pattern.parse(LINES[2])['http.status'], 'unknown')
+
+    def test_consume_lines_matches_records(self):
+        aggregator = SLIAggregator('url.path', 'http.status>=400')
+        pattern = self.library.compile(PATTERN, capture=aggregator.fields)
+        stats = {'lines': 0, 'records': 0, 'continuation': 0, 'unparsed': 0}
+        aggregator.consume_lines(LINES, pattern, stats=stats)
+
+        expected = SLIAggregator('url.path', 'http.status>=400')
+        full = self.library.compile(PATTERN)
+        expected.consume(record for record in map(full.parse, LINES) if record)
+
+        self.assertEqual(summary(aggregator), {'/api/orders': (2, 1), '/login': (2, 1)})
+        self.assertEqual(summary(aggregator), summary(expected))
+        self.assertEqual((stats['records'], stats['unparsed']), (4, 1))
+
+    def test_single_duplicated_field(self):
+        aggregator = SLIAggregator('http.status', 'http.status>=500')
+        pattern = self.library.compile(PATTERN, capture=aggregator.fields)
+        aggregator.consume_lines(LINES, pattern)
+        self.assertEqual(summary(aggregator),
+                         {'200': (1, 0), '503': (1, 1), 'unknown': (1, 0), '404': (1, 0)})
+
+if __name__ == '__main__':
+    unittest.main()
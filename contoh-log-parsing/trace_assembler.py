@@ -0,0 +1,518 @@
+"""
+Menyusun distributed trace dari log beberapa service (format distributed-tracing).
+
+Log setiap service dibaca streaming dan di-merge berdasarkan timestamp (k-way
+merge), lalu baris dikelompokkan per trace_id di index in-memory yang
+dibatasi: trace dianggap selesai jika tidak ada baris baru selama --idle detik
+(waktu log), atau dikeluarkan paling awal jika jumlah trace aktif melebihi
+--max-traces. Setiap trace yang selesai menghasilkan timeline dengan durasi
+span per service dan critical path. Dengan --build-index, lokasi baris setiap
+trace disimpan di SQLite sehingga satu trace bisa dicari lagi tanpa scan ulang.
+
+Contoh:
+    python trace_assembler.py distributed-tracing/service-*.log
+    python trace_assembler.py distributed-tracing/service-*.log --trace d8b7c65a4e3d2c1b0a9f8e7d6c5b4a32
+    python trace_assembler.py logs/*.log --build-index traces.db --json traces.ndjson
+    python trace_assembler.py --index traces.db --trace d8b7c65a4e3d2c1b0a9f8e7d6c5b4a32
+"""
+
+import os
+import re
+import sys
+import gzip
+import json
+import heapq
+import sqlite3
+import argparse
+import datetime
+from collections import OrderedDict
+
+from grok_parser import load_format
+
+TRACE_FORMAT = 'distributed-tracing'
+ERROR_LEVELS = ('ERROR', 'FATAL')
+# Hanya field ini yang di-capture dari pattern distributed-tracing
+TRACE_FIELDS = ('timestamp', 'log_level', 'service_name', 'trace_id', 'span_id', 'message')
+ISO_LOCAL = re.compile(r'\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?$')
+# Batch insert ke index SQLite
+INDEX_BATCH_SIZE = 10_000
+
+_epoch_cache = {}
+
+def to_epoch(timestamp):
+    """'2025-11-04 13:40:05.100' -> detik (float). Bagian sampai detik di-cache."""
+    if (len(timestamp) == 23 and timestamp[19] == '.') or ISO_LOCAL.match(timestamp):
+        base = timestamp[:19]
+        seconds = _epoch_cache.get(base)
+        if seconds is None:
+            if len(_epoch_cache) >= 100_000:
+                _epoch_cache.clear()
+            seconds = _epoch_cache[base] = datetime.datetime.fromisoformat(base).timestamp()
+        fraction = timestamp[20:]
+        return seconds + (int(fraction) / 10 ** len(fraction) if fraction else 0.0)
+    return datetime.datetime.fromisoformat(timestamp.replace(',', '.')).timestamp()
+
+def iter_file_lines(file_name, start=0, end=None):
+    """(offset byte, baris) dari file log; offset dipakai untuk index di disk"""
+    opener = gzip.open if file_name.endswith('.gz') else open
+    with opener(file_name, 'rb') as f:
+        if start:
+            f.seek(start)
+        offset = start
+        for raw in f:
+            if end is not None and offset > end:
+                break
+            yield offset, raw.rstrip(b'\r\n').decode('utf-8', 'replace')
+            offset += len(raw)
+
+def iter_records(file_index, lines, pattern, stats):
+    """
+    Record bertrace dari satu stream baris, sebagai tuple yang bisa dibandingkan
+    untuk heapq.merge: (epoch, index file, offset, record)
+    """
+    parse = pattern.parse
+    for offset, line in lines:
+        stats['lines'] += 1
+        record = parse(line)
+        if record is None:
+            stats['unparsed'] += 1
+            continue
+        if not record['trace_id']:
+            stats['untraced'] += 1
+            continue
+        try:
+            epoch = to_epoch(record['timestamp'])
+        except ValueError:
+            stats['unparsed'] += 1
+            continue
+        yield epoch, file_index, offset, record
+
+class Span:
+    """Satu span (service + span_id), durasi diperkirakan dari baris log pertama sampai terakhir"""
+    __slots__ = ('service', 'span_id', 'start', 'end', 'lines', 'errors', 'parent', 'children', 'critical')
+
+    def __init__(self, service, span_id, epoch):
+        self.service = service
+        self.span_id = span_id
+        self.start = self.end = epoch
+        self.lines = 0
+        self.errors = 0
+        self.parent = None
+        self.children = []
+        self.critical = 0.0
+
+    @property
+    def duration(self):
+        return self.end - self.start
+
+class Trace:
+    __slots__ = ('trace_id', 'start', 'end', 'spans', 'lines', 'events', 'truncated', 'locations', 'evicted_early')
+
+    def __init__(self, trace_id, epoch):
+        self.trace_id = trace_id
+        self.start = self.end = epoch
+        self.spans = {}
+        self.lines = 0
+        # Baris untuk timeline (dibatasi --max-lines), urut waktu
+        self.events = []
+        self.truncated = 0
+        # index file -> [offset pertama, offset terakhir] (untuk index di disk)
+        self.locations = {}
+        self.evicted_early = False
+
+    def add(self, epoch, file_index, offset, record, max_lines):
+        # Record datang urut waktu (hasil merge), dan per file urut offset
+        if epoch > self.end:
+            self.end = epoch
+        self.lines += 1
+        key = (record['service_name'], record['span_id'])
+        span = self.spans.get(key)
+        if span is None:
+            span = self.spans[key] = Span(record['service_name'], record['span_id'], epoch)
+        elif epoch > span.end:
+            span.end = epoch
+        span.lines += 1
+        if record['log_level'] in ERROR_LEVELS:
+            span.errors += 1
+        if len(self.events) < max_lines:
+            self.events.append((epoch, record['service_name'], record['span_id'], record['log_level'], record['message']))
+        else:
+            self.truncated += 1
+        location = self.locations.get(file_index)
+        if location is None:
+            self.locations[file_index] = [offset, offset]
+        else:
+            location[1] = offset
+
+    @property
+    def duration(self):
+        return self.end - self.start
+
+    def build_tree(self):
+        """
+        Parent setiap span ditebak dari waktu: span terdalam (mulai paling akhir)
+        yang interval-nya memuat span ini. Log tidak membawa parent span id.
+        Return daftar root span.
+        """
+        spans = sorted(self.spans.values(), key=lambda span: (span.start, -span.end))
+        roots = []
+        for i, span in enumerate(spans):
+            span.children = []
+            span.parent = None
+            for candidate in reversed(spans[:i]):
+                if candidate.start <= span.start and span.end <= candidate.end and candidate.service != span.service:
+                    span.parent = candidate
+                    break
+        for span in spans:
+            (span.parent.children if span.parent else roots).append(span)
+        return roots
+
+    def critical_path(self):
+        """
+        Critical path (panggilan sinkron): dari akhir trace mundur, selalu ikuti
+        child yang selesai paling akhir. Return daftar segmen (start, end, span)
+        urut waktu; span None berarti jeda antar root span. Setiap span.critical
+        diisi total waktu span tersebut di critical path.
+        """
+        roots = self.build_tree()
+        for span in self.spans.values():
+            span.critical = 0.0
+        segments = []
+
+        def walk(span, children, start, end):
+            cursor = end
+            for child in sorted(children, key=lambda child: child.end, reverse=True):
+                if child.end > cursor or child.start < start:
+                    continue
+                segments.append((child.end, cursor, span))
+                walk(child, child.children, child.start, child.end)
+                cursor = child.start
+            segments.append((start, cursor, span))
+
+        walk(None, roots, self.start, self.end)
+        segments = [(start, end, span) for start, end, span in segments if end > start]
+        segments.sort(key=lambda segment: segment[0])
+        for start, end, span in segments:
+            if span is not None:
+                span.critical += end - start
+        return segments
+
+    def summary(self, files=None):
+        """Ringkasan trace sebagai dict (untuk JSON)"""
+        segments = self.critical_path()
+        services = {}
+        for start, end, span in segments:
+            name = span.service if span else '(jeda)'
+            services[name] = services.get(name, 0.0) + end - start
+        return {
+            'trace_id': self.trace_id,
+            'start': format_epoch(self.start),
+            'duration_ms': round(self.duration * 1000, 3),
+            'lines': self.lines,
+            'evicted_early': self.evicted_early,
+            'critical_path_ms': {name: round(value * 1000, 3) for name, value in services.items()},
+            'spans': [{
+                'service': span.service,
+                'span_id': span.span_id,
+                'parent_span_id': span.parent.span_id if span.parent else None,
+                'offset_ms': round((span.start - self.start) * 1000, 3),
+                'duration_ms': round(span.duration * 1000, 3),
+                'critical_ms': round(span.critical * 1000, 3),
+                'lines': span.lines,
+                'errors': span.errors,
+            } for span in sorted(self.spans.values(), key=lambda span: span.start)],
+        }
+
+def format_epoch(epoch):
+    return datetime.datetime.fromtimestamp(epoch).isoformat(sep=' ', timespec='milliseconds')
+
+class TraceIndex:
+    """
+    Index trace di SQLite: untuk setiap (trace_id, file) disimpan rentang byte
+    baris pertama sampai terakhir, jadi lookup cukup membaca rentang kecil itu.
+    """
+
+    def __init__(self, path, files=None):
+        self.path = path
+        # Lookup: read-only, supaya path yang salah tidak membuat file .db kosong
+        self.db = sqlite3.connect(path) if files is not None else sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+        self.pending = []
+        if files is not None:
+            self.db.executescript("""
+                DROP TABLE IF EXISTS files;
+                DROP TABLE IF EXISTS traces;
+                CREATE TABLE files (id INTEGER PRIMARY KEY, path TEXT, size INTEGER, mtime REAL);
+                CREATE TABLE traces (trace_id TEXT, file_id INTEGER, first_offset INTEGER,
+                                     last_offset INTEGER, lines INTEGER);
+            """)
+            self.db.executemany('INSERT INTO files VALUES (?, ?, ?, ?)', [
+                (i, os.path.abspath(path), os.path.getsize(path), os.path.getmtime(path)) for i, path in enumerate(files)])
+
+    def add(self, trace):
+        for file_index, (first, last) in trace.locations.items():
+            self.pending.append((trace.trace_id, file_index, first, last, trace.lines))
+        if len(self.pending) >= INDEX_BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            self.db.executemany('INSERT INTO traces VALUES (?, ?, ?, ?, ?)', self.pending)
+            self.pending = []
+
+    def close(self):
+        self.flush()
+        # Index dibuat setelah semua row masuk, lebih cepat dari update per insert
+        self.db.execute('CREATE INDEX IF NOT EXISTS traces_trace_id ON traces (trace_id)')
+        self.db.commit()
+        self.db.close()
+
+    def lookup(self, trace_id, pattern):
+        """Trace dari index: hanya rentang byte yang tercatat yang dibaca"""
+        files = {file_id: (path, size) for file_id, path, size, _ in self.db.execute('SELECT * FROM files')}
+        rows = self.db.execute('SELECT file_id, first_offset, last_offset FROM traces WHERE trace_id = ?', (trace_id,)).fetchall()
+        stats = {'lines': 0, 'unparsed': 0, 'untraced': 0}
+        streams = []
+        for file_id, first, last in rows:
+            path, size = files[file_id]
+            if not os.path.exists(path) or os.path.getsize(path) < size:
+                raise RuntimeError(f"{path} berubah (rotasi/truncate) sejak index dibuat, build ulang index")
+            lines = ((offset, line) for offset, line in iter_file_lines(path, first, last) if trace_id in line)
+            streams.append(iter_records(file_id, lines, pattern, stats))
+        trace = None
+        for epoch, file_index, offset, record in heapq.merge(*streams):
+            if record['trace_id'] != trace_id:
+                continue
+            if trace is None:
+                trace = Trace(trace_id, epoch)
+            trace.add(epoch, file_index, offset, record, sys.maxsize)
+        return trace
+
+class TraceAssembler:
+    """Index trace_id in-memory yang dibatasi jumlah trace dan umur (waktu log)"""
+
+    def __init__(self, idle, max_traces, max_lines, on_complete):
+        self.idle = idle
+        self.max_traces = max_traces
+        self.max_lines = max_lines
+        self.on_complete = on_complete
+        # trace_id -> Trace, urut dari aktivitas terakhir paling lama
+        self.active = OrderedDict()
+        self.completed = 0
+        self.evicted_early = 0
+        # Waktu log paling awal saat trace tertua bisa kedaluwarsa
+        self.next_expiry = float('inf')
+
+    def add(self, epoch, file_index, offset, record):
+        trace_id = record['trace_id']
+        trace = self.active.get(trace_id)
+        if trace is None:
+            trace = self.active[trace_id] = Trace(trace_id, epoch)
+        else:
+            self.active.move_to_end(trace_id)
+        trace.add(epoch, file_index, offset, record, self.max_lines)
+        if epoch >= self.next_expiry or len(self.active) > self.max_traces:
+            self.evict(epoch)
+
+    def evict(self, epoch):
+        # Input sudah urut waktu, jadi epoch adalah watermark: trace yang
+        # tidak aktif selama `idle` detik dianggap selesai
+        watermark = epoch - self.idle
+        while self.active:
+            oldest = next(iter(self.active.values()))
+            if oldest.end > watermark and len(self.active) <= self.max_traces:
+                break
+            self.active.popitem(last=False)
+            if oldest.end > watermark:
+                oldest.evicted_early = True
+                self.evicted_early += 1
+            self.complete(oldest)
+        self.next_expiry = next(iter(self.active.values())).end + self.idle if self.active else float('inf')
+
+    def complete(self, trace):
+        self.completed += 1
+        self.on_complete(trace)
+
+    def finish(self):
+        while self.active:
+            self.complete(self.active.popitem(last=False)[1])
+
+def format_ms(seconds):
+    return f"{seconds * 1000:,.1f}"
+
+def generate_timeline(trace):
+    """Timeline satu trace dalam markdown"""
+    segments = trace.critical_path()
+    roots = [span for span in trace.spans.values() if span.parent is None]
+    services = len({span.service for span in trace.spans.values()})
+    lines = [
+        f"## Trace {trace.trace_id}",
+        "",
+        f"* **Mulai:** {format_epoch(trace.start)}",
+        f"* **Durasi:** {format_ms(trace.duration)} ms ({services} service, {len(trace.spans)} span, {trace.lines} baris)",
+    ]
+    if trace.evicted_early:
+        lines.append("* **Catatan:** trace dikeluarkan dari index sebelum selesai (--max-traces), mungkin tidak lengkap")
+
+    path = []
+    for start, end, span in segments:
+        name = span.service if span else '(jeda)'
+        if path and path[-1][0] == name:
+            path[-1][1] += end - start
+        else:
+            path.append([name, end - start])
+    lines.append("* **Critical path:** " + " → ".join(f"{name} {format_ms(seconds)} ms" for name, seconds in path))
+
+    lines += ["", "| Span | Service | Mulai (+ms) | Durasi (ms) | Di critical path (ms) | Baris | Error |",
+              "| :--- | :--- | ---: | ---: | ---: | ---: | ---: |"]
+
+    def add_rows(span, depth):
+        indent = "&nbsp;&nbsp;" * depth + ("└ " if depth else "")
+        lines.append(f"| {indent}{span.span_id} | {span.service} | +{format_ms(span.start - trace.start)} | "
+                     f"{format_ms(span.duration)} | {format_ms(span.critical)} | {span.lines} | {span.errors} |")
+        for child in sorted(span.children, key=lambda child: child.start):
+            add_rows(child, depth + 1)
+
+    for root in sorted(roots, key=lambda span: span.start):
+        add_rows(root, 0)
+
+    lines += ["", "| +ms | Service | Level | Pesan |", "| ---: | :--- | :--- | :--- |"]
+    for epoch, service, span_id, level, message in trace.events:
+        lines.append(f"| +{format_ms(epoch - trace.start)} | {service} | {level} | {message.replace('|', chr(92) + '|')} |")
+    if trace.truncated:
+        lines.append(f"| | | | *{trace.truncated:,} baris lainnya tidak ditampilkan (--max-lines)* |")
+    return "\n".join(lines) + "\n"
+
+def generate_summary(files, stats, assembler, slowest, service_stats):
+    lines = [
+        "# Laporan Distributed Trace",
+        "",
+        f"*File: {', '.join(files)}*",
+        "",
+        f"* **Baris dibaca:** {stats['lines']:,} ({stats['untraced']:,} tanpa trace_id, {stats['unparsed']:,} tidak cocok dengan pattern)",
+        f"* **Trace:** {assembler.completed:,} ({assembler.evicted_early:,} dikeluarkan sebelum selesai karena --max-traces)",
+    ]
+    if service_stats:
+        total_critical = sum(values[2] for values in service_stats.values()) or 1
+        lines += ["", "## Per Service", "",
+                  "| Service | Span | Rata-rata durasi (ms) | Maks durasi (ms) | Porsi critical path |",
+                  "| :--- | ---: | ---: | ---: | ---: |"]
+        for service, (count, total, critical, longest) in sorted(service_stats.items(), key=lambda item: -item[1][2]):
+            lines.append(f"| {service} | {count:,} | {format_ms(total / count)} | {format_ms(longest)} | "
+                         f"{critical / total_critical * 100:.1f}% |")
+    if slowest:
+        lines += ["", f"## {len(slowest)} Trace Paling Lambat", "",
+                  "| Trace ID | Mulai | Durasi (ms) | Span | Critical path |", "| :--- | :--- | ---: | ---: | :--- |"]
+        for trace in slowest:
+            split = sorted(((span.critical, span.service) for span in trace.spans.values()), reverse=True)
+            path = ", ".join(f"{service} {format_ms(seconds)}" for seconds, service in split if seconds > 0)
+            lines.append(f"| {trace.trace_id} | {format_epoch(trace.start)} | {format_ms(trace.duration)} | "
+                         f"{len(trace.spans)} | {path} |")
+    return "\n".join(lines) + "\n"
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Susun distributed trace dari log beberapa service.")
+    parser.add_argument('files', nargs='*', help="file log per service (.gz didukung kecuali untuk --build-index)")
+    parser.add_argument('--trace', help="tampilkan timeline satu trace_id")
+    parser.add_argument('--top', type=int, default=5, help="jumlah trace paling lambat yang ditampilkan timeline-nya (default 5)")
+    parser.add_argument('--idle', type=float, default=30,
+                        help="trace dianggap selesai jika tidak ada baris baru selama N detik waktu log (default 30)")
+    parser.add_argument('--max-traces', type=int, default=100_000,
+                        help="maksimum trace aktif di memory (default 100000)")
+    parser.add_argument('--max-lines', type=int, default=1000,
+                        help="maksimum baris per trace yang disimpan untuk timeline (default 1000)")
+    parser.add_argument('--json', help="tulis setiap trace yang selesai sebagai NDJSON ke file ini")
+    parser.add_argument('--build-index', metavar='DB', help="simpan lokasi baris setiap trace ke index SQLite")
+    parser.add_argument('--index', metavar='DB', help="cari --trace di index SQLite (tanpa scan file)")
+    return parser
+
+def main():
+    parser = build_parser()
+    args = parser.parse_args()
+    pattern, _ = load_format(TRACE_FORMAT, capture=TRACE_FIELDS)
+
+    if args.index:
+        if not args.trace:
+            parser.error("--index membutuhkan --trace")
+        if not os.path.isfile(args.index):
+            parser.error(f"index {args.index} tidak ditemukan (buat dengan --build-index)")
+        try:
+            index = TraceIndex(args.index)
+            trace = index.lookup(args.trace, pattern)
+        except sqlite3.DatabaseError as e:
+            parser.error(f"{args.index} bukan index trace yang valid: {e}")
+        except RuntimeError as e:
+            parser.error(str(e))
+        if trace is None:
+            print(f"trace {args.trace} tidak ada di index", file=sys.stderr)
+            sys.exit(1)
+        print(generate_timeline(trace))
+        return
+
+    if not args.files:
+        parser.error("butuh minimal satu file log (atau --index DB --trace ID)")
+    if args.build_index and args.trace:
+        parser.error("--build-index tidak bisa digabung dengan --trace (index harus berisi semua trace)")
+    if args.build_index and any(file_name.endswith('.gz') for file_name in args.files):
+        parser.error("--build-index hanya untuk file tanpa kompresi (lookup membaca offset byte)")
+
+    stats = {'lines': 0, 'unparsed': 0, 'untraced': 0}
+    streams = [iter_records(i, iter_file_lines(file_name), pattern, stats) for i, file_name in enumerate(args.files)]
+
+    index = TraceIndex(args.build_index, args.files) if args.build_index else None
+    json_out = open(args.json, 'w') if args.json else None
+    # Min-heap berukuran --top: trace paling lambat tanpa menyimpan semua trace
+    slowest = []
+    found = []
+    # service -> [jumlah span, total durasi, total di critical path, durasi maksimum]
+    service_stats = {}
+
+    def on_complete(trace):
+        if args.trace:
+            if trace.trace_id == args.trace:
+                found.append(trace)
+            return
+        trace.critical_path()
+        for span in trace.spans.values():
+            values = service_stats.setdefault(span.service, [0, 0.0, 0.0, 0.0])
+            values[0] += 1
+            values[1] += span.duration
+            values[2] += span.critical
+            values[3] = max(values[3], span.duration)
+        if index:
+            index.add(trace)
+        if json_out:
+            json_out.write(json.dumps(trace.summary(), ensure_ascii=False) + '\n')
+        entry = (trace.duration, assembler.completed, trace)
+        if len(slowest) < args.top:
+            heapq.heappush(slowest, entry)
+        elif args.top and entry[0] > slowest[0][0]:
+            heapq.heapreplace(slowest, entry)
+
+    assembler = TraceAssembler(args.idle, args.max_traces, args.max_lines, on_complete)
+    try:
+        for item in heapq.merge(*streams):
+            if args.trace and item[3]['trace_id'] != args.trace:
+                continue
+            assembler.add(*item)
+        assembler.finish()
+    finally:
+        if json_out:
+            json_out.close()
+        if index:
+            index.close()
+
+    if args.trace:
+        if not found:
+            print(f"trace {args.trace} tidak ditemukan", file=sys.stderr)
+            sys.exit(1)
+        for trace in found:
+            print(generate_timeline(trace))
+        return
+
+    slowest = [trace for _, _, trace in sorted(slowest, key=lambda entry: -entry[0])]
+    print(generate_summary(args.files, stats, assembler, slowest, service_stats))
+    for trace in slowest:
+        print(generate_timeline(trace))
+
+if __name__ == '__main__':
+    main()
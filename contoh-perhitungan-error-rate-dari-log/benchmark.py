@@ -0,0 +1,353 @@
+"""
+Benchmark pipeline log ATM: generate -> read -> parse -> aggregate -> render.
+
+Untuk setiap ukuran log (di-generate dengan seed tetap), setiap tahap dijalankan
+di process baru supaya peak RSS tidak tercampur antar tahap. Waktu setiap tahap
+hanya mencakup tahap itu sendiri (parse dan aggregate diukur atas baris yang
+sudah ada di memory, tidak kumulatif). Hasil ditulis ke JSON, dan bisa
+dibandingkan dengan baseline: script keluar dengan kode 1 jika throughput turun
+atau memory naik melebihi batas (selisih kecil di bawah batas noise diabaikan).
+
+Contoh:
+    python benchmark.py --sizes 10k,1M --save-baseline benchmark_baseline.json
+    python benchmark.py --sizes 10k,1M --baseline benchmark_baseline.json
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import platform
+import argparse
+import datetime
+import itertools
+import resource
+import threading
+import traceback
+import tracemalloc
+import contextlib
+import multiprocessing
+
+DEFAULT_SIZES = '10k,1M,50M'
+STAGES = ('generate', 'read', 'parse', 'aggregate', 'render')
+SEED = 42
+# Tahap render sangat cepat, diulang supaya waktunya terukur
+RENDER_REPEAT = 1000
+# Jumlah baris per batch yang dibaca ke memory sebelum parse/aggregate diukur
+BATCH_LINES = 65536
+# Modul yang di-import process anak sebelum pengukuran dimulai
+STAGE_MODULES = {'generate': 'generate_log'}
+# Interval sampling RssAnon di process anak
+ANON_SAMPLE_INTERVAL = 0.002
+# Interval cek process anak masih hidup saat menunggu hasil
+RESULT_POLL_INTERVAL = 1.0
+
+def parse_count(text):
+    """'10k', '1M', '50M' -> jumlah baris."""
+    text = text.strip()
+    multiplier = {'k': 10 ** 3, 'M': 10 ** 6, 'G': 10 ** 9}.get(text[-1:], 1)
+    return int(float(text.rstrip('kMG')) * multiplier)
+
+def data_file(data_dir, lines):
+    return os.path.join(data_dir, f'atm_{lines}_seed{SEED}.log')
+
+# --- Tahap-tahap pipeline (dijalankan di process anak) ---
+def stage_generate(path, lines):
+    import generate_log
+    args = generate_log.build_parser().parse_args(['-n', str(lines), '--seed', str(SEED), '-o', path])
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        return generate_log.generate_log(args)
+
+def count_lines(path):
+    from sli_report import open_log
+    count = 0
+    with open_log(path) as f:
+        for _ in f:
+            count += 1
+    return count
+
+def stage_read(path, lines):
+    return count_lines(path)
+
+def iter_batches(path):
+    """Baris file per batch (list), waktu membaca batch tidak ikut diukur"""
+    from sli_report import open_log
+    with open_log(path) as f:
+        while True:
+            batch = list(itertools.islice(f, BATCH_LINES))
+            if not batch:
+                return
+            yield batch
+
+def parse_batch(batch):
+    from sli_report import parse_log_line
+    for line in batch:
+        parse_log_line(line.strip())
+
+def stage_parse(path, lines):
+    """Hanya parse_log_line() atas baris yang sudah di memory (tanpa baca file)"""
+    count, seconds = 0, 0.0
+    for batch in iter_batches(path):
+        start = time.perf_counter()
+        parse_batch(batch)
+        seconds += time.perf_counter() - start
+        count += len(batch)
+    return count, seconds
+
+def stage_aggregate(path, lines):
+    """
+    Hanya agregasi: analyze_log_data() mem-parse setiap baris sendiri, jadi
+    waktu parse batch yang sama (diukur di process yang sama) dikurangi.
+    """
+    from sli_report import analyze_log_data
+    count, seconds = 0, 0.0
+    for batch in iter_batches(path):
+        start = time.perf_counter()
+        parse_batch(batch)
+        parsed = time.perf_counter()
+        count += analyze_log_data(batch)[0]
+        seconds += (time.perf_counter() - parsed) - (parsed - start)
+    return count, seconds
+
+def stage_render(path, lines):
+    from sli_report import open_log, analyze_log_data, generate_markdown_report
+    with open_log(path) as f:
+        result = analyze_log_data(f)
+    # Hanya render yang diukur, waktu analisis di atas tidak dihitung
+    start = time.perf_counter()
+    for _ in range(RENDER_REPEAT):
+        generate_markdown_report(path, *result)
+    return None, (time.perf_counter() - start) / RENDER_REPEAT
+
+STAGE_FUNCTIONS = {
+    'generate': stage_generate,
+    'read': stage_read,
+    'parse': stage_parse,
+    'aggregate': stage_aggregate,
+    'render': stage_render,
+}
+
+def read_anon_rss_mb():
+    """RssAnon (MB) dari /proc/self/status, None jika tidak tersedia (bukan Linux)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('RssAnon:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+def sample_anon_peak(stop, peak):
+    """
+    Thread sampling peak RssAnon. Berbeda dengan ru_maxrss, RssAnon tidak
+    menghitung page file yang di-mmap (open_log), jadi yang terukur adalah
+    memory state agregasi, bukan ukuran file input.
+    """
+    while True:
+        value = read_anon_rss_mb()
+        if value is None:
+            return
+        peak[0] = max(peak[0] or 0.0, value)
+        if stop.wait(ANON_SAMPLE_INTERVAL):
+            return
+
+def run_stage(stage, path, lines, trace, results):
+    """Process anak: jalankan satu tahap, kirim waktu, jumlah baris dan peak memory ke parent."""
+    try:
+        # Waktu & alokasi import modul tidak ikut diukur
+        __import__(STAGE_MODULES.get(stage, 'sli_report'))
+        if trace:
+            tracemalloc.start()
+        stop, anon_peak = threading.Event(), [None]
+        sampler = threading.Thread(target=sample_anon_peak, args=(stop, anon_peak), daemon=True)
+        sampler.start()
+        start = time.perf_counter()
+        result = STAGE_FUNCTIONS[stage](path, lines)
+        seconds = time.perf_counter() - start
+        stop.set()
+        sampler.join()
+        # Tahap yang mengukur waktunya sendiri return (jumlah baris, detik)
+        if isinstance(result, tuple):
+            result, seconds = result
+        results.put({
+            'seconds': seconds,
+            'lines': result,
+            'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            'peak_anon_mb': anon_peak[0],
+            'alloc_peak_mb': tracemalloc.get_traced_memory()[1] / 2 ** 20 if trace else None,
+        })
+    except BaseException:
+        # Traceback dicetak oleh parent
+        results.put({'error': traceback.format_exc()})
+        sys.exit(1)
+
+def measure(stage, path, lines, trace=False):
+    # 'spawn': process anak bersih, peak RSS tidak mewarisi memory parent
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    process = context.Process(target=run_stage, args=(stage, path, lines, trace, results))
+    process.start()
+    # Process anak yang mati tanpa mengirim hasil (misalnya di-kill OOM)
+    # tidak boleh membuat benchmark menunggu selamanya
+    result = None
+    while result is None:
+        try:
+            result = results.get(timeout=RESULT_POLL_INTERVAL)
+        except queue.Empty:
+            if not process.is_alive():
+                try:
+                    result = results.get(timeout=RESULT_POLL_INTERVAL)
+                except queue.Empty:
+                    break
+    process.join()
+    if result is not None and 'error' in result:
+        raise RuntimeError(f"tahap {stage} gagal:\n{result['error']}")
+    if result is None or process.exitcode != 0:
+        raise RuntimeError(f"tahap {stage} gagal (exit code {process.exitcode})")
+    return result
+
+def run_benchmark(sizes, stages, data_dir, trace_limit, repeat):
+    """
+    Ukur setiap tahap untuk setiap ukuran log; dari `repeat` run diambil waktu
+    median dan peak RssAnon terbesar.
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    results = []
+    for target in sizes:
+        path = data_file(data_dir, target)
+        if 'generate' not in stages and not os.path.exists(path):
+            measure('generate', path, target)
+        actual_lines = None
+        for stage in stages:
+            runs = [measure(stage, path, target) for _ in range(repeat)]
+            # Median lebih stabil dari run tercepat: di mesin yang sibuk run tercepat
+            # kadang jauh lebih cepat dari biasanya dan membuat baseline terlalu optimis
+            measured = sorted(runs, key=lambda run: run['seconds'])[len(runs) // 2]
+            # RssAnon hasil sampling bisa melewatkan lonjakan singkat (batas bawah
+            # peak sebenarnya), jadi diambil yang terbesar dari semua run
+            anon = [run['peak_anon_mb'] for run in runs if run['peak_anon_mb'] is not None]
+            measured['peak_anon_mb'] = max(anon) if anon else None
+            if measured['lines'] is not None:
+                actual_lines = measured['lines']
+            # tracemalloc memperlambat eksekusi, jadi diukur di run terpisah dan hanya untuk log kecil
+            if target <= trace_limit:
+                measured['alloc_peak_mb'] = measure(stage, path, target, trace=True)['alloc_peak_mb']
+            lines = actual_lines or measured['lines']
+            results.append({
+                'size': target,
+                'stage': stage,
+                'lines': lines,
+                'seconds': round(measured['seconds'], 6),
+                'lines_per_sec': round(lines / measured['seconds']) if lines and stage != 'render' else None,
+                'peak_rss_mb': round(measured['peak_rss_mb'], 1),
+                'peak_anon_mb': None if measured['peak_anon_mb'] is None else round(measured['peak_anon_mb'], 1),
+                'alloc_peak_mb': None if measured['alloc_peak_mb'] is None else round(measured['alloc_peak_mb'], 2),
+            })
+            print(format_row(results[-1]), file=sys.stderr)
+    return results
+
+def format_row(row):
+    speed = f"{row['lines_per_sec']:,}" if row['lines_per_sec'] else '-'
+    anon = f"{row['peak_anon_mb']:.1f}" if row.get('peak_anon_mb') is not None else '-'
+    alloc = f"{row['alloc_peak_mb']:.2f}" if row['alloc_peak_mb'] is not None else '-'
+    return (f"| {row['size']:,} | {row['stage']} | {row['seconds'] * 1000:,.2f} | {speed} | "
+            f"{row['peak_rss_mb']:.1f} | {anon} | {alloc} |")
+
+def markdown_table(results):
+    lines = ["| Ukuran | Tahap | Waktu (ms) | Baris/detik | Peak RSS (MB) | Peak RSS anon (MB) | Peak alokasi (MB) |",
+             "| ---: | :--- | ---: | ---: | ---: | ---: | ---: |"]
+    return "\n".join(lines + [format_row(row) for row in results])
+
+def memory_metric(row):
+    """
+    Memory yang dibandingkan dengan baseline: peak RSS anonymous (tanpa page file
+    yang di-mmap), atau peak RSS total jika RssAnon tidak tersedia.
+    """
+    if row.get('peak_anon_mb') is not None:
+        return 'peak RSS anon', row['peak_anon_mb']
+    return 'peak RSS', row['peak_rss_mb']
+
+def measured_seconds(row):
+    """Durasi yang benar-benar diukur (render: total RENDER_REPEAT kali render)"""
+    return row['seconds'] * (RENDER_REPEAT if row['stage'] == 'render' else 1)
+
+def compare_with_baseline(results, baseline, max_regression, min_seconds=0.0, min_mb=0.0):
+    """
+    Daftar regresi: throughput turun atau peak memory naik lebih dari max_regression
+    (rasio). Pada log kecil selisih beberapa milidetik atau ratusan KB sudah
+    melewati 10%, jadi regresi juga harus lebih besar dari min_seconds / min_mb.
+    """
+    previous = {(row['size'], row['stage']): row for row in baseline['results']}
+    regressions = []
+    for row in results:
+        old = previous.get((row['size'], row['stage']))
+        if old is None:
+            continue
+        slower = measured_seconds(row) - measured_seconds(old) > min_seconds
+        if row['stage'] == 'render':
+            if slower and row['seconds'] > old['seconds'] * (1 + max_regression):
+                regressions.append(f"{row['size']:,} {row['stage']}: {old['seconds']:.6f}s -> {row['seconds']:.6f}s")
+        elif slower and old['lines_per_sec'] and row['lines_per_sec'] < old['lines_per_sec'] * (1 - max_regression):
+            regressions.append(f"{row['size']:,} {row['stage']}: {old['lines_per_sec']:,} -> {row['lines_per_sec']:,} baris/detik")
+        (name, current), (old_name, previous_mb) = memory_metric(row), memory_metric(old)
+        if name == old_name and current > previous_mb * (1 + max_regression) and current - previous_mb > min_mb:
+            regressions.append(f"{row['size']:,} {row['stage']}: {name} {previous_mb} -> {current} MB")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark pipeline log ATM (generate, read, parse, aggregate, render).")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help=f"ukuran log, dipisah koma (default {DEFAULT_SIZES})")
+    parser.add_argument('--stages', default=','.join(STAGES), help=f"tahap yang diukur (default {','.join(STAGES)})")
+    parser.add_argument('--data-dir', default='.bench-data', help="direktori log hasil generate (default .bench-data)")
+    parser.add_argument('--trace-limit', type=parse_count, default=parse_count('1M'),
+                        help="ukur peak alokasi (tracemalloc) hanya untuk log sampai ukuran ini (default 1M)")
+    parser.add_argument('--repeat', type=int, default=3, help="jumlah run per tahap, diambil median waktunya (default 3)")
+    parser.add_argument('-o', '--output', default='benchmark_results.json', help="file hasil JSON")
+    parser.add_argument('--baseline', help="bandingkan dengan hasil JSON sebelumnya, gagal jika ada regresi")
+    parser.add_argument('--max-regression', type=float, default=0.10,
+                        help="batas regresi throughput / peak RSS anon terhadap baseline (default 0.10 = 10%%)")
+    parser.add_argument('--min-regression-ms', type=float, default=20,
+                        help="selisih waktu minimum (ms) sebelum dianggap regresi, untuk meredam noise log kecil (default 20)")
+    parser.add_argument('--min-regression-mb', type=float, default=2,
+                        help="selisih memory minimum (MB) sebelum dianggap regresi (default 2)")
+    parser.add_argument('--save-baseline', help="simpan juga hasil sebagai baseline ke file ini")
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat minimal 1")
+    if args.baseline and args.repeat < 3:
+        parser.error("--baseline butuh --repeat minimal 3 supaya satu run yang lambat tidak dianggap regresi")
+
+    sizes = [parse_count(size) for size in args.sizes.split(',')]
+    stages = [stage.strip() for stage in args.stages.split(',')]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"tahap tidak dikenal: {', '.join(sorted(unknown))}")
+
+    results = run_benchmark(sizes, stages, args.data_dir, args.trace_limit, args.repeat)
+    report = {
+        'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'seed': SEED,
+        'repeat': args.repeat,
+        'results': results,
+    }
+    for file_name in filter(None, (args.output, args.save_baseline)):
+        with open(file_name, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    print(markdown_table(results))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_with_baseline(results, json.load(f), args.max_regression,
+                                                args.min_regression_ms / 1000, args.min_regression_mb)
+        if regressions:
+            print(f"\nRegresi melebihi {args.max_regression:.0%} terhadap baseline:")
+            for regression in regressions:
+                print(f"* {regression}")
+            sys.exit(1)
+        print(f"\nTidak ada regresi melebihi {args.max_regression:.0%} terhadap baseline.")
@@ -1,5 +1,16 @@
+import os
+import re
+import gzip
+import shutil
+import argparse
 import datetime
-import random
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    raise SystemExit("generate_log.py membutuhkan paket 'numpy' (pip install numpy)")
 
 # ==========================================================
 # PARAMETER & KONFIGURASI LOG
@@ -36,86 +47,395 @@ ERROR_MESSAGES = [
     "SYSTEM_MAINTENANCE"
 ]
 
+# Error yang ditulis tanpa detail ATM/Operasi di depan
+ERRORS_WITHOUT_DETAIL = ("CONNECTION_LOST", "SYSTEM_MAINTENANCE")
+
 # ID ATM (Daftar ID yang mungkin)
-ATM_IDS = [f"ATM{i:05d}" for i in range(100, 150)] # 50 ID ATM berbeda
+ATM_COUNT = 50
+ATM_IDS = [f"ATM{i:05d}" for i in range(100, 100 + ATM_COUNT)] # 50 ID ATM berbeda
+
+# Pola trafik untuk --seasonality: bobot relatif per jam (00-23) dan per hari (Senin-Minggu)
+HOURLY_WEIGHTS = [0.2, 0.1, 0.1, 0.1, 0.2, 0.4, 0.8, 1.2, 1.5, 1.6, 1.7, 1.9,
+                  2.0, 1.8, 1.6, 1.5, 1.6, 1.8, 1.9, 1.7, 1.3, 0.9, 0.6, 0.3]
+WEEKDAY_WEIGHTS = [1.0, 0.95, 0.95, 1.0, 1.2, 1.3, 0.85]
+
+# Nomor REF pertama
+REF_START = 100000
+
+# Jumlah baris maksimal yang diformat sekaligus (membatasi memory untuk hari yang sangat padat)
+BATCH_SIZE = 250_000
+
+# Level kompresi output .gz (1 = tercepat, 9 = terkecil)
+GZIP_LEVEL = 6
 
 # ==========================================================
 # FUNGIONALITAS GENERASI LOG
 # ==========================================================
 
-def generate_log():
-    """Menghasilkan log transaksi dan menyimpannya ke file."""
-    
-    # Hitung rata-rata transaksi per hari
-    avg_tx_per_day = TOTAL_TRANSACTIONS / DAYS_IN_MONTH
-    
-    # Inisialisasi penghitung
-    current_datetime = START_DATE
-    transaction_count = 0
-    ref_counter = 100000
-
-    print(f"Memulai generasi log ke file: {OUTPUT_FILENAME}")
-    print(f"Target: {TOTAL_TRANSACTIONS} transaksi dalam {DAYS_IN_MONTH} hari.")
-
-    with open(OUTPUT_FILENAME, 'w') as f:
-        for day in range(DAYS_IN_MONTH):
-            # Sesuaikan jumlah transaksi hari ini agar total mendekati target
-            # Tambahkan variasi random +/- 10%
-            daily_tx_count = int(avg_tx_per_day * (1 + random.uniform(-0.1, 0.1)))
-            
-            # Distribusikan transaksi secara acak sepanjang 24 jam hari itu
-            daily_seconds = [random.randint(0, 86399) for _ in range(daily_tx_count)]
-            daily_seconds.sort() # Urutkan agar log berurutan waktu
-
-            for second in daily_seconds:
-                # Dapatkan timestamp
-                current_timestamp = current_datetime + datetime.timedelta(seconds=second)
-                
-                # Pilih operasi dan ID ATM
-                atm_id = random.choice(ATM_IDS)
-                operation = random.choice(list(OPERATIONS.keys()))
-                
-                # Tentukan status (ERROR atau SUCCESS)
-                is_error = random.random() < ERROR_RATE
-                
-                # Format entri log
-                status = "ERROR" if is_error else "SUCCESS"
-                ref_id = f"REF{ref_counter:06d}"
-
-                log_entry = f"{current_timestamp.strftime('%Y-%m-%d %H:%M:%S')} [{status}] {atm_id} {operation}"
-                
-                if status == "SUCCESS":
-                    min_amount, max_amount = OPERATIONS[operation]
-                    amount = random.randrange(min_amount, max_amount, 50000) if operation != "BALANCE" else 0
-                    
-                    if operation == "BALANCE":
-                        description = "0" # Nilai 0 menunjukkan hanya cek saldo
-                    else:
-                        description = f"{amount}"
-                    
-                    log_entry += f" {description} {ref_id}"
-                
-                else: # Status ERROR
-                    error_msg = random.choice(ERROR_MESSAGES)
-                    
-                    # Beberapa error tidak memerlukan detail ATM/Operasi di depan
-                    if error_msg == "CONNECTION_LOST" or error_msg == "SYSTEM_MAINTENANCE":
-                        log_entry = f"{current_timestamp.strftime('%Y-%m-%d %H:%M:%S')} [{status}] {error_msg} {ref_id}"
+def amount_choices(operation):
+    """Nominal yang mungkin untuk transaksi sukses (sama dengan randrange(min, max, 50000))."""
+    min_amount, max_amount = OPERATIONS[operation]
+    return list(range(min_amount, max_amount, 50000)) if operation != "BALANCE" else [0]
+
+class LineTable:
+    """
+    Semua kemungkinan bagian tengah baris log ("[STATUS] ATMID OPERASI DETAIL ")
+    disimpan sekali sebagai matriks byte. Setiap baris log cukup direpresentasikan
+    sebagai satu kode (indeks ke tabel ini), sehingga baris bisa diformat
+    secara vectorized tanpa membuat string per baris.
+    """
+
+    def __init__(self, atm_ids=ATM_IDS):
+        self.atm_ids = atm_ids
+        operations = list(OPERATIONS)
+        self.amounts = [amount_choices(op) for op in operations]
+        # Offset blok nominal tiap operasi dalam kode sukses satu ATM
+        self.amount_offsets = np.cumsum([0] + [len(a) for a in self.amounts[:-1]])
+        self.success_per_atm = sum(len(a) for a in self.amounts)
+        self.amount_counts = np.array([len(a) for a in self.amounts])
+        self.error_base = len(atm_ids) * self.success_per_atm
+
+        parts = []
+        for atm_id in atm_ids:
+            for op, amounts in zip(operations, self.amounts):
+                parts += [f"[SUCCESS] {atm_id} {op} {amount} " for amount in amounts]
+        for atm_id in atm_ids:
+            for op in operations:
+                for error_msg in ERROR_MESSAGES:
+                    if error_msg in ERRORS_WITHOUT_DETAIL:
+                        parts.append(f"[ERROR] {error_msg} ")
                     else:
-                        # Tambahkan pesan error spesifik setelah operasi
-                        log_entry += f" {error_msg} {ref_id}"
+                        parts.append(f"[ERROR] {atm_id} {op} {error_msg} ")
+
+        encoded = [part.encode() for part in parts]
+        self.lengths = np.array([len(part) for part in encoded])
+        self.width = int(self.lengths.max())
+        self.bytes = np.zeros((len(encoded), self.width), dtype=np.uint8)
+        for i, part in enumerate(encoded):
+            self.bytes[i, :len(part)] = np.frombuffer(part, dtype=np.uint8)
+        # Untuk setiap kode: posisi mana di kolom tabel yang benar-benar dipakai
+        self.keep = np.arange(self.width) < self.lengths[:, None]
+
+    def draw_codes(self, rng, count, error_rate=ERROR_RATE, atm_weights=None, forced_error=None):
+        """
+        Undi ATM, operasi, status, nominal dan jenis error untuk `count` transaksi.
+        error_rate boleh berupa array per transaksi; forced_error (array indeks
+        ERROR_MESSAGES, -1 = acak) memaksa jenis error tertentu, misalnya saat insiden.
+        """
+        atm = rng.choice(len(self.atm_ids), count, p=atm_weights) if atm_weights is not None \
+            else rng.integers(0, len(self.atm_ids), count)
+        op = rng.integers(0, len(OPERATIONS), count)
+        is_error = rng.random(count) < error_rate
+        amount = (rng.random(count) * self.amount_counts[op]).astype(np.int64)
+        error_msg = rng.integers(0, len(ERROR_MESSAGES), count)
+        if forced_error is not None:
+            error_msg = np.where(forced_error >= 0, forced_error, error_msg)
+
+        success_codes = atm * self.success_per_atm + self.amount_offsets[op] + amount
+        error_codes = self.error_base + (atm * len(OPERATIONS) + op) * len(ERROR_MESSAGES) + error_msg
+        return np.where(is_error, error_codes, success_codes), is_error
+
+    def mean_length(self, rng, error_rate=ERROR_RATE, atm_weights=None, samples=100_000):
+        """Perkiraan rata-rata panjang bagian tengah baris (untuk menghitung jumlah baris dari --size)."""
+        codes, _ = self.draw_codes(rng, samples, error_rate, atm_weights)
+        return float(self.lengths[codes].mean())
+
+# "HH:MM:SS " untuk setiap detik dalam sehari, dibuat sekali
+_time_table = None
+
+def time_table():
+    global _time_table
+    if _time_table is None:
+        seconds = np.arange(86400)
+        digits = np.stack([seconds // 36000, seconds // 3600 % 10, seconds % 3600 // 600, seconds % 600 // 60 % 10,
+                           seconds % 60 // 10, seconds % 10], axis=1).astype(np.uint8) + ord('0')
+        table = np.full((86400, 9), ord(':'), dtype=np.uint8)
+        table[:, [0, 1, 3, 4, 6, 7]] = digits
+        table[:, 8] = ord(' ')
+        _time_table = table
+    return _time_table
+
+def format_lines(table, date_prefix, seconds, codes, refs):
+    """
+    Format satu batch baris log menjadi bytes:
+    "<tanggal> <HH:MM:SS> <bagian tengah dari tabel>REF<nomor minimal 6 digit>\\n".
+    Setiap baris ditulis ke satu baris matriks lebar tetap, lalu padding
+    dibuang sekaligus dengan boolean mask.
+    """
+    count = len(codes)
+    ref_digits = max(6, len(str(int(refs[-1])))) if count else 6
+    prefix_width = len(date_prefix) + 9
+    ref_start = prefix_width + table.width
+    width = ref_start + 3 + ref_digits + 1
+
+    rows = np.empty((count, width), dtype=np.uint8)
+    rows[:, :len(date_prefix)] = np.frombuffer(date_prefix, dtype=np.uint8)
+    rows[:, len(date_prefix):prefix_width] = time_table()[seconds]
+    rows[:, prefix_width:ref_start] = table.bytes[codes]
+    rows[:, ref_start:ref_start + 3] = np.frombuffer(b'REF', dtype=np.uint8)
+    value = refs.copy()
+    for i in range(ref_digits - 1, -1, -1):
+        rows[:, ref_start + 3 + i] = value % 10 + ord('0')
+        value //= 10
+    rows[:, -1] = ord('\n')
+
+    mask = np.ones((count, width), dtype=bool)
+    mask[:, prefix_width:ref_start] = table.keep[codes]
+    # Nomor REF minimal 6 digit, digit nol di depan dibuang jika nomor lebih pendek dari lebar kolom
+    ref_length = np.maximum(6, np.floor(np.log10(np.maximum(refs, 1))).astype(np.int64) + 1)
+    mask[:, ref_start + 3:ref_start + 3 + ref_digits] = np.arange(ref_digits) >= ref_digits - ref_length[:, None]
+    return rows[mask]
+
+# --- Parameter CLI ---
+def positive_int(text):
+    """Bilangan bulat > 0 (jumlah transaksi, hari, ATM)."""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"bukan bilangan bulat: {text}")
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"harus lebih dari 0: {text}")
+    return value
+
+def parse_size(text):
+    """'500M', '2G', '750k' -> jumlah byte."""
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)([kKmMgGtT]?)[bB]?', text.strip())
+    if not match:
+        raise argparse.ArgumentTypeError(f"ukuran tidak valid: {text}")
+    number, unit = match.groups()
+    return int(float(number) * 1024 ** ' KMGT'.index(unit.upper() or ' '))
 
-                f.write(log_entry + '\n')
-                transaction_count += 1
-                ref_counter += 1
+def parse_duration(text):
+    """'30m', '2h', '45s' -> timedelta."""
+    match = re.fullmatch(r'(\d+)([smhd])', text.strip())
+    if not match:
+        raise argparse.ArgumentTypeError(f"durasi tidak valid: {text}")
+    number, unit = match.groups()
+    unit_name = {'s': 'seconds', 'm': 'minutes', 'h': 'hours', 'd': 'days'}[unit]
+    return datetime.timedelta(**{unit_name: int(number)})
 
-            # Pindah ke hari berikutnya
-            current_datetime = current_datetime + datetime.timedelta(days=1)
-    
-    print(f"\nGenerasi Selesai.")
+def parse_incident(text):
+    """
+    Insiden/error burst: "MULAI,DURASI,JENIS_ERROR,ERROR_RATE",
+    misalnya "2025-11-15T10:00,30m,CONNECTION_LOST,0.8".
+    """
+    try:
+        start, duration, error_msg, rate = text.split(',')
+        start = datetime.datetime.fromisoformat(start)
+        rate = float(rate)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"insiden tidak valid: {text} (format: MULAI,DURASI,JENIS_ERROR,ERROR_RATE)")
+    if error_msg not in ERROR_MESSAGES:
+        raise argparse.ArgumentTypeError(f"jenis error tidak dikenal: {error_msg} (pilihan: {', '.join(ERROR_MESSAGES)})")
+    return {'start': start, 'end': start + parse_duration(duration),
+            'error': ERROR_MESSAGES.index(error_msg), 'rate': rate}
+
+def compression_of(file_name):
+    """Kompresi output ditentukan dari ekstensi file: .gz, .zst atau tanpa kompresi."""
+    if file_name.endswith('.gz'):
+        return 'gzip'
+    if file_name.endswith('.zst'):
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            raise SystemExit("output .zst membutuhkan paket 'zstandard' (pip install zstandard)")
+        return 'zstd'
+    return None
+
+def open_output(file_name, compression):
+    if compression == 'gzip':
+        return gzip.open(file_name, 'wb', compresslevel=GZIP_LEVEL)
+    if compression == 'zstd':
+        import zstandard
+        return zstandard.ZstdCompressor().stream_writer(open(file_name, 'wb'), closefd=True)
+    return open(file_name, 'wb')
+
+def rotated_name(file_name, date):
+    """big_atm_log.txt.gz -> big_atm_log-20251101.txt.gz (seperti logrotate dengan dateext)."""
+    directory, base = os.path.split(file_name)
+    stem, dot, extension = base.partition('.')
+    return os.path.join(directory, f"{stem}-{date:%Y%m%d}{dot}{extension}")
+
+# --- Rencana generasi: jumlah transaksi per hari dan seed per shard ---
+def atm_weights(atm_count, skew):
+    """Distribusi trafik antar ATM: skew 0 = merata, makin besar makin timpang (Zipf: 1 / rank^skew)."""
+    if not skew:
+        return None
+    weights = 1 / np.arange(1, atm_count + 1) ** skew
+    return weights / weights.sum()
+
+def second_weights(seasonality):
+    """Probabilitas transaksi untuk setiap detik dalam sehari."""
+    if not seasonality:
+        return np.full(86400, 1 / 86400)
+    weights = np.repeat(np.array(HOURLY_WEIGHTS, dtype=float), 3600)
+    return weights / weights.sum()
+
+def plan_days(args, rng):
+    """
+    Jumlah transaksi setiap hari (diundi di process utama supaya nomor REF
+    setiap shard bisa dihitung sebelum shard dijalankan).
+    """
+    avg_tx_per_day = args.transactions / args.days
+    counts = []
+    for day in range(args.days):
+        weight = 1.0
+        if args.seasonality:
+            date = args.start_date + datetime.timedelta(days=day)
+            weight = WEEKDAY_WEIGHTS[date.weekday()] / (sum(WEEKDAY_WEIGHTS) / 7)
+        # Tambahkan variasi random +/- 10%
+        counts.append(int(avg_tx_per_day * weight * (1 + rng.uniform(-0.1, 0.1))))
+    return counts
+
+# LineTable per jumlah ATM, dibuat sekali per process worker
+_line_tables = {}
+
+def line_table(atm_count):
+    table = _line_tables.get(atm_count)
+    if table is None:
+        table = _line_tables[atm_count] = LineTable([f"ATM{i:05d}" for i in range(100, 100 + atm_count)])
+    return table
+
+def generate_day(task, out=None):
+    """
+    Worker: generate satu hari (satu shard) ke file `path`, atau ke stream `out`
+    yang sudah dibuka (mode satu process). Seed shard diturunkan dari seed utama
+    dan nomor hari, sehingga output sama berapa pun jumlah worker.
+    Return (jumlah transaksi, jumlah error).
+    """
+    day, count, ref_start, seed_sequence, path, args = task
+    rng = np.random.default_rng(seed_sequence)
+    table = line_table(args.atms)
+    weights = atm_weights(args.atms, args.atm_skew)
+    date = args.start_date + datetime.timedelta(days=day)
+    date_prefix = date.strftime('%Y-%m-%d ').encode()
+
+    # Jumlah transaksi per detik diundi sekaligus, hasilnya sudah urut waktu
+    per_second = rng.multinomial(count, second_weights(args.seasonality))
+    daily_seconds = np.repeat(np.arange(86400, dtype=np.int32), per_second)
+
+    # Insiden yang beririsan dengan hari ini, dalam detik sejak 00:00
+    incidents = []
+    for incident in args.incidents:
+        start = int((incident['start'] - date).total_seconds())
+        end = int((incident['end'] - date).total_seconds())
+        if start < 86400 and end > 0:
+            incidents.append((start, end, incident['error'], incident['rate']))
+
+    error_count = 0
+    output = contextlib.nullcontext(out) if out is not None else open_output(path, compression_of(args.output))
+    with output as f:
+        for start in range(0, count, BATCH_SIZE):
+            seconds = daily_seconds[start:start + BATCH_SIZE]
+            error_rate, forced_error = args.error_rate, None
+            if incidents:
+                error_rate = np.full(len(seconds), args.error_rate)
+                forced_error = np.full(len(seconds), -1)
+                for incident_start, incident_end, error_msg, rate in incidents:
+                    active = (seconds >= incident_start) & (seconds < incident_end)
+                    error_rate[active] = rate
+                    forced_error[active] = error_msg
+            codes, is_error = table.draw_codes(rng, len(seconds), error_rate, weights, forced_error)
+            refs = np.arange(ref_start + start, ref_start + start + len(seconds))
+            f.write(format_lines(table, date_prefix, seconds, codes, refs))
+            error_count += int(is_error.sum())
+    return count, error_count
+
+def generate_log(args):
+    """
+    Menghasilkan log transaksi dan menyimpannya ke file (satu shard per hari, paralel).
+    Return jumlah transaksi yang dihasilkan.
+    """
+    seed_sequence = np.random.SeedSequence(args.seed)
+    plan_seed, *day_seeds = seed_sequence.spawn(args.days + 1)
+    rng = np.random.default_rng(plan_seed)
+
+    if args.size:
+        # Perkirakan jumlah baris dari rata-rata panjang baris:
+        # "YYYY-MM-DD HH:MM:SS " + bagian tengah + "REF" + nomor + "\n"
+        middle = line_table(args.atms).mean_length(np.random.default_rng(0), args.error_rate,
+                                                atm_weights(args.atms, args.atm_skew))
+        line_length = 20 + middle + 3 + max(6, len(str(REF_START + args.size // 60))) + 1
+        args.transactions = int(args.size / line_length)
+
+    counts = plan_days(args, rng)
+    ref_starts = np.cumsum([REF_START] + counts[:-1]).tolist()
+    dates = [args.start_date + datetime.timedelta(days=day) for day in range(args.days)]
+    if args.rotate == 'daily':
+        paths = [rotated_name(args.output, date) for date in dates]
+    else:
+        paths = [f"{args.output}.part{day:04d}" for day in range(args.days)]
+
+    print(f"Memulai generasi log ke file: {args.output}")
+    print(f"Target: {args.transactions} transaksi dalam {args.days} hari.")
+
+    tasks = [(day, counts[day], ref_starts[day], day_seeds[day], paths[day], args) for day in range(args.days)]
+    workers = args.workers or os.cpu_count() or 1
+    if workers == 1 and args.rotate != 'daily':
+        # Satu process: semua hari langsung ditulis ke file output, tanpa file shard
+        with open_output(args.output, compression_of(args.output)) as out:
+            results = [generate_day(task, out) for task in tasks]
+    elif workers == 1:
+        results = [generate_day(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(generate_day, tasks))
+
+    if args.rotate != 'daily' and workers > 1:
+        # Gabungkan shard sesuai urutan hari. Gabungan member gzip / frame zstd tetap file yang valid.
+        with open(args.output, 'wb') as out:
+            for path in paths:
+                with open(path, 'rb') as part:
+                    shutil.copyfileobj(part, out, 1 << 20)
+                os.remove(path)
+
+    transaction_count = sum(count for count, _ in results)
+    error_count = sum(errors for _, errors in results)
+    print("\nGenerasi Selesai.")
     print(f"Total entri yang dihasilkan: {transaction_count}")
-    print(f"Error Rate Aktual (Perkiraan): {round((TOTAL_TRANSACTIONS * ERROR_RATE) / transaction_count * 100, 2)}%")
+    if args.rotate == 'daily':
+        print(f"File: {paths[0]} ... {paths[-1]} ({len(paths)} file)")
+    print(f"Error Rate Aktual: {round(error_count / max(transaction_count, 1) * 100, 2)}%")
+    return transaction_count
+
+def output_path(text):
+    """Path output, direktorinya harus sudah ada"""
+    directory = os.path.dirname(text) or '.'
+    if not os.path.isdir(directory):
+        raise argparse.ArgumentTypeError(f"direktori '{directory}' tidak ada")
+    return text
+
+def build_parser():
+    """Parser argumen CLI (juga dipakai benchmark.py untuk membuat konfigurasi generator)."""
+    parser = argparse.ArgumentParser(description="Generator log transaksi ATM tiruan.")
+    parser.add_argument('-o', '--output', type=output_path, default=OUTPUT_FILENAME,
+                        help=f"file output; akhiran .gz / .zst untuk output terkompresi (default {OUTPUT_FILENAME})")
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument('-n', '--transactions', type=positive_int, default=TOTAL_TRANSACTIONS,
+                      help=f"target jumlah transaksi (default {TOTAL_TRANSACTIONS})")
+    size.add_argument('--size', type=parse_size,
+                      help="target ukuran file sebelum kompresi, misalnya 500M atau 2G (perkiraan)")
+    parser.add_argument('--days', type=positive_int, default=DAYS_IN_MONTH, help=f"jumlah hari (default {DAYS_IN_MONTH})")
+    parser.add_argument('--start-date', type=datetime.datetime.fromisoformat, default=START_DATE,
+                        help=f"tanggal awal (default {START_DATE:%Y-%m-%d})")
+    parser.add_argument('--error-rate', type=float, default=ERROR_RATE, help=f"error rate dasar (default {ERROR_RATE})")
+    parser.add_argument('--atms', type=positive_int, default=ATM_COUNT, help=f"jumlah ATM (default {ATM_COUNT})")
+    parser.add_argument('--atm-skew', type=float, default=0,
+                        help="ketimpangan trafik antar ATM (Zipf, 0 = merata, 1 = ATM pertama paling ramai)")
+    parser.add_argument('--seasonality', action='store_true',
+                        help="pola trafik per jam (ramai siang/sore, sepi dini hari) dan per hari dalam seminggu")
+    parser.add_argument('--incident', dest='incidents', type=parse_incident, action='append', default=[],
+                        metavar='MULAI,DURASI,ERROR,RATE',
+                        help="sisipkan insiden, misalnya 2025-11-15T10:00,30m,CONNECTION_LOST,0.8 (bisa berulang)")
+    parser.add_argument('--rotate', choices=['daily'],
+                        help="pisahkan output per hari seperti logrotate (nama-YYYYMMDD.ext)")
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                        help="jumlah process untuk generate hari secara paralel (0 = semua core, default 1)")
+    parser.add_argument('--seed', type=int, help="seed random supaya output bisa direproduksi")
+    return parser
 
 # --- EKSEKUSI UTAMA ---
 if __name__ == "__main__":
-    generate_log()
\ No newline at end of file
+    args = build_parser().parse_args()
+    compression_of(args.output)
+    generate_log(args)
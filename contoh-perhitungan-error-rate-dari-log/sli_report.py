@@ -1,7 +1,18 @@
+import io
+import os
+import contextlib
 import re
 import sys
+import gzip
+import json
+import math
+import mmap
+import time
+import argparse
 import datetime
+from array import array
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
 def get_day_of_week_name(date_str):
     """Mengubah string tanggal menjadi nama hari (Senin, Selasa, dst.) dalam Bahasa Indonesia."""
@@ -12,67 +23,886 @@ def get_day_of_week_name(date_str):
     except ValueError:
         return "TIDAK VALID"
 
-def analyze_log_data(log_content):
-    """Menganalisis konten log dan menghitung metrik SLI, termasuk metrik harian."""
+def open_log(file_name):
+    """
+    Membuka file log sebagai iterator baris bytes (streaming, tidak dibaca sekaligus).
+    Mendukung file biasa (di-mmap), .gz, .zst (butuh paket zstandard) dan '-' untuk stdin.
+    """
+    if file_name == '-':
+        return sys.stdin.buffer
+    if file_name.endswith('.gz'):
+        return gzip.open(file_name, 'rb')
+    if file_name.endswith('.zst'):
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError("membaca file .zst membutuhkan paket 'zstandard' (pip install zstandard)")
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(file_name, 'rb'), closefd=True))
+    return contextlib.closing(iter_mmap_lines(file_name))
+
+# Pola lengkap format log, hanya dipakai untuk baris yang tidak mengikuti
+# layout standar (lihat parse_log_line)
+LOG_PATTERN = re.compile(rb'^(\d{4}-\d{2}-\d{2}) \d{2}:\d{2}:\d{2} \[(SUCCESS|ERROR)\] (?:ATM\d+ )?([A-Z_]+)(?:.*?)?$')
+DATE_PATTERN = re.compile(rb'\d{4}-\d{2}-\d{2}')
+TOKEN_PATTERN = re.compile(rb'[A-Z_]+')
+# Semua digit -> '0', untuk mengecek layout timestamp dengan satu perbandingan
+DIGITS_TO_ZERO = bytes.maketrans(b'0123456789', b'0000000000')
+TIMESTAMP_LAYOUT = b'0000-00-00 00:00:00 ['
+OPERATIONS = (b'TRANSFER', b'WITHDRAW', b'BALANCE')
+
+# Cache token -> apakah token terdiri dari [A-Z_]+ (jumlah token unik sangat sedikit)
+_token_cache = {}
+
+def is_detail_token(token):
+    valid = _token_cache.get(token)
+    if valid is None:
+        valid = _token_cache[token] = TOKEN_PATTERN.fullmatch(token) is not None
+    return valid
+
+def parse_log_line(line):
+    """
+    Mengambil (tanggal, sukses?, detail, posisi akhir detail) dari satu baris log (bytes).
+    Baris dengan layout standar "YYYY-MM-DD HH:MM:SS [STATUS] ATMID OPERASI ..." diparse
+    dengan slicing pada posisi tetap; baris lain diparse dengan LOG_PATTERN sehingga
+    hasilnya selalu sama dengan regex. Return None jika baris bukan entri log yang valid.
+    """
+    # Timestamp di posisi tetap: "YYYY-MM-DD HH:MM:SS ["
+    if line[:21].translate(DIGITS_TO_ZERO) == TIMESTAMP_LAYOUT:
+        if line.startswith(b'SUCCESS] ', 21):
+            success, pos = True, 30
+        elif line.startswith(b'ERROR] ', 21):
+            success, pos = False, 28
+        else:
+            return None
+
+        # ID ATM opsional, lalu token detail (OPERASI atau jenis error)
+        end = line.find(b' ', pos)
+        if line.startswith(b'ATM', pos) and end > pos + 3 and line[pos + 3:end].isdigit():
+            pos = end + 1
+            end = line.find(b' ', pos)
+        if end < 0:
+            end = len(line)
+        detail = line[pos:end]
+        if detail and is_detail_token(detail):
+            return line[:10], success, detail, end
+
+    # Layout tidak standar: pakai regex lengkap
+    match = LOG_PATTERN.match(line)
+    if not match:
+        return None
+    return match.group(1), match.group(2) == b'SUCCESS', match.group(3), match.end(3)
+
+def iter_mmap_lines(file_name, start=0, end=None):
+    """Iterasi baris (bytes) file yang di-mmap, untuk baris yang dimulai di rentang byte [start, end)."""
+    with open(file_name, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = len(mm) if end is None else end
+            mm.seek(start)
+            readline = mm.readline
+            while mm.tell() < end:
+                line = readline()
+                if not line:
+                    break
+                yield line
+
+def classify_error(line, detail, detail_end):
+    """Operasi dan jenis error (bytes) dari entri ERROR yang sudah diparse dengan parse_log_line."""
+    if detail in OPERATIONS:
+        op = detail
+    elif detail == b'CONNECTION_LOST':
+        op = b'SYSTEM'
+    else:
+        op = b'UNKNOWN_OP'
+
+    # Jenis error: kata pertama setelah operasi (sampai operasi yang sama muncul lagi)
+    error_detail = None
+    if op in OPERATIONS:
+        error_detail = line[detail_end:].split(op, 1)[0].strip().split(b' ')[0]
+
+    if error_detail in (b'', b'REF') or error_detail is None:
+        error_detail = detail
+    return op, error_detail
+
+# --- Dimensi tambahan laporan (--detail): per ATM, per jam, dan nominal transaksi ---
+class QuantileSketch:
+    """
+    Sketch quantile streaming (seperti DDSketch): nilai dikelompokkan ke bucket
+    logaritmik sehingga error relatif quantile <= relative_accuracy dan memory
+    hanya bergantung pada rentang nilai (log(max/min)), bukan jumlah data.
+    Dua sketch dapat digabung dengan menjumlahkan bucket.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zero = 0
+        self.count = 0
+        # nilai -> bucket; nominal transaksi biasanya kelipatan tertentu (sedikit nilai unik)
+        self._keys = {}
+
+    def add(self, value, count=1):
+        if value <= 0:
+            self.zero += count
+        else:
+            key = self._keys.get(value)
+            if key is None:
+                key = math.ceil(math.log(value) / self.log_gamma)
+                if len(self._keys) < 4096:
+                    self._keys[value] = key
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.count += count
+
+    def merge(self, other):
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zero += other.zero
+        self.count += other.count
+
+    def quantile(self, q):
+        """Perkiraan nilai pada quantile q (0..1), None jika sketch kosong."""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero
+        if rank < seen:
+            return 0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                # Titik tengah bucket (gamma^(key-1), gamma^key]
+                return 2 * self.gamma ** key / (self.gamma + 1)
+
+class ReportDimensions:
+    """
+    Agregasi tambahan yang diisi di pass yang sama dengan analyze_log_data:
+    total & error per ID ATM, total & error per jam (00-23), dan sketch
+    nominal transaksi sukses per operasi. Memory tetap kecil berapa pun
+    ukuran file (sebanding jumlah ATM dan bucket sketch).
+    """
+
+    def __init__(self):
+        self.atm_counts = {}
+        self.hour_counts = [[0, 0] for _ in range(24)]
+        self.amounts = {}
+        # tanggal (bytes) -> tanggal valid? (per jam hanya untuk timestamp valid)
+        self._valid_dates = {}
+
+    def add(self, line, success, detail, detail_end):
+        error = 0 if success else 1
+
+        pos = 30 if success else 28
+        if line.startswith(b'ATM', pos):
+            atm = line[pos:line.find(b' ', pos)]
+            counts = self.atm_counts.get(atm)
+            if counts is None:
+                counts = self.atm_counts[atm] = [0, 0]
+            counts[0] += 1
+            counts[1] += error
+
+        date = line[:10]
+        valid = self._valid_dates.get(date)
+        if valid is None:
+            valid = self._valid_dates[date] = get_day_of_week_name(date.decode()) != "TIDAK VALID"
+        if valid:
+            # Jam tidak valid dibatasi ke 23, sama seperti build_columns
+            counts = self.hour_counts[min(int(line[11:13]), 23)]
+            counts[0] += 1
+            counts[1] += error
+
+        if success:
+            amount = line[detail_end + 1:].split(b' ', 1)[0]
+            if amount.isdigit():
+                sketch = self.amounts.get(detail)
+                if sketch is None:
+                    sketch = self.amounts[detail] = QuantileSketch()
+                sketch.add(int(amount))
+
+    def merge(self, other):
+        for atm, (total, errors) in other.atm_counts.items():
+            counts = self.atm_counts.setdefault(atm, [0, 0])
+            counts[0] += total
+            counts[1] += errors
+        for counts, (total, errors) in zip(self.hour_counts, other.hour_counts):
+            counts[0] += total
+            counts[1] += errors
+        for op, sketch in other.amounts.items():
+            self.amounts.setdefault(op, QuantileSketch()).merge(sketch)
+
+def analyze_log_data(log_content, dimensions=None):
+    """
+    Menganalisis konten log dan menghitung metrik SLI, termasuk metrik harian.
+    log_content dapat berupa string atau iterable baris (str atau bytes, misalnya
+    file object biner atau iter_mmap_lines), sehingga memory hanya sebesar dict
+    agregasi, bukan sebesar file log.
+
+    Parsing dilakukan pada bytes dengan parse_log_line, nama hari di-cache per
+    tanggal (satu file hanya berisi puluhan tanggal) sehingga strptime hanya
+    dipanggil sekali per tanggal.
+
+    Jika dimensions (ReportDimensions) diberikan, dimensi tambahan ikut diisi
+    di pass yang sama.
+    """
     
     total_entries = 0
     success_entries = 0
-    operation_counts = defaultdict(lambda: {'total': 0, 'success': 0})
-    error_types = defaultdict(int)
+    operation_counts = {}
+    error_types = {}
     daily_error_stats = defaultdict(lambda: {'total': 0, 'errors': 0})
-
-    log_pattern = re.compile(r'^(\d{4}-\d{2}-\d{2}) \d{2}:\d{2}:\d{2} \[(SUCCESS|ERROR)\] (?:ATM\d+ )?([A-Z_]+)(?:.*?)?$')
+    # tanggal (bytes) -> dict statistik harian untuk hari tersebut
+    day_cache = {}
     
-    for line in log_content.strip().split('\n'):
+    if isinstance(log_content, str):
+        log_content = io.StringIO(log_content)
+
+    for line in log_content:
+        if isinstance(line, str):
+            line = line.encode()
         line = line.strip()
-        if not line or line.startswith('---'):
+        if not line or line.startswith(b'---'):
             continue
 
-        match = log_pattern.match(line)
-        if not match:
+        parsed = parse_log_line(line)
+        if parsed is None:
             continue
-            
-        date_str = match.group(1)
-        status = match.group(2)
-        detail = match.group(3)
+        date, success, detail, detail_end = parsed
+        if dimensions is not None:
+            dimensions.add(line, success, detail, detail_end)
         
         # --- Penghitungan Harian ---
-        day_name = get_day_of_week_name(date_str)
-        daily_error_stats[day_name]['total'] += 1
+        day_stats = day_cache.get(date)
+        if day_stats is None:
+            day_stats = day_cache[date] = daily_error_stats[get_day_of_week_name(date.decode())]
+        day_stats['total'] += 1
         
         total_entries += 1
         
-        if status == 'SUCCESS':
+        if success:
             success_entries += 1
-            op = detail
-            operation_counts[op]['total'] += 1
-            operation_counts[op]['success'] += 1
+            counts = operation_counts.get(detail)
+            if counts is None:
+                counts = operation_counts[detail] = [0, 0]
+            counts[0] += 1
+            counts[1] += 1
         else: # ERROR
-            daily_error_stats[day_name]['errors'] += 1
+            day_stats['errors'] += 1
             
             # Logika untuk Per-Operation dan Error Breakdown
-            if detail in ['TRANSFER', 'WITHDRAW', 'BALANCE']:
-                op = detail
-            elif detail == 'CONNECTION_LOST':
-                op = 'SYSTEM'
-            else:
-                op = 'UNKNOWN_OP'
-
-            operation_counts[op]['total'] += 1
-
-            error_detail = None
-            if op in ['TRANSFER', 'WITHDRAW', 'BALANCE']:
-                parts = line.split(op)
-                if len(parts) > 1:
-                    error_detail = parts[1].strip().split(' ')[0]
-            
-            if error_detail in ['', 'REF'] or error_detail is None:
-                error_detail = detail
+            op, error_detail = classify_error(line, detail, detail_end)
+
+            counts = operation_counts.get(op)
+            if counts is None:
+                counts = operation_counts[op] = [0, 0]
+            counts[0] += 1
 
             if error_detail:
-                error_types[error_detail] += 1
+                error_types[error_detail] = error_types.get(error_detail, 0) + 1
+
+    # Key bytes -> str, urutan kemunculan pertama tetap dipertahankan
+    op_result = defaultdict(lambda: {'total': 0, 'success': 0})
+    for op, (total, success) in operation_counts.items():
+        op_result[op.decode()] = {'total': total, 'success': success}
+    error_result = defaultdict(int)
+    for error, count in error_types.items():
+        error_result[error.decode()] = count
             
-    return total_entries, success_entries, operation_counts, error_types, daily_error_stats
+    return total_entries, success_entries, op_result, error_result, daily_error_stats
+
+# --- Mode paralel: analisis per potongan file lalu digabung ---
+def empty_result():
+    """Hasil analisis kosong (elemen netral untuk merge_results)."""
+    return 0, 0, {}, {}, {}
+
+def merge_results(left, right):
+    """
+    Menggabungkan dua hasil analyze_log_data (atau potongan file) menjadi satu.
+    Operasi ini asosiatif; jika potongan digabung berurutan sesuai posisinya
+    di file, urutan key dict sama dengan hasil serial sehingga laporan identik.
+    """
+    total = left[0] + right[0]
+    success = left[1] + right[1]
+
+    op_counts = {op: dict(data) for op, data in left[2].items()}
+    for op, data in right[2].items():
+        merged = op_counts.setdefault(op, {'total': 0, 'success': 0})
+        merged['total'] += data['total']
+        merged['success'] += data['success']
+
+    error_types = dict(left[3])
+    for error, count in right[3].items():
+        error_types[error] = error_types.get(error, 0) + count
+
+    daily_stats = {day: dict(data) for day, data in left[4].items()}
+    for day, data in right[4].items():
+        merged = daily_stats.setdefault(day, {'total': 0, 'errors': 0})
+        merged['total'] += data['total']
+        merged['errors'] += data['errors']
+
+    return total, success, op_counts, error_types, daily_stats
+
+def find_chunk_offsets(file_name, num_chunks, start=0, end=None):
+    """
+    Membagi rentang byte [start, end) file menjadi num_chunks potongan yang
+    selalu dimulai di awal baris (start harus berada di awal baris).
+    """
+    end = os.path.getsize(file_name) if end is None else end
+    offsets = [start]
+    with open(file_name, 'rb') as f:
+        for i in range(1, num_chunks):
+            f.seek(max(start + (end - start) * i // num_chunks, offsets[-1]))
+            f.readline()  # lanjut ke awal baris berikutnya
+            offsets.append(min(f.tell(), end))
+    offsets.append(end)
+    return [(a, b) for a, b in zip(offsets, offsets[1:]) if b > a]
+
+def analyze_file_chunk(file_name, start, end, with_dimensions=False):
+    """
+    Worker: analisis satu potongan file, hasilnya dict biasa agar bisa di-pickle.
+    Dengan with_dimensions, return (hasil, ReportDimensions).
+    """
+    dimensions = ReportDimensions() if with_dimensions else None
+    total, success, op_counts, error_types, daily_stats = analyze_log_data(iter_mmap_lines(file_name, start, end), dimensions)
+    result = total, success, dict(op_counts), dict(error_types), dict(daily_stats)
+    return (result, dimensions) if with_dimensions else result
+
+def analyze_log_file_parallel(file_name, workers=None, start=0, end=None, dimensions=None):
+    """
+    Analisis file log (atau rentang byte [start, end) dari file) memakai beberapa
+    process sekaligus. File dibagi pada batas baris, setiap potongan dianalisis
+    di process pool, lalu hasilnya digabung dengan merge_results.
+    Hasil identik dengan analyze_log_data. Jika dimensions diberikan,
+    dimensi tambahan dari setiap potongan digabung ke dalamnya.
+    """
+    workers = workers or os.cpu_count() or 1
+    # Potongan lebih banyak dari worker supaya beban tetap rata
+    chunks = find_chunk_offsets(file_name, workers * 4, start, end)
+
+    result = empty_result()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(analyze_file_chunk, file_name, start, end, dimensions is not None)
+                   for start, end in chunks]
+        for future in futures:
+            chunk_result = future.result()
+            if dimensions is not None:
+                chunk_result, chunk_dimensions = chunk_result
+                dimensions.merge(chunk_dimensions)
+            result = merge_results(result, chunk_result)
+    return result
+
+# --- Mode incremental: hanya memproses data baru sejak run sebelumnya ---
+STATE_VERSION = 1
+# Beberapa byte pertama file disimpan untuk mendeteksi file yang diganti
+# walaupun inode-nya dipakai ulang
+FINGERPRINT_SIZE = 64
+
+def load_state(state_file):
+    """Membaca state file (None jika belum ada atau versinya berbeda)."""
+    try:
+        with open(state_file) as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return None
+    return state if state.get('version') == STATE_VERSION else None
+
+def save_state(state_file, state):
+    """Menulis state file secara atomik (tulis file sementara lalu rename)."""
+    tmp_file = state_file + '.tmp'
+    with open(tmp_file, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_file, state_file)
+
+def analyze_log_incremental(file_name, state_file, workers=1):
+    """
+    Analisis log yang terus bertambah. Hasil agregasi, offset byte terakhir,
+    inode dan fingerprint awal file disimpan di state_file, sehingga run
+    berikutnya hanya memproses byte yang ditambahkan sejak run sebelumnya.
+
+    - Rotasi (inode atau fingerprint berubah) dan truncation (ukuran file
+      lebih kecil dari offset): agregasi lama dipertahankan dan file dibaca
+      ulang dari awal, seperti logrotate (rename maupun copytruncate).
+    - Baris terakhir yang belum lengkap (belum ada newline) ditunda ke run berikutnya.
+
+    Return (hasil agregasi gabungan, jumlah byte baru yang diproses).
+    """
+    state = load_state(state_file)
+    result, offset = empty_result(), 0
+
+    with open(file_name, 'rb') as f:
+        info = os.fstat(f.fileno())
+        fingerprint = f.read(FINGERPRINT_SIZE).hex()
+
+    if state:
+        result = tuple(state['result'])
+        same_file = (state['inode'] == info.st_ino and state['device'] == info.st_dev
+                     and fingerprint.startswith(state['fingerprint']))
+        if same_file and info.st_size >= state['offset']:
+            offset = state['offset']
+        else:
+            print("Catatan: file log dirotasi atau di-truncate, dibaca ulang dari awal.", file=sys.stderr)
+
+    # Hanya sampai newline terakhir, baris yang sedang ditulis diproses nanti
+    end = offset
+    if info.st_size > offset:
+        with open(file_name, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = mm.rfind(b'\n', offset, info.st_size) + 1 or offset
+
+    if end > offset:
+        if workers != 1:
+            new_result = analyze_log_file_parallel(file_name, workers or None, offset, end)
+        else:
+            new_result = analyze_file_chunk(file_name, offset, end)
+        result = merge_results(result, new_result)
+
+    save_state(state_file, {
+        'version': STATE_VERSION,
+        'file': os.path.abspath(file_name),
+        'inode': info.st_ino,
+        'device': info.st_dev,
+        'fingerprint': fingerprint if end >= FINGERPRINT_SIZE else fingerprint[:end * 2],
+        'offset': end,
+        'result': list(result),
+    })
+    return result, end - offset
+
+# --- Mode live (--follow): error rate & burn rate dengan sliding window ---
+# Window dalam menit. Window sampai 6 jam memakai ring buffer per menit,
+# window 30 hari memakai ring buffer per jam supaya memory tetap kecil.
+MINUTE_WINDOWS = (('5m', 5), ('30m', 30), ('1h', 60), ('6h', 360))
+MINUTE_SLOTS = 360
+HOUR_WINDOW = ('30d', 30 * 24)
+HOUR_SLOTS = 30 * 24
+WINDOW_NAMES = tuple(name for name, _ in MINUTE_WINDOWS) + (HOUR_WINDOW[0],)
+# Multi-window burn rate alert (SRE Workbook): (nama, window panjang, window pendek, batas burn rate)
+BURN_RATE_ALERTS = (('PAGE-FAST', '1h', '5m', 14.4), ('PAGE-SLOW', '6h', '30m', 6.0))
+
+class RollingWindow:
+    """
+    Counter total & error untuk satu dimensi (global, operasi, atau ATM) pada
+    semua window sekaligus. Bucket disimpan di ring buffer array('I') (4 byte
+    per bucket, sekitar 8.6 KB per dimensi), dan jumlah per window disimpan
+    sebagai running sum sehingga penambahan dan pembacaan window O(1).
+    """
+    __slots__ = ('minute', 'totals', 'errors', 'sum_totals', 'sum_errors',
+                 'hour', 'hour_totals', 'hour_errors', 'hour_sum_total', 'hour_sum_errors')
+
+    def __init__(self, minute):
+        self.minute = minute
+        self.totals = array('I', bytes(4 * MINUTE_SLOTS))
+        self.errors = array('I', bytes(4 * MINUTE_SLOTS))
+        self.sum_totals = [0] * len(MINUTE_WINDOWS)
+        self.sum_errors = [0] * len(MINUTE_WINDOWS)
+        self.hour = minute // 60
+        self.hour_totals = array('I', bytes(4 * HOUR_SLOTS))
+        self.hour_errors = array('I', bytes(4 * HOUR_SLOTS))
+        self.hour_sum_total = 0
+        self.hour_sum_errors = 0
+
+    def advance(self, minute):
+        """Geser window sampai menit `minute`, bucket yang keluar dari window dikurangi dari running sum."""
+        if minute <= self.minute:
+            return
+        if minute - self.minute >= MINUTE_SLOTS:
+            self.totals = array('I', bytes(4 * MINUTE_SLOTS))
+            self.errors = array('I', bytes(4 * MINUTE_SLOTS))
+            self.sum_totals = [0] * len(MINUTE_WINDOWS)
+            self.sum_errors = [0] * len(MINUTE_WINDOWS)
+        else:
+            totals, errors = self.totals, self.errors
+            for m in range(self.minute + 1, minute + 1):
+                for i, (_, size) in enumerate(MINUTE_WINDOWS):
+                    slot = (m - size) % MINUTE_SLOTS
+                    self.sum_totals[i] -= totals[slot]
+                    self.sum_errors[i] -= errors[slot]
+                slot = m % MINUTE_SLOTS
+                totals[slot] = errors[slot] = 0
+        self.minute = minute
+
+        hour = minute // 60
+        if hour - self.hour >= HOUR_SLOTS:
+            self.hour_totals = array('I', bytes(4 * HOUR_SLOTS))
+            self.hour_errors = array('I', bytes(4 * HOUR_SLOTS))
+            self.hour_sum_total = self.hour_sum_errors = 0
+        else:
+            for h in range(self.hour + 1, hour + 1):
+                slot = h % HOUR_SLOTS
+                self.hour_sum_total -= self.hour_totals[slot]
+                self.hour_sum_errors -= self.hour_errors[slot]
+                self.hour_totals[slot] = self.hour_errors[slot] = 0
+        self.hour = hour
+
+    def add(self, minute, error):
+        """Catat satu transaksi pada menit `minute` (entri yang sedikit terlambat tetap dihitung)."""
+        if minute > self.minute:
+            self.advance(minute)
+
+        age = self.minute - minute
+        if age < MINUTE_SLOTS:
+            slot = minute % MINUTE_SLOTS
+            self.totals[slot] += 1
+            self.errors[slot] += error
+            for i, (_, size) in enumerate(MINUTE_WINDOWS):
+                if age < size:
+                    self.sum_totals[i] += 1
+                    self.sum_errors[i] += error
+
+        if self.hour - minute // 60 < HOUR_SLOTS:
+            slot = (minute // 60) % HOUR_SLOTS
+            self.hour_totals[slot] += 1
+            self.hour_errors[slot] += error
+            self.hour_sum_total += 1
+            self.hour_sum_errors += error
+
+    def counts(self):
+        """Dict nama window -> (total, error)."""
+        result = {name: (self.sum_totals[i], self.sum_errors[i]) for i, (name, _) in enumerate(MINUTE_WINDOWS)}
+        result[HOUR_WINDOW[0]] = (self.hour_sum_total, self.hour_sum_errors)
+        return result
+
+class SLIWindowTracker:
+    """Rolling window SLI per dimensi: global, per operasi, dan per ID ATM."""
+
+    def __init__(self):
+        self.windows = {}
+        self.now = None
+        # tanggal (bytes) -> menit sejak epoch ordinal, seperti day_cache di analyze_log_data
+        self._day_minutes = {}
+
+    def line_minute(self, line, date):
+        base = self._day_minutes.get(date)
+        if base is None:
+            base = self._day_minutes[date] = datetime.date.fromisoformat(date.decode()).toordinal() * 1440
+        return base + int(line[11:13]) * 60 + int(line[14:16])
+
+    def add(self, key, minute, error):
+        window = self.windows.get(key)
+        if window is None:
+            window = self.windows[key] = RollingWindow(minute)
+        window.add(minute, error)
+
+    def add_line(self, line):
+        """Parse satu baris log (bytes) dan catat ke semua dimensinya."""
+        line = line.strip()
+        parsed = parse_log_line(line)
+        if parsed is None:
+            return
+        date, success, detail, detail_end = parsed
+        try:
+            minute = self.line_minute(line, date)
+        except ValueError:
+            return
+        if self.now is None or minute > self.now:
+            self.now = minute
+
+        op = detail if success else classify_error(line, detail, detail_end)[0]
+        error = 0 if success else 1
+
+        self.add(('Global', ''), minute, error)
+        self.add(('Operasi', op.decode()), minute, error)
+        pos = 30 if success else 28
+        if line.startswith(b'ATM', pos):
+            self.add(('ATM', line[pos:line.find(b' ', pos)].decode()), minute, error)
+
+    def snapshot(self):
+        """List (dimensi, nama, counts per window) setelah semua window digeser ke waktu log terbaru."""
+        rows = []
+        for (dimension, name), window in self.windows.items():
+            window.advance(self.now)
+            rows.append((dimension, name, window.counts()))
+        return rows
+
+def burn_rates(counts, slo):
+    """Burn rate per window: error rate dibagi error budget (1 - SLO)."""
+    budget = 1 - slo
+    return {name: (errors / total / budget if total else 0.0) for name, (total, errors) in counts.items()}
+
+def generate_live_report(tracker, slo, top_atm=10):
+    """Snapshot SLI live dalam format tabel Markdown."""
+    now = datetime.datetime.fromordinal(tracker.now // 1440) + datetime.timedelta(minutes=tracker.now % 1440)
+    report = [f"## ⏱️ SLI Live per {now:%Y-%m-%d %H:%M} (SLO {slo * 100:.2f}%)"]
+    report.append("| Dimensi | " + " | ".join(f"Error {name}" for name in WINDOW_NAMES) + " | Burn 1h | Burn 6h | Alert |")
+    report.append("| :--- |" + " :---: |" * (len(WINDOW_NAMES) + 3))
+
+    rows = tracker.snapshot()
+    atm_rows = sorted((row for row in rows if row[0] == 'ATM'),
+                      key=lambda row: burn_rates(row[2], slo)['1h'], reverse=True)
+    for dimension, name, counts in [row for row in rows if row[0] != 'ATM'] + atm_rows[:top_atm]:
+        burn = burn_rates(counts, slo)
+        cells = []
+        for window in WINDOW_NAMES:
+            total, errors = counts[window]
+            rate = (errors / total * 100) if total > 0 else 0
+            cells.append(f"{rate:.2f}% ({total})")
+        alerts = [alert for alert, long, short, limit in BURN_RATE_ALERTS if burn[long] > limit and burn[short] > limit]
+        label = f"{dimension} {name}".strip()
+        report.append(f"| {label} | " + " | ".join(cells) + f" | {burn['1h']:.2f} | {burn['6h']:.2f} | {', '.join(alerts) or '-'} |")
+    report.append("\n")
+    return "\n".join(report)
+
+def follow_lines(file_name, from_start=False, poll_interval=0.5):
+    """
+    Membaca baris baru dari file seperti `tail -F`: menunggu data baru,
+    membuka ulang file setelah rotasi, dan kembali ke awal setelah truncation.
+    Yield None setiap kali tidak ada data baru (supaya pemanggil bisa mencetak snapshot).
+    """
+    f, buffer = None, b''
+    while True:
+        if f is None:
+            try:
+                f = open(file_name, 'rb')
+            except FileNotFoundError:
+                # File yang baru dibuat nanti dibaca dari awal
+                from_start = True
+                yield None
+                time.sleep(poll_interval)
+                continue
+            if not from_start:
+                f.seek(0, os.SEEK_END)
+            # File baru hasil rotasi selalu dibaca dari awal
+            from_start, buffer = True, b''
+
+        chunk = f.read(1 << 16)
+        if chunk:
+            lines = (buffer + chunk).split(b'\n')
+            buffer = lines.pop()
+            yield from lines
+            continue
+
+        try:
+            info = os.stat(file_name)
+        except FileNotFoundError:
+            info = None
+        if info is not None and info.st_ino != os.fstat(f.fileno()).st_ino:
+            # Dirotasi: file lama sudah habis dibaca, lanjut ke file baru
+            f.close()
+            f = None
+            continue
+        if info is not None and info.st_size < f.tell():
+            f.seek(0)
+            buffer = b''
+            continue
+        yield None
+        time.sleep(poll_interval)
+
+def follow_log(file_name, slo, interval, from_start=False, top_atm=10):
+    """Mode --follow: tail file log dan cetak snapshot SLI setiap `interval` detik."""
+    tracker = SLIWindowTracker()
+    next_report = time.monotonic() + interval
+    try:
+        for line in follow_lines(file_name, from_start):
+            if line:
+                tracker.add_line(line)
+            if time.monotonic() >= next_report:
+                next_report = time.monotonic() + interval
+                if tracker.now is not None:
+                    print(generate_live_report(tracker, slo, top_atm), flush=True)
+    except KeyboardInterrupt:
+        if tracker.now is not None:
+            print(generate_live_report(tracker, slo, top_atm), flush=True)
+
+# --- Cache kolom (--cache): log diparse sekali, laporan berikutnya dari array NumPy ---
+CACHE_VERSION = 2
+# Nama kolom -> (typecode array.array saat ingest, dtype NumPy di file .npy)
+CACHE_COLUMNS = {
+    'ts': ('q', 'i4'),        # detik sejak 1970-01-01 (waktu di log, tanpa timezone), i8 jika di luar rentang int32
+    'success': ('B', 'u1'),   # 1 = SUCCESS, 0 = ERROR
+    'atm': ('H', 'u2'),       # kode kamus ID ATM, 0 = tanpa ATM
+    'op': ('H', 'u2'),        # kode kamus operasi (SYSTEM/UNKNOWN_OP untuk error tanpa operasi)
+    'error': ('H', 'u2'),     # kode kamus jenis error, 0 = sukses
+    'amount': ('q', 'i8'),    # nominal transaksi sukses, -1 jika tidak ada
+    'ref': ('q', 'i8'),       # angka REFxxxxxx, -1 jika tidak ada
+}
+CACHE_DICTIONARIES = ('atm', 'op', 'error')
+INVALID_TS = -2 ** 31
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+DAY_NAMES = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
+
+def import_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError("mode --cache membutuhkan paket 'numpy' (pip install numpy)")
+    return numpy
+
+def build_columns(log_content):
+    """
+    Parse log sekali menjadi kolom (array.array) dan kamus string -> kode.
+    Kode kamus dimulai dari 1 sesuai urutan kemunculan pertama, sehingga
+    laporan dari kolom memiliki urutan yang sama dengan analyze_log_data.
+    """
+    columns = {name: array(typecode) for name, (typecode, _) in CACHE_COLUMNS.items()}
+    dictionaries = {name: {} for name in CACHE_DICTIONARIES}
+    day_seconds = {}
+
+    def encode(name, value):
+        codes = dictionaries[name]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes) + 1
+        return code
+
+    append_ts, append_success = columns['ts'].append, columns['success'].append
+    append_atm, append_op, append_error = columns['atm'].append, columns['op'].append, columns['error'].append
+    append_amount, append_ref = columns['amount'].append, columns['ref'].append
+
+    for line in log_content:
+        if isinstance(line, str):
+            line = line.encode()
+        line = line.strip()
+        if not line or line.startswith(b'---'):
+            continue
+        parsed = parse_log_line(line)
+        if parsed is None:
+            continue
+        date, success, detail, detail_end = parsed
+
+        base = day_seconds.get(date)
+        if base is None:
+            try:
+                base = (datetime.date.fromisoformat(date.decode()).toordinal() - EPOCH_ORDINAL) * 86400
+            except ValueError:
+                base = INVALID_TS
+            day_seconds[date] = base
+        # Jam tidak valid (mis. 99:99:99) dibatasi ke 23:59:59, hari tetap ditentukan oleh tanggal
+        clock = min(int(line[11:13]), 23) * 3600 + min(int(line[14:16]), 59) * 60 + min(int(line[17:19]), 59)
+        append_ts(base + clock if base != INVALID_TS else INVALID_TS)
+        append_success(success)
+
+        pos = 30 if success else 28
+        append_atm(encode('atm', line[pos:line.find(b' ', pos)]) if line.startswith(b'ATM', pos) else 0)
+
+        if success:
+            append_op(encode('op', detail))
+            append_error(0)
+            amount = line[detail_end + 1:].split(b' ', 1)[0]
+            append_amount(int(amount) if amount.isdigit() else -1)
+        else:
+            op, error_detail = classify_error(line, detail, detail_end)
+            append_op(encode('op', op))
+            append_error(encode('error', error_detail))
+            append_amount(-1)
+
+        ref = line.rsplit(b' ', 1)[-1]
+        append_ref(int(ref[3:]) if ref.startswith(b'REF') and ref[3:].isdigit() else -1)
+
+    names = {name: [value.decode() for value in codes] for name, codes in dictionaries.items()}
+    return columns, names
+
+def source_signature(file_name):
+    info = os.stat(file_name)
+    return {'file': os.path.abspath(file_name), 'size': info.st_size, 'mtime_ns': info.st_mtime_ns}
+
+def save_column_cache(cache_dir, columns, dictionaries, source):
+    """Simpan setiap kolom sebagai file .npy (bisa di-mmap) dan kamus di meta.json."""
+    np = import_numpy()
+    os.makedirs(cache_dir, exist_ok=True)
+    for name, (_, dtype) in CACHE_COLUMNS.items():
+        values = np.asarray(columns[name])
+        # Dikecilkan ke dtype kolom jika semua nilai muat (ts tetap int64 jika ada tanggal di luar int32)
+        if not len(values) or np.iinfo(dtype).min <= values.min() and values.max() <= np.iinfo(dtype).max:
+            values = values.astype(dtype)
+        np.save(os.path.join(cache_dir, f'{name}.npy'), values)
+    # meta.json ditulis terakhir: cache hanya dianggap valid jika semua kolom sudah lengkap
+    save_state(os.path.join(cache_dir, 'meta.json'),
+               {'version': CACHE_VERSION, 'source': source, 'dictionaries': dictionaries})
+
+def load_column_cache(cache_dir, source=None):
+    """
+    Buka cache kolom dengan memory-map (data tidak dibaca ke memory sampai dipakai).
+    Return (columns, dictionaries), atau None jika cache belum ada, versinya
+    berbeda, atau dibuat dari file sumber yang sudah berubah.
+    """
+    np = import_numpy()
+    try:
+        with open(os.path.join(cache_dir, 'meta.json')) as f:
+            meta = json.load(f)
+    except FileNotFoundError:
+        return None
+    if meta.get('version') != CACHE_VERSION or (source is not None and meta['source'] != source):
+        return None
+    columns = {name: np.load(os.path.join(cache_dir, f'{name}.npy'), mmap_mode='r') for name in CACHE_COLUMNS}
+    return columns, meta['dictionaries']
+
+def analyze_columns(columns, dictionaries):
+    """
+    Versi vectorized dari analyze_log_data: group-by dengan np.bincount pada
+    kolom kode. Hasilnya sama (termasuk urutan key) dengan analyze_log_data.
+    """
+    np = import_numpy()
+    success = columns['success'].astype(bool)
+    failed = ~success
+    total = len(success)
+
+    ops = dictionaries['op']
+    op_total = np.bincount(columns['op'], minlength=len(ops) + 1)
+    op_success = np.bincount(columns['op'][success], minlength=len(ops) + 1)
+    op_counts = {op: {'total': int(op_total[code]), 'success': int(op_success[code])}
+                 for code, op in enumerate(ops, 1) if op_total[code]}
+
+    errors = dictionaries['error']
+    error_count = np.bincount(columns['error'][failed], minlength=len(errors) + 1)
+    error_types = {error: int(error_count[code]) for code, error in enumerate(errors, 1) if error_count[code]}
+
+    ts = columns['ts']
+    valid = ts != INVALID_TS
+    weekday = (ts // 86400 + 3) % 7  # 1970-01-01 adalah hari Kamis
+    day_total = np.bincount(weekday[valid], minlength=7)
+    day_errors = np.bincount(weekday[valid & failed], minlength=7)
+    daily_stats = {DAY_NAMES[i]: {'total': int(day_total[i]), 'errors': int(day_errors[i])}
+                   for i in range(7) if day_total[i]}
+    invalid = int((~valid).sum())
+    if invalid:
+        daily_stats['TIDAK VALID'] = {'total': invalid, 'errors': int((~valid & failed).sum())}
+
+    return total, int(success.sum()), op_counts, error_types, daily_stats
+
+def dimensions_from_columns(columns, dictionaries):
+    """ReportDimensions dari cache kolom (vectorized), hasilnya sama dengan mengisi per baris."""
+    np = import_numpy()
+    dimensions = ReportDimensions()
+    failed = columns['success'] == 0
+
+    atm_total = np.bincount(columns['atm'], minlength=len(dictionaries['atm']) + 1)
+    atm_errors = np.bincount(columns['atm'][failed], minlength=len(dictionaries['atm']) + 1)
+    for code, atm in enumerate(dictionaries['atm'], 1):
+        dimensions.atm_counts[atm.encode()] = [int(atm_total[code]), int(atm_errors[code])]
+
+    ts = columns['ts']
+    valid = ts != INVALID_TS
+    hour = ts % 86400 // 3600
+    hour_total = np.bincount(hour[valid], minlength=24)
+    hour_errors = np.bincount(hour[valid & failed], minlength=24)
+    dimensions.hour_counts = [[int(total), int(errors)] for total, errors in zip(hour_total, hour_errors)]
+
+    # Nominal hanya dari transaksi sukses; sketch diisi per nilai unik (jumlah nilai unik kecil)
+    has_amount = columns['amount'] >= 0
+    success_ops = columns['op'][has_amount]
+    success_amounts = columns['amount'][has_amount]
+    for code, op in enumerate(dictionaries['op'], 1):
+        values, counts = np.unique(success_amounts[success_ops == code], return_counts=True)
+        if len(values):
+            sketch = dimensions.amounts[op.encode()] = QuantileSketch()
+            for value, count in zip(values.tolist(), counts.tolist()):
+                sketch.add(value, count)
+    return dimensions
+
+def analyze_with_cache(file_name, cache_dir, dimensions=None):
+    """
+    Laporan dari cache kolom; cache dibuat (ulang) jika belum ada atau file log sudah berubah.
+    Jika dimensions diberikan, dimensi tambahan dari cache digabung ke dalamnya.
+    """
+    source = source_signature(file_name)
+    cache = load_column_cache(cache_dir, source)
+    if cache is None:
+        print(f"Catatan: membuat cache kolom di '{cache_dir}'.", file=sys.stderr)
+        with open_log(file_name) as f:
+            columns, dictionaries = build_columns(f)
+        save_column_cache(cache_dir, columns, dictionaries, source)
+        cache = load_column_cache(cache_dir)
+    if dimensions is not None:
+        dimensions.merge(dimensions_from_columns(*cache))
+    return analyze_columns(*cache)
 
 # --- Fungsi untuk membuat laporan dalam format MARKDOWN ---
 def generate_markdown_report(file_name, total, success, op_counts, error_types, daily_stats):
@@ -150,25 +980,117 @@ def generate_markdown_report(file_name, total, success, op_counts, error_types,
     
     return "\n".join(report)
 
+def format_amount(value):
+    return "-" if value is None else f"{round(value):,}".replace(",", ".")
+
+def generate_dimensions_report(dimensions, top_n=10):
+    """Bagian laporan tambahan (--detail): ATM terburuk, error rate per jam, dan nominal per operasi."""
+    report = []
+
+    # 5. ATM dengan error rate tertinggi
+    report.append(f"## 🏧 Top {top_n} ATM dengan Error Rate Tertinggi")
+    report.append("| ATM | Total Transaksi | Total Error | Error Rate |")
+    report.append("| :--- | :-------------: | :---------: | :--------: |")
+    worst = sorted(dimensions.atm_counts.items(), key=lambda item: (-item[1][1] / item[1][0], item[0]))
+    for atm, (total, errors) in worst[:top_n]:
+        report.append(f"| {atm.decode()} | {total} | {errors} | **{errors / total * 100:.2f}%** |")
+    report.append("\n")
+
+    # 6. Error rate per jam
+    report.append("## 🕐 Analisis Error Berdasarkan Jam")
+    report.append("| Jam | Total Transaksi | Total Error | Error Rate |")
+    report.append("| :--- | :-------------: | :---------: | :--------: |")
+    for hour, (total, errors) in enumerate(dimensions.hour_counts):
+        rate = (errors / total * 100) if total > 0 else 0
+        report.append(f"| {hour:02d}:00 | {total} | {errors} | {rate:.2f}% |")
+    report.append("\n")
+
+    # 7. Nominal transaksi sukses per operasi (perkiraan, error relatif <= 1%)
+    report.append("## 💰 Nominal Transaksi Sukses per Operasi")
+    report.append("| Operasi | Jumlah | p50 | p95 | p99 |")
+    report.append("| :--- | :---: | :---: | :---: | :---: |")
+    for op in OPERATIONS:
+        sketch = dimensions.amounts.get(op)
+        if sketch:
+            quantiles = " | ".join(format_amount(sketch.quantile(q)) for q in (0.5, 0.95, 0.99))
+            report.append(f"| {op.decode()} | {sketch.count} | {quantiles} |")
+    report.append("\n")
+
+    return "\n".join(report)
+
 # --- Eksekusi Utama ---
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Penggunaan: python sli_report_markdown.py <nama_file_log>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Laporan SLI (Markdown) dari file log transaksi ATM.")
+    parser.add_argument('file_name', help="file log, file .gz / .zst, atau '-' untuk stdin")
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                        help="jumlah process untuk analisis paralel (0 = semua core, default 1)")
+    parser.add_argument('--state', metavar='STATE_FILE',
+                        help="mode incremental: simpan agregasi & offset di file ini, run berikutnya hanya memproses data baru")
+    parser.add_argument('--reset', action='store_true',
+                        help="hapus state sebelumnya dan proses ulang dari awal (dengan --state)")
+    parser.add_argument('-f', '--follow', action='store_true',
+                        help="mode live: ikuti file seperti tail -F dan cetak error rate & burn rate per window")
+    parser.add_argument('--from-start', action='store_true',
+                        help="dengan --follow: baca dari awal file, bukan hanya baris baru")
+    parser.add_argument('--interval', type=float, default=10,
+                        help="dengan --follow: jeda antar snapshot dalam detik (default 10)")
+    parser.add_argument('--slo', type=float, default=99.5,
+                        help="target SLO success rate dalam persen untuk burn rate (default 99.5)")
+    parser.add_argument('--detail', action='store_true',
+                        help="tambahkan error rate per ATM & per jam serta persentil nominal transaksi per operasi")
+    parser.add_argument('--top', type=int, default=10,
+                        help="jumlah ATM terburuk yang ditampilkan dengan --follow / --detail (default 10)")
+    parser.add_argument('--cache', metavar='CACHE_DIR',
+                        help="parse log sekali ke cache kolom NumPy di direktori ini, run berikutnya langsung dari cache")
+    args = parser.parse_args()
+    if args.detail and args.state:
+        # State file hanya menyimpan agregasi dasar, dimensi tambahan tidak bisa dilanjutkan
+        parser.error("--detail tidak bisa digabung dengan --state (mode incremental)")
 
-    file_name = sys.argv[1]
+    file_name = args.file_name
     
     try:
-        with open(file_name, 'r') as f:
-            log_content = f.read()
-            
-        total, success, op_counts, error_types, daily_stats = analyze_log_data(log_content)
+        if args.follow:
+            if file_name == '-' or file_name.endswith(('.gz', '.zst')):
+                print("Error: mode --follow hanya untuk file log biasa.")
+                sys.exit(1)
+            follow_log(file_name, args.slo / 100, args.interval, args.from_start, args.top)
+            sys.exit(0)
+
+        parallel = args.workers != 1 and file_name != '-' and not file_name.endswith(('.gz', '.zst'))
+        if args.workers != 1 and not parallel:
+            print("Catatan: mode paralel hanya untuk file log biasa, dijalankan serial.", file=sys.stderr)
+
+        dimensions = ReportDimensions() if args.detail else None
+
+        if args.cache:
+            if file_name == '-':
+                print("Error: mode --cache tidak bisa dipakai untuk stdin.")
+                sys.exit(1)
+            total, success, op_counts, error_types, daily_stats = analyze_with_cache(file_name, args.cache, dimensions)
+        elif args.state:
+            if file_name == '-' or file_name.endswith(('.gz', '.zst')):
+                print("Error: mode incremental (--state) hanya untuk file log biasa.")
+                sys.exit(1)
+            if args.reset and os.path.exists(args.state):
+                os.remove(args.state)
+            result, new_bytes = analyze_log_incremental(file_name, args.state, args.workers)
+            print(f"Catatan: {new_bytes} byte baru diproses.", file=sys.stderr)
+            total, success, op_counts, error_types, daily_stats = result
+        elif parallel:
+            total, success, op_counts, error_types, daily_stats = analyze_log_file_parallel(
+                file_name, args.workers or None, dimensions=dimensions)
+        else:
+            with open_log(file_name) as f:
+                total, success, op_counts, error_types, daily_stats = analyze_log_data(f, dimensions)
         
         if total == 0:
             print(f"Error: File '{file_name}' tidak berisi entri log yang valid.")
             sys.exit(1)
 
         markdown_output = generate_markdown_report(file_name, total, success, op_counts, error_types, daily_stats)
+        if dimensions is not None:
+            markdown_output += "\n" + generate_dimensions_report(dimensions, args.top)
         
         # Cetak output Markdown ke konsol
         print(markdown_output)